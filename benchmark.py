@@ -11,33 +11,43 @@ Descrição:
 """
 
 import os
+import time
 import numpy as np
-from stable_baselines3 import DQN
-from stable_baselines3.common.vec_env import DummyVecEnv, VecFrameStack, VecNormalize
 from src.rl_env import BrickBreakerEnv
+from src.q_policy import QPolicy, StackedEnvs
+from src.recording import EpisodeWriter, EpisodeRecorder, RecordEpisodes
+from src.dataset import DatasetWriter, RecordTransitions
+from src.streaming_stats import StreamingEvaluator, PairedComparison
 from src.config import MODEL_PATH, LOGS_DIR
 
-def benchmark_model(model_path, num_episodes=100, render=False):
+def make_benchmark_env(render_mode, episode_seeds, writer=None, dataset=None, stream=0):
     """
-    Avalia o modelo em múltiplos episódios e coleta métricas.
-    
-    Args:
-        model_path (str): Caminho para o modelo .zip
-        num_episodes (int): Número de episódios para avaliar
-        render (bool): Se True, renderiza o jogo (mais lento)
-    
+    Cria a fábrica de um slot do benchmark com sua sequência de sementes.
+    Com writer, os episódios do slot são gravados (src/recording.py); com
+    dataset, suas transições vão para o fluxo stream (src/dataset.py).
+    """
+    def _init():
+        env = BrickBreakerEnv(render_mode=render_mode, episode_seeds=episode_seeds)
+        if dataset is not None:
+            env = RecordTransitions(env, dataset, stream)
+        if writer is not None:
+            env = RecordEpisodes(env, EpisodeRecorder(writer, record_rewards=True))
+        return env
+    return _init
+
+def load_sb3_policy(model_path, env_fns):
+    """
+    Monta a pilha de avaliação do SB3 (DummyVecEnv + VecFrameStack +
+    VecNormalize congelado) e carrega o modelo DQN completo.
+
     Returns:
-        dict: Dicionário com métricas coletadas
+        tuple: (env, predict), com predict(obs) -> ações gulosas.
     """
-    if not os.path.exists(f"{model_path}.zip"):
-        print(f"❌ Modelo não encontrado em {model_path}.zip")
-        return None
-    
-    print(f"📊 Carregando modelo de {model_path}...")
-    
-    # Setup environment
-    render_mode = 'human' if render else None
-    env = DummyVecEnv([lambda: BrickBreakerEnv(render_mode=render_mode)])
+    # Importados aqui: torch só é carregado quando o modelo .zip é usado
+    from stable_baselines3 import DQN
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecFrameStack, VecNormalize
+
+    env = DummyVecEnv(env_fns)
     env = VecFrameStack(env, n_stack=4)
     
     # Load normalization stats if exist
@@ -50,57 +60,211 @@ def benchmark_model(model_path, num_episodes=100, render=False):
         env = VecNormalize(env, norm_obs=True, norm_reward=False, clip_obs=10.0, training=False)
     
     model = DQN.load(model_path, env=env)
+    # O load semeia o env com a seed salva no modelo (env.seed agenda sementes
+    # para o próximo reset); descartadas, valem as episode_seeds de cada slot
+    env.unwrapped._reset_seeds()
+    return env, lambda obs: model.predict(obs, deterministic=True)[0]
+
+def load_numpy_policy(policy_path, env_fns):
+    """
+    Carrega a política exportada (export_policy.py) e os ambientes em lote,
+    sem torch nem SB3.
+
+    Returns:
+        tuple: (env, predict), com predict(obs) -> ações gulosas.
+    """
+    policy = QPolicy(policy_path)
+    env = StackedEnvs(env_fns, policy.n_stack)
+    return env, policy.predict
+
+def model_file(model_path):
+    """
+    Arquivo do modelo: o próprio .npz exportado ou o .zip do SB3.
+    """
+    return model_path if model_path.endswith('.npz') else f"{model_path}.zip"
+
+class EpisodeRunner:
+    """
+    Avança em lote os slots de um ambiente com uma política e devolve os
+    episódios concluídos. O slot k executa os episódios k, k + n_envs,
+    k + 2 * n_envs... (os mesmos índices das sementes de make_benchmark_env).
+    """
+
+    def __init__(self, env, predict, num_episodes):
+        """
+        Args:
+            env: VecEnv (ou StackedEnvs) com os slots do benchmark.
+            predict (callable): obs -> ações.
+            num_episodes (int): Episódios a registrar; os seguintes são ignorados.
+        """
+        self.env = env
+        self.predict = predict
+        self.num_episodes = num_episodes
+        n_envs = env.num_envs
+        
+        # Acumuladores do episódio em andamento em cada slot
+        self.slots = np.arange(n_envs)
+        self.slot_episode = self.slots.copy()
+        self.slot_reward = np.zeros(n_envs)
+        self.slot_length = np.zeros(n_envs, dtype=np.int64)
+        self.slot_level = np.ones(n_envs, dtype=np.int64)
+        self.slot_actions = np.zeros((n_envs, 3), dtype=np.int64)  # 0=Stay, 1=Left, 2=Right
+        self.obs = env.reset()
+
+    def step(self):
+        """
+        Executa um passo em todos os slots.
+
+        Returns:
+            list: (episódio, reward, comprimento, nível máximo, contagem de ações,
+                  motivo do truncamento ou None, semente do episódio) de cada
+                  episódio registrado que terminou neste passo.
+        """
+        actions = self.predict(self.obs)
+        self.obs, rewards, dones, infos = self.env.step(actions)
+        
+        self.slot_reward += rewards
+        self.slot_length += 1
+        self.slot_actions[self.slots, actions] += 1
+        
+        # Nível atual de cada slot (via info, inclusive no passo terminal)
+        self.slot_level = np.maximum(self.slot_level, [info["level"] for info in infos])
+        
+        finished = []
+        for k in np.flatnonzero(dones):
+            # Slots que já cumpriram seus episódios seguem jogando, mas são ignorados
+            if self.slot_episode[k] < self.num_episodes:
+                finished.append((self.slot_episode[k], self.slot_reward[k], self.slot_length[k],
+                                 self.slot_level[k], self.slot_actions[k].copy(),
+                                 infos[k].get("truncation_reason"), infos[k].get("episode_seed")))
+            
+            self.slot_episode[k] += len(self.slots)
+            self.slot_reward[k] = 0
+            self.slot_length[k] = 0
+            self.slot_level[k] = 1
+            self.slot_actions[k] = 0
+        return finished
+
+    def close(self):
+        self.env.close()
+
+def load_policy(model_path, env_fns):
+    """
+    Carrega a política e seus ambientes: NumPy para .npz, SB3 para o resto.
+
+    Returns:
+        tuple: (env, predict)
+    """
+    if model_path.endswith('.npz'):
+        return load_numpy_policy(model_path, env_fns)
+    return load_sb3_policy(model_path, env_fns)
+
+def benchmark_model(model_path, num_episodes=100, render=False, n_envs=1, seed=0, record=None,
+                    dataset_dir=None, ci_width=None, target_metric='reward', confidence=0.95,
+                    min_episodes=30):
+    """
+    Avalia o modelo em múltiplos episódios e coleta métricas.
+
+    Os episódios são distribuídos entre n_envs ambientes avançados em lote
+    (um único model.predict por passo para todos). O episódio i sempre usa a
+    semente seed + i, então o resultado independe de n_envs.
+
+    As métricas são acumuladas em fluxo (src/streaming_stats.py). Com
+    ci_width, a avaliação para assim que o intervalo de confiança da métrica
+    alvo fica mais estreito que ci_width; num_episodes passa a ser o
+    orçamento máximo. Os episódios entram nas estatísticas na ordem de seus
+    índices, de modo que parar cedo não favorece os episódios mais curtos.
     
-    # Métricas a coletar
-    episode_rewards = []
-    episode_lengths = []
-    action_counts = {0: 0, 1: 0, 2: 0}  # 0=Stay, 1=Left, 2=Right
+    Args:
+        model_path (str): Caminho para o modelo (sem .zip) ou para a
+                          política exportada (.npz, inferência em NumPy)
+        num_episodes (int): Número (máximo) de episódios para avaliar
+        render (bool): Se True, renderiza o jogo (mais lento, força n_envs=1)
+        n_envs (int): Número de ambientes executados em paralelo
+        seed (int): Semente base dos episódios
+        record (str, optional): Arquivo onde gravar os episódios para replay
+        dataset_dir (str, optional): Diretório do dataset offline de transições
+        ci_width (float, optional): Largura do intervalo que encerra a avaliação
+        target_metric (str): Métrica da regra de parada ('reward', 'length' ou 'level')
+        confidence (float): Nível de confiança dos intervalos
+        min_episodes (int): Episódios mínimos antes da parada antecipada
+    
+    Returns:
+        dict: Dicionário com métricas coletadas
+    """
+    if not os.path.exists(model_file(model_path)):
+        print(f"❌ Modelo não encontrado em {model_file(model_path)}")
+        return None
+    
+    print(f"📊 Carregando modelo de {model_path}...")
+    
+    # Setup environment: o slot k executa os episódios k, k + n_envs, k + 2 * n_envs...
+    render_mode = 'human' if render else None
+    if render:
+        n_envs = 1
+    n_envs = max(1, min(n_envs, num_episodes))
+    writer = None
+    if record:
+        os.makedirs(os.path.dirname(os.path.abspath(record)), exist_ok=True)
+        writer = EpisodeWriter(record)
+    dataset = DatasetWriter(dataset_dir, num_streams=n_envs) if dataset_dir else None
+    env_fns = [
+        make_benchmark_env(render_mode, range(seed + k, seed + num_episodes, n_envs), writer, dataset, k)
+        for k in range(n_envs)
+    ]
+    runner = EpisodeRunner(*load_policy(model_path, env_fns), num_episodes)
+    
+    evaluator = StreamingEvaluator(target_metric, ci_width, confidence, min_episodes)
+    action_counts = np.zeros(3, dtype=np.int64)  # 0=Stay, 1=Left, 2=Right
     level_2_reached = 0
     level_2_completed = 0
+    truncations = {}  # Motivo -> episódios truncados (limite de passos, bola travada)
+    # Episódios concluídos fora de ordem aguardam os anteriores
+    pending = {}
+    next_episode = 0
     
-    print(f"🎮 Executando {num_episodes} episódios de benchmark...")
+    stop_rule = f", parada com IC{confidence:.0%} de {target_metric} < {ci_width}" if ci_width else ""
+    print(f"🎮 Executando até {num_episodes} episódios de benchmark ({n_envs} ambientes em paralelo{stop_rule})...")
+    start_time = time.perf_counter()
     
-    for episode in range(num_episodes):
-        obs = env.reset()
-        done = False
-        episode_reward = 0
-        episode_length = 0
-        max_level_reached = 1
+    while next_episode < num_episodes and not evaluator.converged():
+        for episode, *result in runner.step():
+            pending[episode] = result
         
-        while not done:
-            action, _states = model.predict(obs, deterministic=True)
-            obs, reward, done, info = env.step(action)
-            
-            # Conta ações
-            action_counts[int(action[0])] += 1
-            
-            episode_reward += reward[0]
-            episode_length += 1
+        while next_episode in pending and not evaluator.converged():
+            reward, length, level, actions_taken, reason, episode_seed = pending.pop(next_episode)
+            if episode_seed != seed + next_episode:
+                raise RuntimeError(f"Episódio {next_episode} jogou a semente {episode_seed}, "
+                                   f"não {seed + next_episode}")
+            evaluator.add(reward, length, level)
+            if reason is not None:
+                truncations[reason] = truncations.get(reason, 0) + 1
+            action_counts += actions_taken
+            level_2_reached += level >= 2
+            level_2_completed += level >= 3
+            next_episode += 1
             
-            # Tenta pegar nível atual (via get_attr)
-            try:
-                games = env.get_attr("game")
-                if games:
-                    current_level = games[0].level
-                    max_level_reached = max(max_level_reached, current_level)
-            except:
-                pass
-        
-        episode_rewards.append(episode_reward)
-        episode_lengths.append(episode_length)
-        
-        if max_level_reached >= 2:
-            level_2_reached += 1
-        if max_level_reached >= 3:
-            level_2_completed += 1
-        
-        if (episode + 1) % 10 == 0:
-            print(f"  Episódio {episode + 1}/{num_episodes} - Reward: {episode_reward:.1f}, Nível Max: {max_level_reached}")
+            if next_episode % 10 == 0:
+                stats = evaluator.stats[target_metric]
+                low, high = stats.confidence_interval(confidence)
+                print(f"  Episódio {next_episode}/{num_episodes} - Reward: {reward:.1f}, Nível Max: {level} | "
+                      f"{target_metric}: {stats.mean:.2f} IC{confidence:.0%} [{low:.2f}, {high:.2f}]")
     
-    env.close()
+    completed = evaluator.count
+    elapsed = time.perf_counter() - start_time
+    runner.close()
+    if writer is not None:
+        writer.close()
+        print(f"💾 Episódios gravados em {record}")
+    if dataset is not None:
+        dataset.close()
+        print(f"💾 Transições gravadas em {dataset_dir}")
+    if completed < num_episodes:
+        print(f"🛑 Intervalo de {target_metric} atingiu a largura {ci_width} após {completed}/{num_episodes} episódios")
+    print(f"⏱️  {completed} episódios em {elapsed:.1f}s ({completed / elapsed:.2f} episódios/s)")
     
     # Calcula estatísticas
-    total_actions = sum(action_counts.values())
+    total_actions = action_counts.sum()
     action_distribution = {
         'stay': action_counts[0] / total_actions if total_actions > 0 else 0,
         'left': action_counts[1] / total_actions if total_actions > 0 else 0,
@@ -113,15 +277,26 @@ def benchmark_model(model_path, num_episodes=100, render=False):
     else:
         bias_ratio = float('inf') if action_counts[2] > 0 else 1.0
     
+    summary = evaluator.summary()
     metrics = {
-        'avg_reward': np.mean(episode_rewards),
-        'std_reward': np.std(episode_rewards),
-        'avg_length': np.mean(episode_lengths),
-        'level_2_success_rate': level_2_reached / num_episodes * 100,
-        'level_2_completion_rate': level_2_completed / num_episodes * 100,
+        'num_episodes': completed,
+        'confidence': confidence,
+        'avg_reward': summary['reward']['mean'],
+        'std_reward': summary['reward']['std'],
+        'reward_ci': summary['reward']['ci'],
+        'reward_bootstrap_ci': summary['reward']['bootstrap_ci'],
+        'median_reward': summary['reward']['median'],
+        'avg_length': summary['length']['mean'],
+        'length_ci': summary['length']['ci'],
+        'avg_level': summary['level']['mean'],
+        'level_ci': summary['level']['ci'],
+        'level_2_success_rate': level_2_reached / completed * 100,
+        'level_2_completion_rate': level_2_completed / completed * 100,
         'action_distribution': action_distribution,
         'bias_ratio': bias_ratio,
-        'episode_rewards': episode_rewards
+        'truncations': truncations,
+        # Amostra uniforme dos rewards (reservatório), para bootstrap externo
+        'reward_samples': evaluator.reservoirs['reward'].values.tolist()
     }
     
     return metrics
@@ -131,10 +306,20 @@ def print_metrics(metrics, model_name="Modelo"):
     print(f"\n{'='*60}")
     print(f"📈 Resultados do Benchmark - {model_name}")
     print(f"{'='*60}")
-    print(f"Reward Médio:              {metrics['avg_reward']:.2f} ± {metrics['std_reward']:.2f}")
-    print(f"Steps Médios por Episódio: {metrics['avg_length']:.1f}")
+    ci = f"IC{metrics['confidence']:.0%}"
+    print(f"Episódios Avaliados:       {metrics['num_episodes']}")
+    print(f"Reward Médio:              {metrics['avg_reward']:.2f} ± {metrics['std_reward']:.2f} "
+          f"({ci}: [{metrics['reward_ci'][0]:.2f}, {metrics['reward_ci'][1]:.2f}])")
+    print(f"Reward Mediano:            {metrics['median_reward']:.2f}")
+    print(f"Steps Médios por Episódio: {metrics['avg_length']:.1f} "
+          f"({ci}: [{metrics['length_ci'][0]:.1f}, {metrics['length_ci'][1]:.1f}])")
+    print(f"Nível Médio Alcançado:     {metrics['avg_level']:.2f} "
+          f"({ci}: [{metrics['level_ci'][0]:.2f}, {metrics['level_ci'][1]:.2f}])")
     print(f"Taxa de Sucesso Nível 2:   {metrics['level_2_success_rate']:.1f}%")
     print(f"Taxa de Conclusão Nível 2: {metrics['level_2_completion_rate']:.1f}%")
+    for reason, count in metrics['truncations'].items():
+        label = f"Truncados ({reason}):"
+        print(f"{label:<27}{count} episódios")
     print(f"\n🎯 Distribuição de Ações:")
     print(f"  Parado:   {metrics['action_distribution']['stay']*100:.1f}%")
     print(f"  Esquerda: {metrics['action_distribution']['left']*100:.1f}%")
@@ -151,37 +336,150 @@ def print_metrics(metrics, model_name="Modelo"):
     
     print(f"{'='*60}\n")
 
-def compare_models(old_model_path, new_model_path, num_episodes=100):
+def paired_compare(old_model_path, new_model_path, num_episodes=100, n_envs=1, seed=0,
+                   target_metric='reward', ci_width=None, confidence=0.95, min_episodes=30):
+    """
+    Compara dois modelos com números aleatórios comuns: ambos jogam os mesmos
+    episódios semeados (mesmos lançamentos da bola e tijolos especiais), em
+    lockstep no mesmo processo, e a métrica é comparada episódio a episódio.
+    
+    Args:
+        old_model_path (str): Caminho para modelo antigo
+        new_model_path (str): Caminho para modelo novo
+        num_episodes (int): Número (máximo, com ci_width) de episódios pareados
+        n_envs (int): Número de ambientes executados em paralelo por modelo
+        seed (int): Semente base dos episódios
+        target_metric (str): Métrica comparada ('reward', 'length' ou 'level')
+        ci_width (float, optional): Largura do intervalo da diferença que encerra a avaliação
+        confidence (float): Nível de confiança dos intervalos
+        min_episodes (int): Pares mínimos antes da parada antecipada
+    
+    Returns:
+        dict: Resumo de PairedComparison (ou None se faltar um modelo)
+    """
+    for path in (old_model_path, new_model_path):
+        if not os.path.exists(model_file(path)):
+            print(f"❌ Modelo não encontrado em {model_file(path)}")
+            return None
+    
+    # Mesma distribuição de sementes por slot para os dois modelos
+    n_envs = max(1, min(n_envs, num_episodes))
+    env_fns = [make_benchmark_env(None, range(seed + k, seed + num_episodes, n_envs)) for k in range(n_envs)]
+    runners = [EpisodeRunner(*load_policy(path, env_fns), num_episodes)
+               for path in (old_model_path, new_model_path)]
+    metric_index = StreamingEvaluator.METRICS.index(target_metric)
+    
+    comparison = PairedComparison(ci_width, confidence, min_episodes)
+    pending = [{}, {}]
+    next_episode = 0
+    
+    print(f"🎮 Executando até {num_episodes} episódios pareados ({n_envs} ambientes por modelo)...")
+    start_time = time.perf_counter()
+    
+    while next_episode < num_episodes and not comparison.converged():
+        for runner, results in zip(runners, pending):
+            # O modelo que já concluiu o próximo episódio espera o outro
+            if next_episode not in results:
+                for episode, *result in runner.step():
+                    results[episode] = (result[metric_index], result[-1])
+        
+        while all(next_episode in results for results in pending) and not comparison.converged():
+            (old_value, old_seed), (new_value, new_seed) = pending[0].pop(next_episode), pending[1].pop(next_episode)
+            # Pares só valem se os dois modelos jogaram exatamente o mesmo episódio
+            if old_seed != new_seed or old_seed != seed + next_episode:
+                raise RuntimeError(f"Episódio pareado {next_episode} desalinhado: sementes {old_seed} e "
+                                   f"{new_seed}, esperada {seed + next_episode}")
+            comparison.add(old_value, new_value)
+            next_episode += 1
+            
+            if next_episode % 10 == 0:
+                low, high = comparison.diff.confidence_interval(confidence)
+                print(f"  Episódio {next_episode}/{num_episodes} - Diferença média: {comparison.diff.mean:+.2f} "
+                      f"IC{confidence:.0%} [{low:+.2f}, {high:+.2f}] | "
+                      f"{comparison.wins}V/{comparison.losses}D/{comparison.ties}E")
+    
+    elapsed = time.perf_counter() - start_time
+    for runner in runners:
+        runner.close()
+    print(f"⏱️  {comparison.count} episódios pareados em {elapsed:.1f}s")
+    
+    summary = comparison.summary()
+    summary['metric'] = target_metric
+    return summary
+
+def print_paired(summary):
+    """Imprime o resultado da comparação pareada."""
+    ci = f"IC{summary['confidence']:.0%}"
+    low, high = summary['diff_ci']
+    print("\n" + "="*60)
+    print(f"📊 COMPARAÇÃO PAREADA ({summary['metric']}, {summary['num_episodes']} episódios)")
+    print("="*60)
+    print(f"Média Antigo:               {summary['old_mean']:.2f}")
+    print(f"Média Novo:                 {summary['new_mean']:.2f}")
+    print(f"Diferença (Novo - Antigo):  {summary['mean_diff']:+.2f} ({ci}: [{low:+.2f}, {high:+.2f}])")
+    print(f"Placar por Episódio:        {summary['wins']} vitórias, {summary['losses']} derrotas, {summary['ties']} empates")
+    print(f"Teste do Sinal (p-valor):   {summary['sign_test_p']:.4f}")
+    if np.isfinite(summary['variance_reduction']):
+        print(f"Redução de Variância:       {summary['variance_reduction']:.1f}x menos episódios que a comparação independente")
+    
+    if low > 0:
+        print(f"   ✅ Novo modelo é MELHOR ({ci} acima de zero)")
+    elif high < 0:
+        print(f"   ❌ REGRESSÃO: novo modelo é pior ({ci} abaixo de zero)")
+    else:
+        print(f"   ⚠️  Sem diferença significativa ({ci} contém zero)")
+    print("="*60 + "\n")
+
+def compare_models(old_model_path, new_model_path, num_episodes=100, n_envs=1, seed=0, paired=False,
+                   target_metric='reward', ci_width=None, confidence=0.95, min_episodes=30):
     """
     Compara dois modelos lado a lado.
     
     Args:
         old_model_path (str): Caminho para modelo antigo
         new_model_path (str): Caminho para modelo novo
-        num_episodes (int): Número de episódios para cada modelo
+        num_episodes (int): Número (máximo, com ci_width) de episódios para cada modelo
+        n_envs (int): Número de ambientes executados em paralelo
+        seed (int): Semente base dos episódios
+        paired (bool): Compara episódio a episódio nas mesmas sementes (paired_compare)
+        target_metric (str): Métrica da regra de parada / da comparação pareada
+        ci_width (float, optional): Largura de intervalo que encerra a avaliação
+        confidence (float): Nível de confiança dos intervalos
+        min_episodes (int): Episódios mínimos antes da parada antecipada
     """
     print("\n" + "="*60)
     print("🔬 COMPARAÇÃO DE MODELOS")
     print("="*60)
     
+    if paired:
+        summary = paired_compare(old_model_path, new_model_path, num_episodes, n_envs, seed,
+                                 target_metric, ci_width, confidence, min_episodes)
+        if summary:
+            print_paired(summary)
+        return
+    
     # Benchmark modelo antigo
-    if os.path.exists(f"{old_model_path}.zip"):
+    if os.path.exists(model_file(old_model_path)):
         print("\n1️⃣  Avaliando modelo ANTIGO...")
-        old_metrics = benchmark_model(old_model_path, num_episodes, render=False)
+        old_metrics = benchmark_model(old_model_path, num_episodes, render=False, n_envs=n_envs, seed=seed,
+                                      ci_width=ci_width, target_metric=target_metric, confidence=confidence,
+                                      min_episodes=min_episodes)
         if old_metrics:
             print_metrics(old_metrics, "Modelo Antigo")
     else:
-        print(f"\n⚠️  Modelo antigo não encontrado em {old_model_path}.zip")
+        print(f"\n⚠️  Modelo antigo não encontrado em {model_file(old_model_path)}")
         old_metrics = None
     
     # Benchmark modelo novo
-    if os.path.exists(f"{new_model_path}.zip"):
+    if os.path.exists(model_file(new_model_path)):
         print("\n2️⃣  Avaliando modelo NOVO...")
-        new_metrics = benchmark_model(new_model_path, num_episodes, render=False)
+        new_metrics = benchmark_model(new_model_path, num_episodes, render=False, n_envs=n_envs, seed=seed,
+                                      ci_width=ci_width, target_metric=target_metric, confidence=confidence,
+                                      min_episodes=min_episodes)
         if new_metrics:
             print_metrics(new_metrics, "Modelo Novo")
     else:
-        print(f"\n⚠️  Modelo novo não encontrado em {new_model_path}.zip")
+        print(f"\n⚠️  Modelo novo não encontrado em {model_file(new_model_path)}")
         new_metrics = None
     
     # Comparação
@@ -208,21 +506,44 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description='Benchmark do modelo Brick Breaker AI')
     parser.add_argument('--model', type=str, default=MODEL_PATH, 
-                       help='Caminho para o modelo (sem .zip)')
-    parser.add_argument('--episodes', type=int, default=100, 
-                       help='Número de episódios para avaliar')
+                       help='Caminho para o modelo (sem .zip) ou política exportada (.npz)')
+    parser.add_argument('--episodes', '--max-episodes', dest='episodes', type=int, default=100, 
+                       help='Número (máximo, com --ci-width) de episódios para avaliar')
     parser.add_argument('--render', action='store_true', 
                        help='Renderizar o jogo durante benchmark')
     parser.add_argument('--compare', type=str, default=None,
                        help='Caminho para modelo antigo para comparação')
+    parser.add_argument('--parallel', type=int, default=1,
+                       help='Número de ambientes avaliados em lote (predict em batch)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Semente base (o episódio i usa seed + i)')
+    parser.add_argument('--record', type=str, default=None,
+                       help='Arquivo onde gravar os episódios (ver replay.py)')
+    parser.add_argument('--dataset', type=str, default=None,
+                       help='Diretório onde gravar as transições (dataset offline)')
+    parser.add_argument('--paired', action='store_true',
+                       help='Com --compare: avalia os dois modelos nos mesmos episódios e compara por episódio')
+    parser.add_argument('--ci-width', type=float, default=None,
+                       help='Para quando o intervalo de confiança da métrica alvo fica mais estreito que isto')
+    parser.add_argument('--target', type=str, default='reward', choices=StreamingEvaluator.METRICS,
+                       help='Métrica alvo da regra de parada')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                       help='Nível de confiança dos intervalos')
+    parser.add_argument('--min-episodes', type=int, default=30,
+                       help='Episódios mínimos antes da parada antecipada')
     
     args = parser.parse_args()
     
     if args.compare:
         # Modo comparação
-        compare_models(args.compare, args.model, args.episodes)
+        compare_models(args.compare, args.model, args.episodes, args.parallel, args.seed, paired=args.paired,
+                       target_metric=args.target, ci_width=args.ci_width, confidence=args.confidence,
+                       min_episodes=args.min_episodes)
     else:
         # Modo single
-        metrics = benchmark_model(args.model, args.episodes, args.render)
+        metrics = benchmark_model(args.model, args.episodes, args.render, args.parallel, args.seed,
+                                  record=args.record, dataset_dir=args.dataset, ci_width=args.ci_width,
+                                  target_metric=args.target, confidence=args.confidence,
+                                  min_episodes=args.min_episodes)
         if metrics:
             print_metrics(metrics)
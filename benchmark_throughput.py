@@ -0,0 +1,286 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: benchmark_throughput.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Benchmark de desempenho do simulador (não da qualidade do agente).
+    Mede passos/s e latência p50/p99 por passo de Game.step,
+    BrickBreakerEnv.step e da pilha VecFrameStack + VecNormalize, em modo
+    headless e renderizado, com 1..N ambientes e ações aleatórias ou do
+    modelo treinado. Os resultados são gravados em JSON e podem ser
+    comparados com uma execução anterior para detectar regressões.
+-----------------------------------------------------------------------
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+import numpy as np
+from stable_baselines3.common.vec_env import DummyVecEnv, VecFrameStack, VecNormalize
+from src.game import Game
+from src.rl_env import BrickBreakerEnv
+from src.config import MODEL_PATH, LOGS_DIR
+
+def summarize(name, mode, n_envs, actions, latencies_ns, steps_per_call=1):
+    """
+    Converte as latências de cada chamada em métricas de throughput.
+
+    Args:
+        name (str): Camada medida ('game', 'env' ou 'vec_stack').
+        mode (str): 'headless' ou 'rendered'.
+        n_envs (int): Número de ambientes avançados por chamada.
+        actions (str): 'random' ou 'policy'.
+        latencies_ns (np.ndarray): Duração de cada chamada em nanossegundos.
+        steps_per_call (int): Passos de ambiente por chamada.
+
+    Returns:
+        dict: Resultado serializável em JSON.
+    """
+    total_s = latencies_ns.sum() / 1e9
+    calls = len(latencies_ns)
+    return {
+        'name': name,
+        'mode': mode,
+        'n_envs': n_envs,
+        'actions': actions,
+        'calls': calls,
+        'steps_per_sec': calls * steps_per_call / total_s if total_s > 0 else 0.0,
+        'p50_us': float(np.percentile(latencies_ns, 50)) / 1e3,
+        'p99_us': float(np.percentile(latencies_ns, 99)) / 1e3,
+    }
+
+def bench_game(steps, headless, seed=0):
+    """
+    Mede Game.step diretamente (sem Gymnasium), com ações aleatórias.
+    """
+    game = Game(headless=headless, seed=seed)
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 3, size=steps)
+    latencies = np.empty(steps, dtype=np.int64)
+
+    for i in range(steps):
+        start = time.perf_counter_ns()
+        _, _, done = game.step(int(actions[i]))
+        if done:
+            game.reset_game()
+        latencies[i] = time.perf_counter_ns() - start
+
+    mode = 'headless' if headless else 'rendered'
+    return summarize('game', mode, 1, 'random', latencies)
+
+def bench_env(steps, seed=0):
+    """
+    Mede BrickBreakerEnv.step headless (o modo 'human' é limitado a FPS_HUMAN
+    por projeto, então o custo de renderização é medido em bench_game).
+    """
+    env = BrickBreakerEnv()
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 3, size=steps)
+    latencies = np.empty(steps, dtype=np.int64)
+
+    for i in range(steps):
+        start = time.perf_counter_ns()
+        _, _, terminated, truncated, _ = env.step(int(actions[i]))
+        if terminated or truncated:
+            env.reset()
+        latencies[i] = time.perf_counter_ns() - start
+
+    env.close()
+    return summarize('env', 'headless', 1, 'random', latencies)
+
+def load_policy():
+    """
+    Carrega o modelo treinado para gerar ações, se existir.
+
+    Returns:
+        DQN or None: Modelo carregado sem ambiente associado.
+    """
+    if not os.path.exists(f"{MODEL_PATH}.zip"):
+        return None
+    from stable_baselines3 import DQN
+    return DQN.load(MODEL_PATH, device='cpu')
+
+def bench_vec_stack(steps, n_envs, model=None, seed=0):
+    """
+    Mede a pilha usada no treino: DummyVecEnv + VecFrameStack + VecNormalize.
+
+    O VecNormalize fica em modo de treino (atualizando estatísticas) nos dois
+    tipos de ação. O tempo de model.predict não entra na latência medida; o
+    modelo só determina as ações (e, portanto, a dinâmica do jogo).
+    """
+    env = DummyVecEnv([lambda: BrickBreakerEnv() for _ in range(n_envs)])
+    env = VecFrameStack(env, n_stack=4)
+    stats_path = os.path.join(LOGS_DIR, "vec_normalize.pkl")
+    if os.path.exists(stats_path):
+        env = VecNormalize.load(stats_path, env)
+        env.training = True
+    else:
+        env = VecNormalize(env, norm_obs=True, norm_reward=False, clip_obs=10.0)
+    env.seed(seed)
+
+    rng = np.random.default_rng(seed)
+    latencies = np.empty(steps, dtype=np.int64)
+    obs = env.reset()
+
+    for i in range(steps):
+        if model is not None:
+            actions, _ = model.predict(obs, deterministic=True)
+        else:
+            actions = rng.integers(0, 3, size=n_envs)
+        start = time.perf_counter_ns()
+        obs, _, _, _ = env.step(actions)
+        latencies[i] = time.perf_counter_ns() - start
+
+    env.close()
+    actions_kind = 'policy' if model is not None else 'random'
+    return summarize('vec_stack', 'headless', n_envs, actions_kind, latencies, steps_per_call=n_envs)
+
+def env_counts(max_envs):
+    """
+    Sequência 1, 2, 4, ... até max_envs (inclusive).
+    """
+    counts = []
+    n = 1
+    while n < max_envs:
+        counts.append(n)
+        n *= 2
+    counts.append(max_envs)
+    return counts
+
+def run_suite(steps, max_envs, rendered=True, policy=True, seed=0):
+    """
+    Executa todas as medições da suíte.
+
+    Returns:
+        dict: Metadados da execução e lista de resultados.
+    """
+    results = []
+
+    print("Game.step headless...")
+    results.append(bench_game(steps, headless=True, seed=seed))
+    if rendered:
+        print("Game.step renderizado...")
+        results.append(bench_game(steps, headless=False, seed=seed))
+
+    print("BrickBreakerEnv.step headless...")
+    results.append(bench_env(steps, seed=seed))
+
+    model = load_policy() if policy else None
+    if policy and model is None:
+        print(f"Aviso: modelo não encontrado em {MODEL_PATH}.zip; medindo apenas ações aleatórias.")
+
+    for n_envs in env_counts(max_envs):
+        print(f"VecFrameStack + VecNormalize com {n_envs} ambiente(s)...")
+        results.append(bench_vec_stack(steps, n_envs, seed=seed))
+        if model is not None:
+            results.append(bench_vec_stack(steps, n_envs, model=model, seed=seed))
+
+    return {'metadata': run_metadata(steps, max_envs, seed), 'results': results}
+
+def run_metadata(steps, max_envs, seed):
+    """
+    Identifica a execução (commit, máquina, versões) para comparações futuras.
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'steps': steps,
+        'max_envs': max_envs,
+        'seed': seed,
+    }
+
+def result_key(result):
+    """Identifica uma medição para comparação entre execuções."""
+    return (result['name'], result['mode'], result['n_envs'], result['actions'])
+
+def compare(report, baseline, tolerance):
+    """
+    Compara passos/s com uma execução anterior.
+
+    Returns:
+        list: Descrições das regressões (queda maior que a tolerância).
+    """
+    previous = {result_key(r): r for r in baseline['results']}
+    regressions = []
+
+    print(f"\n{'Medição':<38} {'Base':>12} {'Atual':>12} {'Variação':>9}")
+    for result in report['results']:
+        key = result_key(result)
+        label = f"{key[0]} {key[1]} n={key[2]} {key[3]}"
+        if key not in previous:
+            print(f"{label:<38} {'-':>12} {result['steps_per_sec']:>12.0f} {'novo':>9}")
+            continue
+        base = previous[key]['steps_per_sec']
+        change = (result['steps_per_sec'] - base) / base if base > 0 else 0.0
+        flag = " ❌" if change < -tolerance else ""
+        print(f"{label:<38} {base:>12.0f} {result['steps_per_sec']:>12.0f} {change:>+8.1%}{flag}")
+        if change < -tolerance:
+            regressions.append(f"{label}: {base:.0f} -> {result['steps_per_sec']:.0f} passos/s ({change:+.1%})")
+
+    return regressions
+
+def print_report(report):
+    """Imprime os resultados em tabela."""
+    print(f"\n{'Medição':<38} {'Passos/s':>12} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for r in report['results']:
+        label = f"{r['name']} {r['mode']} n={r['n_envs']} {r['actions']}"
+        print(f"{label:<38} {r['steps_per_sec']:>12.0f} {r['p50_us']:>10.1f} {r['p99_us']:>10.1f}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark de throughput do simulador Brick Breaker')
+    parser.add_argument('--steps', type=int, default=5000,
+                       help='Chamadas de step por medição')
+    parser.add_argument('--max-envs', type=int, default=8,
+                       help='Maior número de ambientes na varredura 1, 2, 4, ...')
+    parser.add_argument('--no-render', action='store_true',
+                       help='Não mede o modo renderizado (máquinas sem display)')
+    parser.add_argument('--no-policy', action='store_true',
+                       help='Não mede ações do modelo treinado')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Semente das ações e dos episódios')
+    parser.add_argument('--output', type=str, default=os.path.join(LOGS_DIR, "throughput.json"),
+                       help='Arquivo JSON de saída')
+    parser.add_argument('--baseline', type=str, default=None,
+                       help='JSON de uma execução anterior para comparação')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                       help='Queda relativa de passos/s considerada regressão')
+
+    args = parser.parse_args()
+
+    report = run_suite(args.steps, args.max_envs, rendered=not args.no_render,
+                       policy=not args.no_policy, seed=args.seed)
+    print_report(report)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados salvos em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Regressões de desempenho detectadas:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n✅ Sem regressões acima da tolerância.")
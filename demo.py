@@ -11,19 +11,33 @@ Descrição:
 """
 
 import os
-import torch
-from stable_baselines3 import DQN
-from stable_baselines3.common.vec_env import DummyVecEnv, VecFrameStack, VecNormalize
 from src.rl_env import BrickBreakerEnv
-from src.config import MODEL_PATH
+from src.q_policy import QPolicy, StackedEnvs
+from src.config import MODEL_PATH, LOGS_DIR, POLICY_PATH
 
-def demo():
+def load_numpy_policy():
     """
-    Carrega o modelo e executa o jogo em loop para demonstração.
+    Carrega a política exportada (export_policy.py): inferência em NumPy,
+    sem importar torch.
+
+    Returns:
+        tuple: (env, predict, q_values)
     """
-    if not os.path.exists(f"{MODEL_PATH}.zip"):
-        print(f"Modelo não encontrado em {MODEL_PATH}.zip. Por favor, execute 'python train.py' primeiro.")
-        return
+    print(f"Carregando política exportada de {POLICY_PATH}...")
+    policy = QPolicy(POLICY_PATH)
+    env = StackedEnvs([lambda: BrickBreakerEnv(render_mode='human')], policy.n_stack)
+    return env, lambda obs: policy.predict(obs, deterministic=False), lambda obs: policy.q_values(obs)[0]
+
+def load_sb3_policy():
+    """
+    Carrega o modelo DQN completo do SB3 com as estatísticas de normalização.
+
+    Returns:
+        tuple: (env, predict, q_values)
+    """
+    import torch
+    from stable_baselines3 import DQN
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecFrameStack, VecNormalize
 
     print(f"Carregando modelo de {MODEL_PATH}...")
     
@@ -31,7 +45,6 @@ def demo():
     env = VecFrameStack(env, n_stack=4)
     
     # Carrega estatísticas se existirem
-    from src.config import LOGS_DIR
     stats_path = os.path.join(LOGS_DIR, "vec_normalize.pkl")
     
     if os.path.exists(stats_path):
@@ -44,6 +57,38 @@ def demo():
         env = VecNormalize(env, norm_obs=True, norm_reward=False, clip_obs=10.0, training=False)
 
     model = DQN.load(MODEL_PATH, env=env)
+
+    def q_values(obs):
+        # Debug: Q-Values da rede neural (DQN)
+        with torch.no_grad():
+            obs_tensor = model.policy.obs_to_tensor(obs)[0]
+            return model.q_net(obs_tensor).cpu().numpy()[0]
+
+    # deterministic=False para manter comportamento exploratório/probabilístico do treino
+    return env, lambda obs: model.predict(obs, deterministic=False)[0], q_values
+
+def demo():
+    """
+    Carrega o modelo e executa o jogo em loop para demonstração.
+
+    Usa a política exportada (POLICY_PATH) se existir e não for mais antiga
+    que o modelo do SB3; caso contrário, o modelo completo do SB3.
+    """
+    model_zip = f"{MODEL_PATH}.zip"
+    use_policy = os.path.exists(POLICY_PATH)
+    if use_policy and os.path.exists(model_zip) and os.path.getmtime(POLICY_PATH) < os.path.getmtime(model_zip):
+        # Modelo treinado depois da exportação: o .npz é de uma política anterior
+        print(f"Aviso: {POLICY_PATH} é mais antigo que {model_zip}; usando o modelo do SB3. "
+              f"Rode 'python export_policy.py' para atualizar a política exportada.")
+        use_policy = False
+
+    if use_policy:
+        env, predict, q_values = load_numpy_policy()
+    elif os.path.exists(model_zip):
+        env, predict, q_values = load_sb3_policy()
+    else:
+        print(f"Modelo não encontrado em {model_zip}. Por favor, execute 'python train.py' primeiro.")
+        return
     
     print("Iniciando demo... Pressione 'q' para sair.")
     
@@ -51,34 +96,23 @@ def demo():
     obs = env.reset()
     
     while True:
-        # deterministic=False para manter comportamento exploratório/probabilístico do treino
-        action, _states = model.predict(obs, deterministic=False)
+        action = predict(obs)
         
         # Debug: Imprime Q-Values da rede neural (DQN)
-        with torch.no_grad():
-            obs_tensor = model.policy.obs_to_tensor(obs)[0]
-            q_values = model.q_net(obs_tensor)
-            q_values = q_values.cpu().numpy()[0]
-            
-        print(f"\rQ-Values -> Ficar: {q_values[0]:.2f} | Esq: {q_values[1]:.2f} | Dir: {q_values[2]:.2f}", end="")
+        q = q_values(obs)
+        print(f"\rQ-Values -> Ficar: {q[0]:.2f} | Esq: {q[1]:.2f} | Dir: {q[2]:.2f}", end="")
         
         obs, reward, done, info = env.step(action)
         
         # VecEnv reseta automaticamente quando done=True, então não precisamos chamar reset manualmente
         # Mas queremos saber se resetou para imprimir mensagem
-        if hasattr(env, 'get_attr'):
-             # Tenta pegar flag 'game_over' ou similar do jogo real se possível, mas VecEnv abstrai isso.
-             # Verificamos 'terminal_observation' em info para saber se acabou
-             if len(info) > 0 and 'terminal_observation' in info[0]:
-                 print("\nReiniciando jogo...")
+        # Verificamos 'terminal_observation' em info para saber se acabou
+        if len(info) > 0 and 'terminal_observation' in info[0]:
+            print("\nReiniciando jogo...")
 
-        # Verifica se a janela foi fechada acessando atributo do jogo
-        try:
-             games = env.get_attr("game")
-             if games and not games[0].running:
-                 break
-        except:
-             break
+        # Verifica se a janela foi fechada (flag 'stop' do info)
+        if info[0].get("stop", False):
+            break
             
     env.close()
     print("\nDemo finalizada.")
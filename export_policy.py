@@ -0,0 +1,89 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: export_policy.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Exporta o modelo DQN (.zip) e as estatísticas do VecNormalize (.pkl)
+    para um .npz lido por src/q_policy.QPolicy, que roda a política em
+    NumPy puro (demo e benchmark sem torch).
+-----------------------------------------------------------------------
+"""
+
+import os
+import pickle
+import numpy as np
+from stable_baselines3 import DQN
+from src.vec_game import OBS_DIM
+from src.config import MODEL_PATH, LOGS_DIR, POLICY_PATH
+
+def export_policy(model_path=MODEL_PATH, stats_path=None, output=POLICY_PATH):
+    """
+    Converte a rede Q e a normalização de observações em arrays NumPy.
+
+    Args:
+        model_path (str): Modelo DQN (sem .zip).
+        stats_path (str, optional): vec_normalize.pkl; padrão em LOGS_DIR.
+                                    Se não existir, as observações não são normalizadas.
+        output (str): Arquivo .npz de saída.
+
+    Returns:
+        dict: Arrays gravados.
+    """
+    model = DQN.load(model_path, device='cpu')
+    if len(model.observation_space.shape) != 1 or model.observation_space.shape[0] % OBS_DIM:
+        raise ValueError("Apenas políticas MLP sobre observações vetoriais empilhadas podem ser exportadas.")
+    obs_size = model.observation_space.shape[0]
+
+    # Camadas lineares da rede online (a de destino não é usada na inferência)
+    linears = [m for m in model.q_net.q_net if hasattr(m, 'weight')]
+    arrays = {'num_layers': np.array(len(linears))}
+    for i, layer in enumerate(linears):
+        arrays[f'w{i}'] = layer.weight.detach().cpu().numpy().T.astype(np.float32)
+        arrays[f'b{i}'] = layer.bias.detach().cpu().numpy().astype(np.float32)
+
+    stats_path = stats_path or os.path.join(LOGS_DIR, "vec_normalize.pkl")
+    if os.path.exists(stats_path):
+        # O VecNormalize é serializado sem o venv; basta o pickle
+        with open(stats_path, 'rb') as f:
+            vec_normalize = pickle.load(f)
+        std = np.sqrt(vec_normalize.obs_rms.var + vec_normalize.epsilon)
+        scale = 1.0 / std
+        shift = -vec_normalize.obs_rms.mean / std
+        clip_obs = vec_normalize.clip_obs if vec_normalize.norm_obs else np.inf
+        if not vec_normalize.norm_obs:
+            scale, shift = np.ones(obs_size), np.zeros(obs_size)
+    else:
+        print(f"Aviso: {stats_path} não encontrado; observações não serão normalizadas.")
+        scale, shift, clip_obs = np.ones(obs_size), np.zeros(obs_size), np.inf
+
+    arrays.update({
+        'obs_scale': scale.astype(np.float64),
+        'obs_shift': shift.astype(np.float64),
+        'clip_obs': np.array(clip_obs, dtype=np.float64),
+        'obs_dim': np.array(OBS_DIM),
+        'n_stack': np.array(obs_size // OBS_DIM),
+        'exploration_rate': np.array(model.exploration_rate),
+    })
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    np.savez(output, **arrays)
+    return arrays
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Exporta a política DQN para NumPy (.npz)')
+    parser.add_argument('--model', type=str, default=MODEL_PATH,
+                       help='Caminho para o modelo (sem .zip)')
+    parser.add_argument('--stats', type=str, default=None,
+                       help='Estatísticas do VecNormalize (padrão: logs/vec_normalize.pkl)')
+    parser.add_argument('--output', type=str, default=POLICY_PATH,
+                       help='Arquivo .npz de saída')
+
+    args = parser.parse_args()
+    arrays = export_policy(args.model, args.stats, args.output)
+    num_layers = int(arrays['num_layers'])
+    sizes = [arrays[f'w{i}'].shape[0] for i in range(num_layers)] + [arrays[f'b{num_layers - 1}'].shape[0]]
+    print(f"Política exportada para {args.output} (camadas: {' -> '.join(map(str, sizes))})")
@@ -12,6 +12,18 @@ Descrição:
 from src.game import Game
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Brick Breaker (modo humano)')
+    parser.add_argument('--dataset', type=str, default=None,
+                       help='Diretório onde gravar as transições da partida (dataset offline)')
+    args = parser.parse_args()
+
+    dataset = None
+    if args.dataset:
+        from src.dataset import DatasetWriter
+        dataset = DatasetWriter(args.dataset)
+
     # Cria uma instância do jogo e o executa no loop principal.
     game = Game()
-    game.run()
\ No newline at end of file
+    game.run(dataset)
\ No newline at end of file
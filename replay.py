@@ -0,0 +1,80 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: replay.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Reproduz episódios gravados (benchmark.py --record) sem rodar a
+    política: lista os episódios de um arquivo, exibe um episódio a
+    partir de qualquer frame ou verifica o replay contra as observações
+    e recompensas gravadas.
+-----------------------------------------------------------------------
+"""
+
+import numpy as np
+from src.recording import EpisodeFile, EpisodeReplayer
+
+def list_episodes(episodes):
+    """
+    Imprime um resumo de cada episódio do arquivo.
+    """
+    print(f"{'#':>5} {'Seed':>20} {'Passos':>8} {'Frame skip':>10} {'Fim':>10}")
+    for i, episode in enumerate(episodes):
+        end = 'game over' if episode.terminated else 'truncado'
+        print(f"{i:>5} {episode.seed:>20} {episode.num_steps:>8} {episode.frame_skip:>10} {end:>10}")
+
+def verify(episode):
+    """
+    Reexecuta o episódio headless e compara com os dados gravados.
+
+    Returns:
+        bool: True se observações e recompensas gravadas foram reproduzidas.
+    """
+    replayer = EpisodeReplayer(episode, headless=True)
+    ok = True
+    if episode.observations is not None:
+        ok &= np.array_equal(replayer.game.get_state(), episode.observations[0])
+    for t, state, reward, _ in replayer.play():
+        if episode.observations is not None:
+            ok &= np.array_equal(state, episode.observations[t])
+        if episode.rewards is not None:
+            ok &= np.float32(reward) == episode.rewards[t - 1]
+    return bool(ok) and replayer.t == episode.num_steps
+
+def play(episode, frame=0):
+    """
+    Exibe o episódio em tempo real a partir do frame informado.
+    """
+    replayer = EpisodeReplayer(episode, headless=False)
+    replayer.seek(frame)
+    print(f"Reproduzindo a partir do frame {frame}/{episode.num_steps}... Feche a janela para sair.")
+    for _ in replayer.play():
+        pass
+    game = replayer.game
+    print(f"Fim do replay: frame {replayer.t}, pontuação {game.score}, nível {game.level}, vidas {game.lives}")
+    replayer.close()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Replay de episódios gravados do Brick Breaker')
+    parser.add_argument('path', type=str,
+                       help='Arquivo de gravação')
+    parser.add_argument('--episode', type=int, default=None,
+                       help='Índice do episódio (sem ele, lista os episódios)')
+    parser.add_argument('--frame', type=int, default=0,
+                       help='Frame inicial do replay')
+    parser.add_argument('--verify', action='store_true',
+                       help='Verifica o replay headless em vez de exibi-lo')
+
+    args = parser.parse_args()
+    episodes = EpisodeFile(args.path)
+
+    if args.episode is None:
+        list_episodes(episodes)
+    elif args.verify:
+        reproduced = verify(episodes[args.episode])
+        print("✅ Replay idêntico à gravação" if reproduced else "❌ Replay divergiu da gravação")
+    else:
+        play(episodes[args.episode], args.frame)
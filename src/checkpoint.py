@@ -0,0 +1,199 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/checkpoint.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Checkpoints periódicos do treino: modelo, estatísticas do
+    VecNormalize, replay buffer e estados dos geradores aleatórios.
+
+    No processo de treino são feitos apenas o save do modelo (pequeno) e
+    uma cópia simples (np.copy) dos arrays do replay buffer, consistente
+    naquele passo; a serialização do buffer e a gravação em disco ficam com
+    uma thread em segundo plano, para que o learner não espere por elas. Cada
+    checkpoint é escrito em um diretório temporário e renomeado ao final,
+    então um checkpoint parcial nunca é confundido com um completo.
+-----------------------------------------------------------------------
+"""
+
+import io
+import os
+import pickle
+import random
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import torch
+
+MODEL_FILE = "model.zip"
+VEC_NORMALIZE_FILE = "vec_normalize.pkl"
+REPLAY_BUFFER_FILE = "replay_buffer.pkl"
+RNG_FILE = "rng.pkl"
+
+def checkpoint_name(num_timesteps):
+    return f"step_{num_timesteps:012d}"
+
+def list_checkpoints(directory):
+    """
+    Checkpoints completos de um diretório, do mais antigo ao mais recente.
+    """
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(n for n in os.listdir(directory) if n.startswith("step_") and not n.endswith(".tmp"))
+    return [os.path.join(directory, n) for n in names]
+
+def latest_checkpoint(directory):
+    """
+    Caminho do checkpoint mais recente (None se não houver).
+    """
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[-1] if checkpoints else None
+
+def capture_rng_state(model):
+    """
+    Estados dos geradores usados no treino: numpy global (epsilon e amostragem
+    do buffer no SB3), torch, random, o espaço de ações (ações exploratórias)
+    e o RNG de cada ambiente.
+    """
+    return {
+        'numpy': np.random.get_state(),
+        'torch': torch.get_rng_state(),
+        'random': random.getstate(),
+        'action_space': model.action_space.np_random.bit_generator.state,
+        'envs': model.get_env().env_method("get_rng_state"),
+    }
+
+def restore_rng_state(state, model):
+    """
+    Restaura os estados capturados por capture_rng_state (depois do DQN.load,
+    que re-semeia os geradores globais com a seed do modelo).
+
+    O DQN.load também chama env.seed(), que só agenda as sementes para o
+    próximo reset: elas são descartadas aqui, senão o reset do learn
+    re-semearia os ambientes e o treino retomado repetiria os episódios de
+    um treino novo.
+    """
+    np.random.set_state(state['numpy'])
+    torch.set_rng_state(state['torch'])
+    random.setstate(state['random'])
+    model.action_space.np_random.bit_generator.state = state['action_space']
+    env = model.get_env()
+    env.unwrapped._reset_seeds()
+    env_states = state['envs']
+    if all(env_state == env_states[0] for env_state in env_states[1:]):
+        # Gerador único (motor vetorizado, que só aceita chamadas para todos os
+        # jogos) ou estados iguais: uma chamada vale para todos
+        env.env_method("set_rng_state", env_states[0])
+    else:
+        for i, env_state in enumerate(env_states):
+            env.env_method("set_rng_state", env_state, indices=[i])
+
+    # O próximo reset deve partir destes estados, sem sementes pendentes
+    if env.env_method("get_rng_state") != env_states or any(seed is not None for seed in env.unwrapped._seeds):
+        raise RuntimeError("Estado do RNG dos ambientes não foi restaurado para o resume")
+
+def load_replay_buffer(model, path):
+    """
+    Carrega o replay buffer de um checkpoint no modelo.
+
+    O DQN.load_replay_buffer do SB3 só aceita subclasses de ReplayBuffer; o
+    FrameStackReplayBuffer deriva de BaseBuffer, então o pickle é lido aqui.
+    """
+    with open(path, 'rb') as f:
+        buffer = pickle.load(f)
+    buffer.device = model.device
+    model.replay_buffer = buffer
+    # O modelo pode ter sido carregado com um buffer mínimo (ver train.py);
+    # o tamanho salvo nos próximos checkpoints é o do buffer restaurado
+    model.buffer_size = buffer.buffer_size * buffer.n_envs
+
+def snapshot_buffer(buffer):
+    """
+    Cópia do replay buffer para serialização em segundo plano: os arrays são
+    copiados (np.copy, sem o custo do pickle) e os demais atributos são
+    compartilhados. Não passa por __setstate__, que alteraria o original.
+    """
+    snapshot = object.__new__(type(buffer))
+    snapshot.__dict__.update({
+        name: np.copy(value) if isinstance(value, np.ndarray) else value
+        for name, value in vars(buffer).items()
+    })
+    return snapshot
+
+class CheckpointWriter:
+    """
+    Grava checkpoints em segundo plano (uma gravação por vez).
+    """
+
+    def __init__(self, directory, keep=2):
+        """
+        Args:
+            directory (str): Diretório dos checkpoints.
+            keep (int): Quantidade de checkpoints mais recentes mantidos (>= 1).
+        """
+        if keep < 1:
+            raise ValueError(f"keep deve ser >= 1, recebido {keep}")
+        self.directory = directory
+        self.keep = keep
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self.pending = None
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, model, vec_normalize):
+        """
+        Captura o estado atual e agenda sua gravação.
+
+        Args:
+            model (DQN): Modelo em treino (com replay buffer).
+            vec_normalize (VecNormalize): Wrapper com as estatísticas de normalização.
+        """
+        # Limita a memória: no máximo um checkpoint aguardando disco
+        self.wait()
+
+        # Captura no thread do learner: o snapshot reflete exatamente este passo.
+        # Os objetos pequenos viram bytes aqui; o buffer é serializado na gravação
+        model_bytes = io.BytesIO()
+        model.save(model_bytes)
+        files = {
+            MODEL_FILE: model_bytes.getvalue(),
+            VEC_NORMALIZE_FILE: pickle.dumps(vec_normalize, protocol=pickle.HIGHEST_PROTOCOL),
+            REPLAY_BUFFER_FILE: snapshot_buffer(model.replay_buffer),
+            RNG_FILE: pickle.dumps(capture_rng_state(model), protocol=pickle.HIGHEST_PROTOCOL),
+        }
+        self.pending = self.executor.submit(self.write, checkpoint_name(model.num_timesteps), files)
+
+    def write(self, name, files):
+        """
+        Grava os arquivos do checkpoint (executado na thread de fundo).
+        Valores em bytes são gravados como estão; os demais são serializados
+        com pickle direto no arquivo.
+        """
+        final = os.path.join(self.directory, name)
+        tmp = final + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for filename, data in files.items():
+            with open(os.path.join(tmp, filename), 'wb') as f:
+                if isinstance(data, bytes):
+                    f.write(data)
+                else:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(tmp, final)
+
+        for old in list_checkpoints(self.directory)[:-self.keep]:
+            shutil.rmtree(old, ignore_errors=True)
+        return final
+
+    def wait(self):
+        """
+        Aguarda a gravação em andamento (propaga erros de I/O).
+        """
+        if self.pending is not None:
+            self.pending.result()
+            self.pending = None
+
+    def close(self):
+        self.wait()
+        self.executor.shutdown()
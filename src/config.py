@@ -53,6 +53,12 @@ BALL_SPEED_Y_INITIAL = -5  # Velocidade base vertical (negativo sobe)
 BALL_SPEED_INCREASE = 0.05 # % de aumento por nível
 BALL_COLOR = WHITE
 
+# Colisão Contínua (swept): calcula o instante exato de impacto dentro do frame,
+# evitando que a bola atravesse tijolos/raquete em velocidades altas.
+# Desligado por padrão para manter a física dos modelos já treinados e do motor vetorizado.
+SWEPT_COLLISIONS = False
+SWEPT_MAX_BOUNCES = 8      # Máximo de rebatidas resolvidas por frame
+
 # Randomização Inicial da Bola
 BALL_RANDOM_X_OFFSET = 20  # Variação +/- do centro da raquete
 BALL_RANDOM_SPEED_MIN = 3.0
@@ -66,6 +72,8 @@ BRICK_HEIGHT = 20
 BRICK_GAP = 10
 BRICK_OFFSET_TOP = 50
 BRICK_OFFSET_LEFT = 35
+BRICK_ROWS = 5
+BRICK_COLS = 10
 BRICK_COLORS = [RED, GREEN, BLUE]
 SPECIAL_BRICK_CHANCE = 0.1 # 10% de chance a partir do nível 2
 
@@ -78,12 +86,14 @@ MODELS_DIR = os.path.join(BASE_DIR, "models")
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 MODEL_NAME = "dqn_brickbreaker"
 MODEL_PATH = os.path.join(MODELS_DIR, MODEL_NAME)
+POLICY_PATH = f"{MODEL_PATH}.npz" # Política exportada para NumPy (export_policy.py)
 
 # Hiperparâmetros de Treino
 # Hiperparâmetros de Treino (DQN Config)
 TOTAL_TIMESTEPS = 3_000_000
 LEARNING_RATE = 1e-4
 BUFFER_SIZE = 100_000
+FRAME_STACK_BUFFER = True  # Replay buffer de frames únicos (src/replay_buffer.py), ~6x menos memória
 LEARNING_STARTS = 1000
 BATCH_SIZE = 32
 TAU = 1.0 
@@ -97,6 +107,44 @@ EXPLORATION_FINAL_EPS = 0.02     # Reduzido de 0.05 para 0.02 - mais greedy no f
 
 NET_ARCH = [256, 256] # Para DQN é apenas uma lista de hidden layers
 
+# Observação em Pixels (obs_type="pixels" no BrickBreakerEnv)
+OBS_TYPE = "vector"        # "vector" (10 features) ou "pixels" (tons de cinza reduzidos)
+PIXEL_OBS_WIDTH = 84
+PIXEL_OBS_HEIGHT = 84
+PIXEL_OBS_STACK = 4        # Frames empilhados pelo próprio ambiente (ring buffer)
+
+# Action Repeat: ticks de física por decisão do agente (BrickBreakerEnv)
+FRAME_SKIP = 1
+
+# Limites de Episódio (truncamento; 0 = desligado)
+MAX_EPISODE_STEPS = 30_000 # Passos do agente por episódio
+STALL_FRAMES = 3_600       # Frames sem quebrar tijolo, tocar a raquete ou perder vida (~60s a 60fps)
+
+# Paralelismo de Treino
+NUM_WORKERS = 1            # Processos de ambiente (SubprocVecEnv quando > 1)
+TRAIN_SEED = 0             # Semente base; cada worker usa TRAIN_SEED + índice
+
+# Motor Vetorizado (src/vec_game.py)
+USE_VEC_ENGINE = False     # True = N jogos em arrays NumPy num único VecEnv
+VEC_ENGINE_NUM_ENVS = 64   # Número de jogos simulados em paralelo pelo motor vetorizado
+
+# Profiling por Fase (src/profiler.py)
+PROFILE_PHASES = False     # True = mede events/update/draw/get_state e exporta ao TensorBoard
+PROFILE_LOG_FREQ = 10000   # Intervalo (em passos) entre registros do profiling no TensorBoard
+
+# Gravação e Replay de Episódios (src/recording.py)
+REPLAY_SNAPSHOT_INTERVAL = 500 # Passos entre snapshots guardados pelo replayer (seek rápido)
+
+# Dataset Offline de Transições (src/dataset.py)
+DATASET_SHARD_SIZE = 1_000_000     # Transições por shard (~46 MB com observações vetoriais)
+DATASET_INITIAL_CAPACITY = 65_536  # Capacidade inicial de cada shard (dobra até DATASET_SHARD_SIZE)
+DATASET_MAX_OPEN_SHARDS = 64      # Shards com memmaps abertos na leitura (LRU; 4 descritores por shard)
+
+# Checkpoints do Treino (src/checkpoint.py, train.py --resume)
+CHECKPOINT_DIR = os.path.join(MODELS_DIR, "checkpoints")
+CHECKPOINT_FREQ = 100_000  # Timesteps entre checkpoints (0 = desligado)
+CHECKPOINT_KEEP = 2        # Checkpoints mais recentes mantidos em disco
+
 # Sistema de Recompensa (Reward Shaping)
 REWARD_HIT_BRICK = 10       # Ganho ao quebrar tijolo
 REWARD_HIT_PADDLE = 10      # Ganho ao rebater na raquete
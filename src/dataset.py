@@ -0,0 +1,420 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/dataset.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Dataset offline de transições (obs, ação, recompensa, terminated,
+    truncated) para pré-treino e ajuste a partir de partidas gravadas
+    (humanas ou do agente), sem simuladores rodando.
+
+    O dataset é um diretório de shards, cada um com seis arquivos .npy
+    (obs, actions, rewards, terminated, truncated, final) abertos como
+    memmap. Cada shard começa
+    com DATASET_INITIAL_CAPACITY linhas e dobra até DATASET_SHARD_SIZE;
+    ao fechar, o arquivo é truncado para o número real de transições e o
+    índice dataset.json é atualizado. Shards não finalizados são ignorados
+    pela leitura.
+
+    Cada fluxo (stream) grava transições consecutivas de um mesmo jogo,
+    então a próxima observação da linha i é a linha i + 1 (se não
+    terminated). Um episódio truncado (limite de tempo, bola presa) não é
+    terminal: a transição truncada é seguida de uma linha 'final' com a
+    observação real em que o episódio foi cortado, que não é uma transição
+    e serve apenas de próxima observação para o bootstrap.
+-----------------------------------------------------------------------
+"""
+
+import os
+import json
+from collections import OrderedDict
+import numpy as np
+import gymnasium as gym
+from numpy.lib import format as npy_format
+from src.vec_game import OBS_DIM
+from src.config import DATASET_SHARD_SIZE, DATASET_INITIAL_CAPACITY, DATASET_MAX_OPEN_SHARDS
+
+INDEX_FILE = "dataset.json"
+DATASET_VERSION = 2 # 1: campo único 'dones' (truncamentos tratados como terminais)
+
+def shard_fields(obs_dim):
+    """
+    Arquivos de um shard: nome -> (dtype, formato de uma linha).
+    """
+    return {
+        'obs': (np.float32, (obs_dim,)),
+        'actions': (np.uint8, ()),
+        'rewards': (np.float32, ()),
+        'terminated': (np.bool_, ()),
+        'truncated': (np.bool_, ()),
+        'final': (np.bool_, ()),
+    }
+
+def resize_npy(path, rows):
+    """
+    Altera o número de linhas de um .npy no lugar (cabeçalho + tamanho do
+    arquivo), sem copiar os dados já gravados.
+    """
+    with open(path, 'r+b') as f:
+        version = npy_format.read_magic(f)
+        if version != (1, 0):
+            raise ValueError(f"Versão de .npy não suportada em {path}: {version}")
+        shape, fortran_order, dtype = npy_format.read_array_header_1_0(f)
+        header_size = f.tell()
+
+        # O numpy reserva espaço no cabeçalho para o eixo 0 crescer
+        f.seek(0)
+        npy_format.write_array_header_1_0(f, {
+            'descr': npy_format.dtype_to_descr(dtype),
+            'fortran_order': fortran_order,
+            'shape': (rows,) + shape[1:],
+        })
+        if f.tell() != header_size:
+            raise ValueError(f"Cabeçalho de {path} mudou de tamanho ao redimensionar")
+
+        row_bytes = dtype.itemsize * int(np.prod(shape[1:], dtype=np.int64))
+        f.truncate(header_size + rows * row_bytes)
+
+class ShardWriter:
+    """
+    Um shard em gravação: um memmap .npy por campo, com crescimento por duplicação.
+    """
+
+    def __init__(self, directory, obs_dim, capacity, max_size):
+        self.directory = directory
+        self.obs_dim = obs_dim
+        self.capacity = min(capacity, max_size)
+        self.max_size = max_size
+        self.count = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.arrays = {}
+        for name, (dtype, row_shape) in shard_fields(obs_dim).items():
+            self.arrays[name] = npy_format.open_memmap(
+                self.path(name), mode='w+', dtype=dtype, shape=(self.capacity,) + row_shape
+            )
+
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    @property
+    def full(self):
+        return self.count == self.max_size
+
+    def add(self, obs, action=0, reward=0.0, terminated=False, truncated=False, final=False):
+        """
+        Grava uma linha (transição ou observação final) na próxima linha livre.
+        """
+        if self.count == self.capacity:
+            self.resize(min(2 * self.capacity, self.max_size))
+        i = self.count
+        self.arrays['obs'][i] = obs
+        self.arrays['actions'][i] = action
+        self.arrays['rewards'][i] = reward
+        self.arrays['terminated'][i] = terminated
+        self.arrays['truncated'][i] = truncated
+        self.arrays['final'][i] = final
+        self.count = i + 1
+
+    def resize(self, rows):
+        """
+        Redimensiona os arquivos e reabre os memmaps.
+        """
+        for name in self.arrays:
+            self.arrays[name].flush()
+        self.arrays.clear() # Fecha os memmaps antes de mexer nos arquivos
+        for name in shard_fields(self.obs_dim):
+            resize_npy(self.path(name), rows)
+            self.arrays[name] = np.load(self.path(name), mmap_mode='r+')
+        self.capacity = rows
+
+    def finalize(self):
+        """
+        Trunca o shard para as transições gravadas.
+
+        Returns:
+            int: Número de transições do shard.
+        """
+        for name in self.arrays:
+            self.arrays[name].flush()
+        self.arrays.clear()
+        for name in shard_fields(self.obs_dim):
+            resize_npy(self.path(name), self.count)
+        return self.count
+
+class DatasetWriter:
+    """
+    Grava transições de um ou mais fluxos em shards de um diretório.
+    Um diretório existente é estendido (novos shards são anexados ao índice).
+    """
+
+    def __init__(self, root, obs_dim=OBS_DIM, num_streams=1,
+                 shard_size=DATASET_SHARD_SIZE, initial_capacity=DATASET_INITIAL_CAPACITY):
+        """
+        Args:
+            root (str): Diretório do dataset.
+            obs_dim (int): Tamanho do vetor de observação (layout de Game.get_state).
+            num_streams (int): Fluxos independentes (ex: um por ambiente do VecEnv).
+            shard_size (int): Máximo de transições por shard.
+            initial_capacity (int): Linhas pré-alocadas ao abrir um shard.
+        """
+        self.root = root
+        self.obs_dim = obs_dim
+        self.shard_size = shard_size
+        self.initial_capacity = initial_capacity
+        os.makedirs(root, exist_ok=True)
+
+        self.index = load_index(root) or {'version': DATASET_VERSION, 'obs_dim': obs_dim, 'shards': []}
+        check_version(self.index, root)
+        if self.index['obs_dim'] != obs_dim:
+            raise ValueError(f"Dataset em {root} usa obs_dim={self.index['obs_dim']}, não {obs_dim}")
+        self.next_shard = len(self.index['shards'])
+        self.streams = [None] * num_streams
+
+    def add(self, obs, action, reward, terminated, truncated=False, final_obs=None, stream=0):
+        """
+        Anexa uma transição ao fluxo informado.
+
+        Args:
+            obs (np.ndarray): Observação em que a ação foi escolhida.
+            action (int): Ação executada.
+            reward (float): Recompensa recebida.
+            terminated (bool): Se o episódio terminou (fim de jogo) após a ação.
+            truncated (bool): Se o episódio foi cortado após a ação sem terminar.
+            final_obs (np.ndarray, optional): Observação após a ação; obrigatória
+                                              se truncated (gravada em uma linha final).
+            stream (int): Fluxo (jogo) da transição.
+        """
+        truncated = truncated and not terminated
+        if truncated and final_obs is None:
+            raise ValueError("Transições truncadas precisam de final_obs")
+        shard = self.streams[stream]
+        if shard is not None and truncated and shard.count + 2 > shard.max_size:
+            # Transição truncada e sua linha final ficam no mesmo shard
+            self.close_shard(stream)
+            shard = None
+        if shard is None:
+            shard = self.open_shard(stream)
+        shard.add(obs, action, reward, terminated, truncated)
+        if truncated:
+            shard.add(final_obs, final=True)
+        if shard.full:
+            self.close_shard(stream)
+
+    def open_shard(self, stream):
+        name = f"shard_{self.next_shard:06d}"
+        self.next_shard += 1
+        shard = ShardWriter(os.path.join(self.root, name), self.obs_dim,
+                            self.initial_capacity, self.shard_size)
+        shard.name = name
+        self.streams[stream] = shard
+        return shard
+
+    def close_shard(self, stream):
+        """
+        Finaliza o shard atual do fluxo e o registra no índice.
+        """
+        shard = self.streams[stream]
+        self.streams[stream] = None
+        size = shard.finalize()
+        self.index['shards'].append({'name': shard.name, 'size': size, 'stream': stream})
+        self.save_index()
+
+    def save_index(self):
+        # Escrita atômica: leitores nunca veem um índice pela metade
+        path = os.path.join(self.root, INDEX_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def close(self):
+        """
+        Finaliza os shards abertos de todos os fluxos.
+        """
+        for stream, shard in enumerate(self.streams):
+            if shard is not None:
+                self.close_shard(stream)
+
+def check_version(index, root):
+    """
+    Rejeita datasets gravados em outro formato de shard.
+    """
+    version = index.get('version', 1)
+    if version != DATASET_VERSION:
+        raise ValueError(f"Dataset em {root} tem formato {version}; esta versão lê o formato {DATASET_VERSION}")
+
+def load_index(root):
+    """
+    Lê o índice dataset.json de um diretório (None se não existir).
+    """
+    path = os.path.join(root, INDEX_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+class TransitionDataset:
+    """
+    Leitura de um dataset gravado por DatasetWriter. Os shards ficam em
+    memmap (somente leitura); apenas as linhas sorteadas são lidas do disco.
+
+    Os memmaps são abertos sob demanda e mantidos em um cache LRU de no
+    máximo max_open_shards shards, para que datasets com milhares de shards
+    não esgotem o limite de arquivos abertos do processo (ulimit -n).
+    """
+
+    def __init__(self, root, max_open_shards=DATASET_MAX_OPEN_SHARDS):
+        """
+        Args:
+            root (str): Diretório do dataset.
+            max_open_shards (int, optional): Shards com memmaps abertos ao mesmo tempo.
+        """
+        index = load_index(root)
+        if index is None:
+            raise FileNotFoundError(f"{INDEX_FILE} não encontrado em {root}")
+        check_version(index, root)
+        self.obs_dim = index['obs_dim']
+
+        self.shard_dirs = []
+        sizes = []
+        for entry in index['shards']:
+            if entry['size'] == 0:
+                continue
+            self.shard_dirs.append(os.path.join(root, entry['name']))
+            sizes.append(entry['size'])
+        self.max_open_shards = max_open_shards
+        self.open_shards = OrderedDict()
+
+        self.sizes = np.array(sizes, dtype=np.int64)
+        self.starts = np.concatenate([[0], np.cumsum(self.sizes)])
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    def shard(self, s):
+        """
+        Memmaps do shard s, abertos no primeiro acesso. Ao exceder
+        max_open_shards, o shard usado há mais tempo sai do cache e seus
+        memmaps são fechados (os batches guardam cópias, não views).
+        """
+        arrays = self.open_shards.get(s)
+        if arrays is not None:
+            self.open_shards.move_to_end(s)
+            return arrays
+        if len(self.open_shards) >= self.max_open_shards:
+            self.open_shards.popitem(last=False)
+        arrays = {
+            name: np.load(os.path.join(self.shard_dirs[s], f"{name}.npy"), mmap_mode='r')
+            for name in shard_fields(self.obs_dim)
+        }
+        self.open_shards[s] = arrays
+        return arrays
+
+    def locate(self, indices):
+        """
+        Converte índices globais em (shard, linha local).
+        """
+        shard = np.searchsorted(self.starts, indices, side='right') - 1
+        return shard, indices - self.starts[shard]
+
+    def sample_indices(self, batch_size, rng):
+        """
+        Sorteia índices de transições com próxima observação conhecida.
+
+        Linhas 'final' (observação final de um episódio truncado) não são
+        transições e são re-sorteadas, assim como a última linha de um shard
+        que não termina episódio (shard cortado por tamanho ou gravação
+        interrompida), que não tem próxima observação.
+        """
+        indices = rng.integers(len(self), size=batch_size)
+        pending = np.arange(batch_size)
+        while pending.size:
+            shard_of, local = self.locate(indices[pending])
+            invalid = np.zeros(pending.size, dtype=np.bool_)
+            for s in np.unique(shard_of):
+                rows = np.flatnonzero(shard_of == s)
+                idx = local[rows]
+                arrays = self.shard(s)
+                last = idx == self.sizes[s] - 1
+                invalid[rows] = arrays['final'][idx] | (last & ~arrays['terminated'][idx])
+            pending = pending[invalid]
+            indices[pending] = rng.integers(len(self), size=pending.size)
+        return indices
+
+    def sample(self, batch_size, rng=None):
+        """
+        Sorteia um minibatch uniforme de transições.
+
+        Returns:
+            dict: obs (B, obs_dim), actions (B,), rewards (B,), next_obs (B, obs_dim),
+                  dones (B,) e truncated (B,). dones marca apenas fins de jogo
+                  (terminated), os únicos que cortam o bootstrap; em transições
+                  truncadas next_obs é a observação real do corte, e em terminais
+                  repete obs.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        indices = self.sample_indices(batch_size, rng)
+        shard_of, local = self.locate(indices)
+
+        batch = {
+            'obs': np.empty((batch_size, self.obs_dim), dtype=np.float32),
+            'actions': np.empty(batch_size, dtype=np.uint8),
+            'rewards': np.empty(batch_size, dtype=np.float32),
+            'next_obs': np.empty((batch_size, self.obs_dim), dtype=np.float32),
+            'dones': np.empty(batch_size, dtype=np.bool_),
+            'truncated': np.empty(batch_size, dtype=np.bool_),
+        }
+        for s in np.unique(shard_of):
+            rows = np.flatnonzero(shard_of == s)
+            # Leitura em ordem crescente: acessos sequenciais ao memmap
+            rows = rows[np.argsort(local[rows])]
+            idx = local[rows]
+            arrays = self.shard(s)
+            batch['obs'][rows] = arrays['obs'][idx]
+            batch['actions'][rows] = arrays['actions'][idx]
+            batch['rewards'][rows] = arrays['rewards'][idx]
+            terminated = arrays['terminated'][idx]
+            batch['dones'][rows] = terminated
+            batch['truncated'][rows] = arrays['truncated'][idx]
+            batch['next_obs'][rows] = arrays['obs'][np.where(terminated, idx, idx + 1)]
+        return batch
+
+    def minibatches(self, batch_size, seed=None):
+        """
+        Gera minibatches aleatórios indefinidamente.
+        """
+        rng = np.random.default_rng(seed)
+        while True:
+            yield self.sample(batch_size, rng)
+
+class RecordTransitions(gym.Wrapper):
+    """
+    Wrapper que grava cada transição de um BrickBreakerEnv vetorial em um
+    fluxo de um DatasetWriter.
+    """
+
+    def __init__(self, env, writer, stream=0):
+        """
+        Args:
+            env (BrickBreakerEnv): Ambiente com obs_type='vector'.
+            writer (DatasetWriter): Destino das transições (pode ser compartilhado).
+            stream (int): Fluxo deste ambiente no writer.
+        """
+        super().__init__(env)
+        if env.observation_space.shape != (writer.obs_dim,):
+            raise ValueError("O dataset offline grava apenas observações vetoriais (obs_type='vector').")
+        self.writer = writer
+        self.stream = stream
+        self.obs = np.zeros(writer.obs_dim, dtype=np.float32)
+
+    def reset(self, **kwargs):
+        obs, info = self.env.reset(**kwargs)
+        np.copyto(self.obs, obs)
+        return obs, info
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        self.writer.add(self.obs, int(action), reward, terminated, truncated, obs, self.stream)
+        np.copyto(self.obs, obs)
+        return obs, reward, terminated, truncated, info
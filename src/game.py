@@ -11,47 +11,153 @@ Descrição:
 -----------------------------------------------------------------------
 """
 
+import time
 import pygame
 import numpy as np
-import random
 from src.config import *
-from src.sprites import Paddle, Ball, Brick
+from src.sprites import Paddle, Ball, Brick, SpritePool
+from src.hud import Hud
+from src.profiler import PhaseProfiler
+
+# Fases instrumentadas por Game.step (índices usados em PhaseProfiler.record)
+GAME_PHASES = ('events', 'update', 'reward', 'draw', 'get_state')
+PHASE_EVENTS, PHASE_UPDATE, PHASE_REWARD, PHASE_DRAW, PHASE_GET_STATE = range(len(GAME_PHASES))
+
+def to_gray(color):
+    """
+    Converte uma cor RGB para intensidade em tons de cinza (luma ITU-R 601).
+    """
+    r, g, b = color
+    return int(0.299 * r + 0.587 * g + 0.114 * b)
+
+class GameSnapshot:
+    """
+    Registro compacto (e serializável com pickle) do estado de um Game.
+
+    Tijolos são guardados como bitmasks (bit linha * BRICK_COLS + coluna).
+    """
+    __slots__ = (
+        'paddle_x', 'paddle_vel_x', 'ball', 'ball_alive',
+        'alive_mask', 'special_mask', 'score', 'lives', 'level', 'paddle_hits', 'rng_state',
+    )
+
+    def __init__(self, paddle_x, paddle_vel_x, ball, ball_alive,
+                 alive_mask, special_mask, score, lives, level, paddle_hits, rng_state):
+        """
+        Args:
+            paddle_x (int): Posição X (rect.x) da raquete.
+            paddle_vel_x (int): Velocidade atual da raquete.
+            ball (tuple): (x, y, speed_x, speed_y) da bola.
+            ball_alive (bool): Se a bola ainda está em jogo.
+            alive_mask (int): Bitmask dos tijolos vivos.
+            special_mask (int): Bitmask dos tijolos especiais do nível.
+            score (int): Pontuação.
+            lives (int): Vidas restantes.
+            level (int): Nível atual.
+            paddle_hits (int): Rebatidas na raquete no episódio.
+            rng_state (dict): Estado do bit generator de Game.rng.
+        """
+        self.paddle_x = paddle_x
+        self.paddle_vel_x = paddle_vel_x
+        self.ball = ball
+        self.ball_alive = ball_alive
+        self.alive_mask = alive_mask
+        self.special_mask = special_mask
+        self.score = score
+        self.lives = lives
+        self.level = level
+        self.paddle_hits = paddle_hits
+        self.rng_state = rng_state
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
 
 class Game:
     """
     Gerencia a lógica principal do jogo Brick Breaker.
     """
 
-    def __init__(self):
+    def __init__(self, headless=False, seed=None):
         """
         Inicializa o motor do Pygame, a janela, o relógio e os elementos do jogo.
+
+        Args:
+            headless (bool, optional): Se True, roda apenas a física (sem janela,
+                                       sem renderização e sem flip). Usado no treino
+                                       e no benchmark.
+            seed (int, optional): Semente do gerador aleatório próprio do jogo
+                                  (lançamento da bola e tijolos especiais).
         """
-        pygame.init()
-        
-        if ENABLE_SOUND:
-            pygame.mixer.init()
-            self.generate_bip_sounds()
-            
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(CAPTION)
+        self.headless = headless
+        self.rng = np.random.default_rng(seed)
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
+        self.profiler = None # Ver enable_profiling()
+        self.step_frames = 0 # Ticks de física simulados no último step()
+
+        if headless:
+            # Modo somente física: nenhuma superfície de display é criada
+            self.screen = None
+            self.background = None
+            self.hud = None
+        else:
+            pygame.init()
+
+            if ENABLE_SOUND:
+                pygame.mixer.init()
+                self.generate_bip_sounds()
+
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption(CAPTION)
+            self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.background.fill(BLACK)
+            self.hud = Hud() # Fontes carregadas uma única vez
         
         self.running = True
         self.game_over = False
         self.game_won = False
         self.level_complete = False
 
-        # Grupos de Sprites
+        # Renderização por dirty rects: tijolos são uma camada estática,
+        # redesenhada por completo apenas na troca de nível
+        self.full_redraw = True
+        self.dirty_rects = [] # Áreas de tijolos removidos desde o último draw
+
+        # Grupos de Sprites (raquete e bolas rastreiam as áreas alteradas)
         self.all_sprites = pygame.sprite.Group()
         self.bricks = pygame.sprite.Group()
-        self.balls = pygame.sprite.Group()
+        # Grade de ocupação dos tijolos indexada por célula (linha, coluna)
+        self.brick_grid = np.full((BRICK_ROWS, BRICK_COLS), None, dtype=object)
+        self.balls = pygame.sprite.RenderUpdates()
+        self.paddles = pygame.sprite.RenderUpdates()
         self.paddle = Paddle()
+        # Bolas e tijolos são reaproveitados entre vidas e níveis
+        self.ball_pool = SpritePool(Ball)
+        self.brick_pool = SpritePool(Brick)
+        self.ball = None
+        self.layout = np.full((BRICK_ROWS, BRICK_COLS), None, dtype=object)
         
         self.all_sprites.add(self.paddle)
         
         self.reset_game()
 
+    def enable_profiling(self, extra_phases=()):
+        """
+        Liga a medição de tempo por fase em step().
+
+        Args:
+            extra_phases (tuple): Fases adicionais registradas por camadas
+                                  externas (ex: 'env_step' do ambiente Gymnasium).
+
+        Returns:
+            PhaseProfiler: O profiler associado ao jogo.
+        """
+        self.profiler = PhaseProfiler(GAME_PHASES + tuple(extra_phases))
+        return self.profiler
+
     def generate_bip_sounds(self):
         """
         Gera sons procedurais se o som estiver habilitado.
@@ -59,23 +165,34 @@ class Game:
         """
         pass
 
-    def reset_game(self):
+    def reset_game(self, seed=None):
         """
         Reinicia o jogo completo (Score 0, Vidas 3, Nível 1).
+
+        Args:
+            seed (int, optional): Se informada, reinicia o gerador aleatório do
+                                  jogo, tornando o episódio reproduzível.
         """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+
         self.game_over = False
         self.score = 0
         self.lives = 3
         self.level = 1
+        self.paddle_hits = 0
         
+        self.release_balls()
         self.all_sprites.empty()
         self.bricks.empty()
         self.balls.empty()
 
-        self.paddle = Paddle()
-        self.ball = Ball()
+        self.paddle.reset()
+        self.ball = self.ball_pool.acquire()
         self.all_sprites.add(self.paddle, self.ball)
         self.balls.add(self.ball)
+        self.paddles.empty()
+        self.paddles.add(self.paddle)
         
         self.create_bricks()
         self.reset_ball()
@@ -85,11 +202,10 @@ class Game:
         Reposiciona a bola na raquete com parâmetros aleatórios para evitar
         repetição de cenários (importante para o treino de RL).
         """
-        for ball in self.balls:
-            ball.kill()
+        self.release_balls()
         self.balls.empty()
 
-        self.ball = Ball()
+        self.ball = self.ball_pool.acquire()
         self.balls.add(self.ball)
 
         self.ball_launched = True
@@ -97,7 +213,7 @@ class Game:
         # Aleatoriedade na posição inicial (offset do centro da raquete)
         # Limita para não sair da largura da raquete
         max_offset = (PADDLE_WIDTH // 2) - BALL_RADIUS
-        random_offset = random.randint(-max_offset, max_offset)
+        random_offset = int(self.rng.integers(-max_offset, max_offset + 1))
         
         self.ball.rect.centerx = self.paddle.rect.centerx + random_offset
         self.ball.rect.bottom = self.paddle.rect.top
@@ -106,82 +222,334 @@ class Game:
         speed_multiplier = 1 + (self.level - 1) * BALL_SPEED_INCREASE
         
         # Direção aleatória (Esquerda ou Direita)
-        direction_x = random.choice([-1, 1])
+        direction_x = int(self.rng.choice([-1, 1]))
         
         # Magnitude da velocidade horizontal aleatória
-        random_speed_x = random.uniform(BALL_RANDOM_SPEED_MIN, BALL_RANDOM_SPEED_MAX)
+        random_speed_x = float(self.rng.uniform(BALL_RANDOM_SPEED_MIN, BALL_RANDOM_SPEED_MAX))
         
         self.ball.speed_x = random_speed_x * speed_multiplier * direction_x
         
         # Garante que a bola suba
         self.ball.speed_y = BALL_SPEED_Y_INITIAL * speed_multiplier
 
+    def release_balls(self):
+        """
+        Devolve ao pool a bola principal e as demais bolas em jogo.
+        """
+        for ball in self.balls.sprites():
+            if ball is not self.ball:
+                self.ball_pool.release(ball)
+        if self.ball is not None:
+            self.ball_pool.release(self.ball)
+            self.ball = None
+
     def create_bricks(self):
         """
         Gera a matriz de tijolos para o nível atual.
         """
+        special_mask = 0
+        for k in range(BRICK_ROWS * BRICK_COLS):
+            # Chance de tijolo especial a partir do nível 2
+            if self.level >= 2 and self.rng.random() < SPECIAL_BRICK_CHANCE:
+                special_mask |= 1 << k
+
+        self.build_bricks(special_mask)
+
+    def build_bricks(self, special_mask):
+        """
+        Constrói os tijolos do nível com um layout de especiais já sorteado.
+
+        Args:
+            special_mask (int): Bitmask (bit linha * BRICK_COLS + coluna) dos
+                                tijolos especiais.
+        """
         self.bricks.empty()
-        # Remove tijolos antigos do grupo geral, mas mantém paddle e ball
-        for sprite in self.all_sprites:
-            if isinstance(sprite, Brick):
-                sprite.kill()
+        self.brick_grid.fill(None)
+        self.full_redraw = True
+        self.dirty_rects.clear()
+        # Devolve ao pool todos os tijolos do nível anterior (vivos ou quebrados);
+        # release os remove do grupo geral, mantendo paddle e ball
+        for brick in self.layout.flat:
+            if brick is not None:
+                self.brick_pool.release(brick)
 
         colors = BRICK_COLORS
-        rows = 5
-        cols = 10
+        rows = BRICK_ROWS
+        cols = BRICK_COLS
         
         for i in range(rows):
             for j in range(cols):
-                is_special = False
-                # Chance de tijolo especial a partir do nível 2
-                if self.level >= 2 and random.random() < SPECIAL_BRICK_CHANCE:
-                    is_special = True
+                is_special = bool(special_mask >> (i * cols + j) & 1)
                 
                 x = j * (BRICK_WIDTH + BRICK_GAP) + BRICK_OFFSET_LEFT
                 y = i * (BRICK_HEIGHT + BRICK_GAP) + BRICK_OFFSET_TOP
                 color = colors[i % len(colors)]
                 
-                brick = Brick(x, y, color, is_special=is_special)
+                brick = self.brick_pool.acquire(x, y, color, is_special=is_special)
                 self.all_sprites.add(brick)
                 self.bricks.add(brick)
+                self.brick_grid[i, j] = brick
+
+        # Layout completo do nível, reaproveitado por restore()
+        self.special_mask = special_mask
+        self.layout = self.brick_grid.copy()
+
+    def brick_cells(self, rect):
+        """
+        Converte um retângulo nas células da grade de tijolos que ele pode tocar.
+
+        Cada célula cobre um tijolo mais o espaçamento (BRICK_GAP) à direita e
+        abaixo, então qualquer tijolo que intersecta o retângulo está em uma
+        das células retornadas.
+
+        Returns:
+            tuple: (range de linhas, range de colunas) já limitados à grade.
+        """
+        pitch_x = BRICK_WIDTH + BRICK_GAP
+        pitch_y = BRICK_HEIGHT + BRICK_GAP
+        rows, cols = self.brick_grid.shape
+
+        col_first = max(0, (rect.left - BRICK_OFFSET_LEFT) // pitch_x)
+        col_last = min(cols - 1, (rect.right - 1 - BRICK_OFFSET_LEFT) // pitch_x)
+        row_first = max(0, (rect.top - BRICK_OFFSET_TOP) // pitch_y)
+        row_last = min(rows - 1, (rect.bottom - 1 - BRICK_OFFSET_TOP) // pitch_y)
+
+        return range(row_first, row_last + 1), range(col_first, col_last + 1)
+
+    def collide_bricks(self, ball):
+        """
+        Remove os tijolos atingidos pela bola testando apenas as células da
+        grade sob sua bounding box (custo constante, independente do tamanho
+        do tabuleiro).
+
+        Returns:
+            list: Tijolos atingidos neste frame.
+        """
+        hits = []
+        rows, cols = self.brick_cells(ball.rect)
+        for i in rows:
+            for j in cols:
+                brick = self.brick_grid[i, j]
+                if brick is not None and ball.rect.colliderect(brick.rect):
+                    self.remove_brick((i, j))
+                    hits.append(brick)
+        return hits
+
+    def remove_brick(self, cell):
+        """
+        Remove o tijolo de uma célula da grade e marca sua área para redesenho.
+        """
+        brick = self.brick_grid[cell]
+        self.brick_grid[cell] = None
+        brick.kill()
+        if not self.headless:
+            self.dirty_rects.append(brick.rect)
+
+    def snapshot(self):
+        """
+        Captura o estado completo do jogo em um registro compacto e serializável.
+
+        Returns:
+            GameSnapshot: Estado da raquete, bola, tijolos, placar e RNG.
+        """
+        alive_mask = 0
+        for k, brick in enumerate(self.brick_grid.flat):
+            if brick is not None:
+                alive_mask |= 1 << k
+
+        ball = self.ball
+        return GameSnapshot(
+            self.paddle.rect.x,
+            self.paddle.current_vel_x,
+            (ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y),
+            ball.alive(),
+            alive_mask,
+            self.special_mask,
+            self.score,
+            self.lives,
+            self.level,
+            self.paddle_hits,
+            self.rng.bit_generator.state,
+        )
+
+    def restore(self, snapshot):
+        """
+        Restaura um estado capturado por snapshot().
+
+        Reaproveita os sprites existentes; os tijolos só são reconstruídos se o
+        layout de especiais do snapshot for diferente do nível atual.
+
+        Args:
+            snapshot (GameSnapshot): Estado a restaurar.
+        """
+        self.paddle.rect.x = snapshot.paddle_x
+        self.paddle.current_vel_x = snapshot.paddle_vel_x
+
+        # Bola principal (única bola em jogo)
+        for ball in self.balls:
+            if ball is not self.ball:
+                ball.kill()
+        ball = self.ball
+        ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y = snapshot.ball
+        if snapshot.ball_alive:
+            self.balls.add(ball)
+        else:
+            ball.kill()
+
+        # Tijolos
+        if snapshot.special_mask != self.special_mask:
+            self.build_bricks(snapshot.special_mask)
+        cols = self.layout.shape[1]
+        for k, brick in enumerate(self.layout.flat):
+            cell = divmod(k, cols)
+            if snapshot.alive_mask >> k & 1:
+                self.brick_grid[cell] = brick
+                self.bricks.add(brick)
+                self.all_sprites.add(brick)
+            else:
+                self.brick_grid[cell] = None
+                brick.kill()
 
-    def run(self):
+        self.score = snapshot.score
+        self.lives = snapshot.lives
+        self.level = snapshot.level
+        self.paddle_hits = snapshot.paddle_hits
+        self.rng.bit_generator.state = snapshot.rng_state
+
+        self.full_redraw = True
+        self.dirty_rects.clear()
+
+    def run(self, dataset=None):
         """
         Loop principal para execução humana (main.py).
+
+        Args:
+            dataset (DatasetWriter, optional): Se informado, grava cada frame como
+                                               transição (obs, ação, recompensa, terminated),
+                                               com a mesma recompensa de step().
         """
         self.reset_game()
         while self.running:
             self.clock.tick(FPS_HUMAN)
             self.events()
-            self.update()
+            if dataset is None:
+                self.update()
+            else:
+                obs = self.get_state()
+                prev_score = self.score
+                prev_lives = self.lives
+                self.current_hit_paddle = False
+                self.update()
+                reward = self.compute_reward(prev_score, prev_lives)
+                dataset.add(obs, self.human_action(), reward, self.lives == 0)
+            if self.lives == 0:
+                self.reset_game()
             self.draw()
+        if dataset is not None:
+            dataset.close()
         pygame.quit()
 
-    def step(self, action=None, fps=0):
+    def human_action(self):
+        """
+        Ação equivalente ao movimento do teclado no último update
+        (0=Ficar, 1=Esquerda, 2=Direita).
         """
-        Executa um único passo (frame) da simulação para o Agente de RL.
+        if self.paddle.current_vel_x < 0:
+            return 1
+        if self.paddle.current_vel_x > 0:
+            return 2
+        return 0
+
+    def step(self, action=None, fps=0, frame_skip=1, out=None):
+        """
+        Executa um passo da simulação para o Agente de RL.
+
+        Com frame_skip > 1 a ação é repetida por vários ticks de física dentro
+        da mesma chamada, acumulando a recompensa. A repetição é interrompida
+        ao perder uma vida ou ao fim do episódio. Observação e renderização são
+        construídas apenas uma vez, ao final.
 
         Args:
             action (int, optional): Ação escolhida pelo agente.
             fps (int, optional): Limite de quadros. 0 para treino (máx speed), 
                                  60 para demo (tempo real).
+            frame_skip (int, optional): Número de ticks de física por chamada (>= 1).
+                                        Os ticks de fato simulados ficam em
+                                        self.step_frames.
+            out (np.ndarray, optional): Vetor float32 (10,) onde escrever o estado
+                                        (ver get_state).
 
         Returns:
             tuple: (estado, recompensa, done)
         """
-        self.clock.tick(fps)
-        self.events() # Processa a fila de eventos (ex: botão fechar)
-        
-        # Salva estado anterior para calcular delta de pontuação/vidas
-        prev_score = self.score
-        prev_lives = self.lives
-        
-        self.current_hit_paddle = False # Flag resetada a cada frame
-        
-        self.update(action)
-        self.draw() # Desenha (necessário para o humano ver o que acontece na demo/treino)
-        
-        # Cálculo da Recompensa (Reward Function)
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip deve ser >= 1, recebido {frame_skip}")
+
+        # Profiling desligado custa apenas os testes de None abaixo
+        prof = self.profiler
+        clock = time.perf_counter_ns
+
+        if not self.headless:
+            if prof is not None:
+                start = clock()
+            self.events() # Processa a fila de eventos (ex: botão fechar)
+            if prof is not None:
+                prof.record(PHASE_EVENTS, clock() - start)
+
+        reward = 0
+        self.step_frames = 0
+        for _ in range(frame_skip):
+            self.step_frames += 1
+            if not self.headless:
+                self.clock.tick(fps)
+
+            # Salva estado anterior para calcular delta de pontuação/vidas
+            prev_score = self.score
+            prev_lives = self.lives
+            
+            self.current_hit_paddle = False # Flag resetada a cada frame
+            
+            if prof is not None:
+                start = clock()
+            self.update(action)
+            if prof is not None:
+                mid = clock()
+                prof.record(PHASE_UPDATE, mid - start)
+            reward += self.compute_reward(prev_score, prev_lives)
+            if prof is not None:
+                prof.record(PHASE_REWARD, clock() - mid)
+
+            # Verifica condição de término
+            done = self.lives == 0 or not self.running
+            if done or self.lives < prev_lives:
+                break
+
+        if not self.headless:
+            if prof is not None:
+                start = clock()
+            self.draw() # Desenha (necessário para o humano ver o que acontece na demo)
+            if prof is not None:
+                prof.record(PHASE_DRAW, clock() - start)
+
+        if prof is not None:
+            start = clock()
+        state = self.get_state(out)
+        if prof is not None:
+            prof.record(PHASE_GET_STATE, clock() - start)
+
+        return state, reward, done
+
+    def compute_reward(self, prev_score, prev_lives):
+        """
+        Calcula a recompensa de um tick de física (Reward Function).
+
+        Args:
+            prev_score (int): Pontuação antes do tick.
+            prev_lives (int): Vidas antes do tick.
+
+        Returns:
+            float: Recompensa do tick.
+        """
         reward = 0
         
         # 1. Reward Shaping: Incentivar seguir a bola
@@ -207,45 +575,53 @@ class Game:
         if self.lives < prev_lives:
             reward += REWARD_LOSE_LIFE # Valor negativo no config
 
-        # Verifica condição de término
-        done = self.lives == 0 or not self.running
-        
-        return self.get_state(), reward, done
+        return reward
 
-    def get_state(self):
+    def get_state(self, out=None):
         """
         Constrói o vetor de observação do ambiente.
+
+        Args:
+            out (np.ndarray, optional): Vetor float32 (10,) onde escrever as features,
+                                        ex: uma linha de um buffer (n_envs, 10)
+                                        preexistente. Sem ele, um array novo é criado.
         
         Returns:
             np.array: [Paddle X, Ball X, Ball Y, Ball Vel X, Ball Vel Y, Rel X, Paddle Vel X, 
-                      Future Ball X, Distance to Ball, Is Approaching] normalizados.
+                      Future Ball X, Distance to Ball, Is Approaching] normalizados
+                      (o próprio out, se fornecido).
         """
+        ball = self.ball
+        paddle_cx = self.paddle.rect.centerx
+        ball_cx = ball.rect.centerx
+        ball_cy = ball.rect.centery
+        speed_x = ball.speed_x
+        speed_y = ball.speed_y
+
         # Normalização simples (0 a 1 ou -1 a 1)
-        p_x = self.paddle.rect.centerx / SCREEN_WIDTH
-        b_x = self.ball.rect.centerx / SCREEN_WIDTH
-        b_y = self.ball.rect.centery / SCREEN_HEIGHT
+        p_x = paddle_cx / SCREEN_WIDTH
+        b_x = ball_cx / SCREEN_WIDTH
+        b_y = ball_cy / SCREEN_HEIGHT
         
         # Velocidades normalizadas por um máximo estimado
         max_speed = 20.0
-        b_vx = self.ball.speed_x / max_speed
-        b_vy = self.ball.speed_y / max_speed
+        b_vx = speed_x / max_speed
+        b_vy = speed_y / max_speed
         
         # Feature 1: Distância relativa X (CORRIGIDO: ball - paddle para eliminar viés)
         # Positivo = bola à direita, Negativo = bola à esquerda
-        rel_x = (self.ball.rect.centerx - self.paddle.rect.centerx) / SCREEN_WIDTH
+        rel_x = (ball_cx - paddle_cx) / SCREEN_WIDTH
         
         # Feature 2: Velocidade da Raquete (fundamental para efeito de momento)
-        p_vx = 0.0
-        if hasattr(self.paddle, 'current_vel_x'):
-             p_vx = self.paddle.current_vel_x / PADDLE_SPEED
+        p_vx = self.paddle.current_vel_x / PADDLE_SPEED
         
         # Feature 3: NOVA - Posição X futura estimada da bola (onde vai bater no Y do paddle)
         # Predição crítica para interceptação eficiente
-        if abs(self.ball.speed_y) > 0.1:
+        if abs(speed_y) > 0.1:
             # Tempo até a bola chegar na altura do paddle
-            t_to_paddle = (self.paddle.rect.top - self.ball.rect.centery) / self.ball.speed_y
+            t_to_paddle = (self.paddle.rect.top - ball_cy) / speed_y
             # Posição X estimada (com bounds para não extrapolar muito)
-            future_ball_x_raw = self.ball.rect.centerx + self.ball.speed_x * t_to_paddle
+            future_ball_x_raw = ball_cx + speed_x * t_to_paddle
             # Clamp para largura da tela (bola vai ricochetear, mas primeira aproximação)
             future_ball_x_raw = max(0, min(SCREEN_WIDTH, future_ball_x_raw))
             future_ball_x = future_ball_x_raw / SCREEN_WIDTH
@@ -254,12 +630,46 @@ class Game:
             future_ball_x = b_x
         
         # Feature 4: NOVA - Distância absoluta até a bola (magnitude)
-        distance_to_ball = abs(self.paddle.rect.centerx - self.ball.rect.centerx) / SCREEN_WIDTH
+        distance_to_ball = abs(paddle_cx - ball_cx) / SCREEN_WIDTH
         
         # Feature 5: NOVA - Indicador se bola está se aproximando (descendo)
-        is_approaching = 1.0 if self.ball.speed_y > 0 else 0.0
+        is_approaching = 1.0 if speed_y > 0 else 0.0
         
-        return np.array([p_x, b_x, b_y, b_vx, b_vy, rel_x, p_vx, future_ball_x, distance_to_ball, is_approaching], dtype=np.float32)
+        features = (p_x, b_x, b_y, b_vx, b_vy, rel_x, p_vx, future_ball_x, distance_to_ball, is_approaching)
+        if out is None:
+            return np.array(features, dtype=np.float32)
+        # Atribuição em fatia: converte direto para float32 no buffer, sem array novo
+        out[:] = features
+        return out
+
+    def render_pixels(self, out):
+        """
+        Rasteriza o estado atual em tons de cinza, reduzido, diretamente em um
+        buffer preexistente (sem criar superfícies nem arrays).
+
+        Args:
+            out (np.ndarray): Buffer (altura, largura) uint8 a ser sobrescrito.
+        """
+        out.fill(0)
+        for brick in self.bricks:
+            self.fill_pixels(out, brick.rect, to_gray(brick.color))
+        self.fill_pixels(out, self.paddle.rect, to_gray(PADDLE_COLOR))
+        for ball in self.balls:
+            self.fill_pixels(out, ball.rect, to_gray(BALL_COLOR))
+
+    @staticmethod
+    def fill_pixels(out, rect, value):
+        """
+        Preenche no buffer reduzido a região correspondente a um Rect da tela.
+        Todo objeto visível ocupa ao menos um pixel.
+        """
+        height, width = out.shape
+        x0 = max(0, rect.left * width // SCREEN_WIDTH)
+        x1 = min(width, -(-rect.right * width // SCREEN_WIDTH))
+        y0 = max(0, rect.top * height // SCREEN_HEIGHT)
+        y1 = min(height, -(-rect.bottom * height // SCREEN_HEIGHT))
+        if x0 < x1 and y0 < y1:
+            out[y0:y1, x0:x1] = value
 
     def events(self):
         """
@@ -282,12 +692,17 @@ class Game:
         self.paddle.update(action)
 
         for ball in self.balls:
-            ball.update()
-            self.check_collisions(ball)
+            if SWEPT_COLLISIONS:
+                self.sweep_ball(ball)
+            else:
+                ball.update()
+                self.check_collisions(ball)
+            self.check_level_and_floor(ball)
 
     def check_collisions(self, ball):
         """
-        Gerencia física de colisão da bola com paredes, raquete e tijolos.
+        Gerencia física de colisão da bola com paredes, raquete e tijolos
+        (teste discreto na posição final do frame).
         """
         # Paredes Laterais
         if ball.rect.left <= 0 or ball.rect.right >= SCREEN_WIDTH:
@@ -301,51 +716,181 @@ class Game:
 
         # Raquete
         if pygame.sprite.collide_rect(ball, self.paddle):
-            # 1. Deflexão baseada no ponto de impacto (Angle Deflection)
-            # Calcula onde a bola bateu na raquete (-1 esquerda, 0 centro, 1 direita)
-            relative_intersect_x = (self.paddle.rect.centerx - ball.rect.centerx)
-            normalized_relative_intersection_x = relative_intersect_x / (PADDLE_WIDTH / 2)
-            
-            # Inverte direção Y (rebate)
-            ball.speed_y *= -1
-            
-            # Muda a direção X baseada no ponto de impacto (efeito de "curva")
-            # Quanto mais na ponta, mais horizontal a bola sai.
-            # MAX_BOUNCE_ANGLE poderia ser aprox 75 graus (em radianos) ou fator linear
-            bounce_factor = 5.0 # Fator de força lateral
-            ball.speed_x = -normalized_relative_intersection_x * bounce_factor
-            
-            # 2. Transferência de Momento (Paddle Momentum)
-            # Se a raquete estiver se movendo, adiciona velocidade à bola
-            if hasattr(self.paddle, 'current_vel_x'):
-                ball.speed_x += self.paddle.current_vel_x * 0.3 # 30% da velocidade da raquete
-                
-            # 3. Aceleração Dinâmica (Speed Variation)
-            # Aumenta levemente a velocidade total a cada batida para tensão
-            current_speed = np.sqrt(ball.speed_x**2 + ball.speed_y**2)
-            new_speed = min(current_speed * 1.05, 12.0) # Aumenta 5%, max 12.0
-            
-            # Normaliza vetor e aplica nova velocidade
-            speed_ratio = new_speed / current_speed
-            ball.speed_x *= speed_ratio
-            ball.speed_y *= speed_ratio
-            
-            # Garante componente Y mínima para a bola não ficar horizontal demais
-            min_speed_y = 3.0
-            if abs(ball.speed_y) < min_speed_y:
-                 # Dá um "kick" vertical mantendo o sinal
-                ball.speed_y = -min_speed_y if ball.speed_y < 0 else min_speed_y
+            self.bounce_off_paddle(ball, ball.rect.centerx)
 
             # Ajusta a bola para cima da raquete para evitar "grudar"
             ball.rect.bottom = self.paddle.rect.top
-            self.current_hit_paddle = True 
 
         # Tijolos
-        hits = pygame.sprite.spritecollide(ball, self.bricks, True)
+        hits = self.collide_bricks(ball)
         if hits:
             self.score += 10 # Pontuação fixa por tijolo (pode ir para config se desejar)
             ball.speed_y *= -1
+
+    def bounce_off_paddle(self, ball, ball_centerx):
+        """
+        Aplica a resposta de rebatida na raquete (deflexão, momento e aceleração).
+
+        Args:
+            ball (Ball): Bola que atingiu a raquete.
+            ball_centerx (float): Centro X da bola no instante do impacto.
+        """
+        # 1. Deflexão baseada no ponto de impacto (Angle Deflection)
+        # Calcula onde a bola bateu na raquete (-1 esquerda, 0 centro, 1 direita)
+        relative_intersect_x = (self.paddle.rect.centerx - ball_centerx)
+        normalized_relative_intersection_x = relative_intersect_x / (PADDLE_WIDTH / 2)
+        
+        # Inverte direção Y (rebate)
+        ball.speed_y *= -1
+        
+        # Muda a direção X baseada no ponto de impacto (efeito de "curva")
+        # Quanto mais na ponta, mais horizontal a bola sai.
+        # MAX_BOUNCE_ANGLE poderia ser aprox 75 graus (em radianos) ou fator linear
+        bounce_factor = 5.0 # Fator de força lateral
+        ball.speed_x = -normalized_relative_intersection_x * bounce_factor
+        
+        # 2. Transferência de Momento (Paddle Momentum)
+        # Se a raquete estiver se movendo, adiciona velocidade à bola
+        ball.speed_x += self.paddle.current_vel_x * 0.3 # 30% da velocidade da raquete
             
+        # 3. Aceleração Dinâmica (Speed Variation)
+        # Aumenta levemente a velocidade total a cada batida para tensão
+        current_speed = np.sqrt(ball.speed_x**2 + ball.speed_y**2)
+        new_speed = min(current_speed * 1.05, 12.0) # Aumenta 5%, max 12.0
+        
+        # Normaliza vetor e aplica nova velocidade
+        speed_ratio = new_speed / current_speed
+        ball.speed_x *= speed_ratio
+        ball.speed_y *= speed_ratio
+        
+        # Garante componente Y mínima para a bola não ficar horizontal demais
+        min_speed_y = 3.0
+        if abs(ball.speed_y) < min_speed_y:
+             # Dá um "kick" vertical mantendo o sinal
+            ball.speed_y = -min_speed_y if ball.speed_y < 0 else min_speed_y
+
+        self.current_hit_paddle = True 
+        self.paddle_hits += 1
+
+    def sweep_ball(self, ball):
+        """
+        Move a bola por um frame com colisão contínua (swept).
+
+        Calcula o instante exato de impacto contra paredes, teto, raquete e
+        arestas dos tijolos ao longo do segmento percorrido, resolve o primeiro
+        contato e continua com o tempo restante, permitindo várias rebatidas
+        por frame sem que a bola atravesse objetos em velocidades altas.
+        """
+        x, y = float(ball.rect.x), float(ball.rect.y)
+        size = ball.rect.width
+        remaining = 1.0
+
+        for _ in range(SWEPT_MAX_BOUNCES):
+            vx, vy = ball.speed_x, ball.speed_y
+            end_x, end_y = x + vx * remaining, y + vy * remaining
+
+            # (tempo, tipo, eixo da normal, tijolo)
+            best = (remaining, None, None, None)
+
+            # Paredes Laterais e Teto: só contam se a bola se move em direção a elas
+            if vx < 0 and end_x <= 0:
+                best = min(best, (max(0.0, -x / vx), 'wall', 'x', None), key=lambda c: c[0])
+            elif vx > 0 and end_x + size >= SCREEN_WIDTH:
+                best = min(best, (max(0.0, (SCREEN_WIDTH - size - x) / vx), 'wall', 'x', None), key=lambda c: c[0])
+            if vy < 0 and end_y <= 0:
+                best = min(best, (max(0.0, -y / vy), 'wall', 'y', None), key=lambda c: c[0])
+
+            # Raquete: só rebate bolas descendo
+            if vy > 0:
+                t, axis = self.sweep_rect(x, y, size, vx, vy, self.paddle.rect)
+                if t is not None and t <= best[0]:
+                    best = (t, 'paddle', axis, None)
+
+            # Tijolos: apenas as células da grade cobertas pelo segmento
+            swept = pygame.Rect(int(min(x, end_x)) - 1, int(min(y, end_y)) - 1,
+                                int(abs(end_x - x)) + size + 3, int(abs(end_y - y)) + size + 3)
+            rows, cols = self.brick_cells(swept)
+            for i in rows:
+                for j in cols:
+                    brick = self.brick_grid[i, j]
+                    if brick is None:
+                        continue
+                    t, axis = self.sweep_rect(x, y, size, vx, vy, brick.rect)
+                    if t is not None and t < best[0]:
+                        best = (t, 'brick', axis, (i, j))
+
+            t, kind, axis, cell = best
+            x, y = x + vx * t, y + vy * t
+            remaining -= t
+
+            if kind is None:
+                break
+            if kind == 'wall':
+                if axis == 'x':
+                    ball.speed_x *= -1
+                else:
+                    ball.speed_y *= -1
+            elif kind == 'paddle':
+                self.bounce_off_paddle(ball, x + size / 2)
+            elif kind == 'brick':
+                self.remove_brick(cell)
+                self.score += 10
+                if axis == 'x':
+                    ball.speed_x *= -1
+                else:
+                    ball.speed_y *= -1
+
+            if remaining <= 0:
+                break
+
+        ball.rect.x = x
+        ball.rect.y = y
+
+    @staticmethod
+    def sweep_rect(x, y, size, vx, vy, rect):
+        """
+        Instante de impacto de uma caixa (size x size) em movimento contra um Rect.
+
+        Usa o método de slabs sobre o Rect expandido pelo tamanho da bola.
+        Sobreposição já existente conta como impacto imediato se a bola
+        estiver avançando para dentro do Rect.
+
+        Returns:
+            tuple: (tempo do impacto em frações do frame ou None, eixo 'x'/'y')
+        """
+        left, right = rect.left - size, rect.right
+        top, bottom = rect.top - size, rect.bottom
+
+        if vx > 0:
+            tx_enter, tx_exit = (left - x) / vx, (right - x) / vx
+        elif vx < 0:
+            tx_enter, tx_exit = (right - x) / vx, (left - x) / vx
+        elif left < x < right:
+            tx_enter, tx_exit = -np.inf, np.inf
+        else:
+            return None, None
+
+        if vy > 0:
+            ty_enter, ty_exit = (top - y) / vy, (bottom - y) / vy
+        elif vy < 0:
+            ty_enter, ty_exit = (bottom - y) / vy, (top - y) / vy
+        elif top < y < bottom:
+            ty_enter, ty_exit = -np.inf, np.inf
+        else:
+            return None, None
+
+        t_enter = max(tx_enter, ty_enter)
+        t_exit = min(tx_exit, ty_exit)
+        if t_enter >= t_exit or t_exit <= 0:
+            return None, None
+
+        axis = 'x' if tx_enter > ty_enter else 'y'
+        return max(0.0, t_enter), axis
+
+    def check_level_and_floor(self, ball):
+        """
+        Verifica conclusão de nível e perda de vida após o movimento da bola.
+        """
         # Nível Concluído
         if not self.bricks:
             self.level += 1
@@ -359,41 +904,50 @@ class Game:
             if self.lives > 0:
                 self.reset_ball()
             else:
+                # Fim de episódio: o reinício fica a cargo de quem controla o loop
+                # (run() para humanos, reset() do ambiente para o agente)
                 self.lives = 0
-                self.reset_game()
 
     def draw(self):
         """
         Renderiza o estado atual na tela.
+
+        Após um redesenho completo (início ou troca de nível), apenas as áreas
+        alteradas (raquete, bolas, tijolos removidos e textos do HUD) são
+        apagadas, redesenhadas e enviadas ao display com display.update(rects).
         """
-        self.screen.fill(BLACK)
-        self.all_sprites.draw(self.screen)
-        self.balls.draw(self.screen)
-        
-        # HUD (Head-Up Display)
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
-        level_text = self.font.render(f"Level: {self.level}", True, WHITE)
-        
-        self.screen.blit(score_text, (10, 10))
-        self.screen.blit(lives_text, (SCREEN_WIDTH - 120, 10))
-        self.screen.blit(level_text, (SCREEN_WIDTH // 2 - 50, 10))
+        if self.full_redraw or self.game_over:
+            self.screen.blit(self.background, (0, 0))
+            self.bricks.draw(self.screen)
+            self.hud.draw(self.screen, self.background, self.score, self.lives, self.level)
+            self.paddles.draw(self.screen)
+            self.balls.draw(self.screen)
+
+            if self.game_over:
+                self.draw_game_over()
+
+            pygame.display.flip()
+            self.full_redraw = self.game_over
+            self.dirty_rects.clear()
+            return
 
-        if self.game_over:
-            self.draw_game_over()
+        # Apaga tijolos removidos e as posições anteriores dos sprites móveis
+        dirty = self.dirty_rects
+        for rect in dirty:
+            self.screen.blit(self.background, rect, rect)
+        self.paddles.clear(self.screen, self.background)
+        self.balls.clear(self.screen, self.background)
 
-        pygame.display.flip()
+        # HUD (Head-Up Display): textos só são re-rasterizados quando mudam
+        dirty += self.hud.draw(self.screen, self.background, self.score, self.lives, self.level)
+        dirty += self.paddles.draw(self.screen)
+        dirty += self.balls.draw(self.screen)
+
+        pygame.display.update(dirty)
+        self.dirty_rects = []
 
     def draw_game_over(self):
         """
         Desenha a tela de fim de jogo.
         """
-        game_over_font = pygame.font.Font(None, 72)
-        
-        text_surface = game_over_font.render("GAME OVER", True, RED)
-        score_surface = self.font.render(f"Final Score: {self.score}", True, WHITE)
-        
-        cx, cy = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-        
-        self.screen.blit(text_surface, (cx - text_surface.get_width() // 2, cy - 50))
-        self.screen.blit(score_surface, (cx - score_surface.get_width() // 2, cy + 50))
+        self.hud.draw_game_over(self.screen, self.score)
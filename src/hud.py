@@ -0,0 +1,112 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/hud.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Camada de HUD (Head-Up Display) com cache de texto. Cada rótulo só é
+    rasterizado pelo pygame.font quando o valor exibido muda; nos demais
+    frames a superfície em cache é apenas composta na tela.
+-----------------------------------------------------------------------
+"""
+
+import pygame
+from src.config import *
+
+class CachedText:
+    """
+    Texto formatado cuja superfície é renderizada apenas quando o valor muda.
+    """
+
+    def __init__(self, font, template, color, background=BLACK):
+        """
+        Inicializa o texto sem superfície (renderizada no primeiro uso).
+
+        Args:
+            font (pygame.font.Font): Fonte já carregada (compartilhada).
+            template (str): Formato do texto, ex: "Score: {}".
+            color (tuple): Cor RGB do texto.
+            background (tuple, optional): Cor de fundo. O texto é renderizado
+                                          opaco, então pode ser reblitado a cada
+                                          frame sem acumular o antialiasing.
+        """
+        self.font = font
+        self.template = template
+        self.color = color
+        self.background = background
+        self.value = None
+        self.surface = None
+        self.rect = None
+
+    def render(self, value=None):
+        """
+        Retorna a superfície do texto, renderizando-a só se o valor mudou.
+        """
+        if self.surface is None or value != self.value:
+            self.value = value
+            self.surface = self.font.render(self.template.format(value), True, self.color, self.background)
+        return self.surface
+
+    def draw(self, screen, background, value, position):
+        """
+        Desenha o texto na tela.
+
+        Quando o valor muda, a área do texto anterior é apagada com o fundo.
+
+        Returns:
+            list: Áreas alteradas da tela (vazia se o valor não mudou).
+        """
+        dirty = []
+        if self.surface is None or value != self.value:
+            if self.rect is not None:
+                screen.blit(background, self.rect, self.rect)
+                dirty.append(self.rect)
+            self.rect = self.render(value).get_rect(topleft=position)
+            dirty.append(self.rect)
+        screen.blit(self.surface, position)
+        return dirty
+
+class Hud:
+    """
+    HUD do jogo: Score, Lives, Level e a tela de Game Over.
+
+    As fontes são carregadas uma única vez na criação.
+    """
+
+    def __init__(self):
+        """
+        Carrega as fontes e cria os textos em cache.
+        """
+        self.font = pygame.font.Font(None, 36)
+        self.game_over_font = pygame.font.Font(None, 72)
+
+        self.score_text = CachedText(self.font, "Score: {}", WHITE)
+        self.lives_text = CachedText(self.font, "Lives: {}", WHITE)
+        self.level_text = CachedText(self.font, "Level: {}", WHITE)
+        self.game_over_text = CachedText(self.game_over_font, "GAME OVER", RED)
+        self.final_score_text = CachedText(self.font, "Final Score: {}", WHITE)
+
+    def draw(self, screen, background, score, lives, level):
+        """
+        Compõe os textos do HUD na tela.
+
+        Returns:
+            list: Áreas alteradas (apenas dos textos cujo valor mudou).
+        """
+        dirty = self.score_text.draw(screen, background, score, (10, 10))
+        dirty += self.lives_text.draw(screen, background, lives, (SCREEN_WIDTH - 120, 10))
+        dirty += self.level_text.draw(screen, background, level, (SCREEN_WIDTH // 2 - 50, 10))
+        return dirty
+
+    def draw_game_over(self, screen, score):
+        """
+        Desenha a tela de fim de jogo.
+        """
+        text_surface = self.game_over_text.render()
+        score_surface = self.final_score_text.render(score)
+
+        cx, cy = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+
+        screen.blit(text_surface, (cx - text_surface.get_width() // 2, cy - 50))
+        screen.blit(score_surface, (cx - score_surface.get_width() // 2, cy + 50))
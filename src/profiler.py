@@ -0,0 +1,119 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/profiler.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Instrumentação leve por fase (events, update, draw, get_state, ...).
+    Cada fase acumula durações medidas com relógio monotônico em um
+    histograma de tamanho fixo (escala logarítmica), sem crescer a cada
+    passo. Desligado, o custo é apenas um teste de None nos chamadores.
+-----------------------------------------------------------------------
+"""
+
+import math
+import numpy as np
+
+# Sub-divisões por oitava (potência de 2) do histograma: erro máximo de ~19%
+BUCKETS_PER_OCTAVE = 4
+NUM_BUCKETS = 40 * BUCKETS_PER_OCTAVE # Cobre de 1 ns a ~18 minutos
+
+class PhaseProfiler:
+    """
+    Histogramas de latência por fase, pré-alocados.
+    """
+
+    def __init__(self, phases):
+        """
+        Args:
+            phases (tuple): Nomes das fases, na ordem usada pelos índices de record().
+        """
+        self.phases = tuple(phases)
+        self.index = {name: i for i, name in enumerate(self.phases)}
+        self.histogram = np.zeros((len(self.phases), NUM_BUCKETS), dtype=np.int64)
+        self.total_ns = np.zeros(len(self.phases), dtype=np.int64)
+
+    def record(self, phase, elapsed_ns):
+        """
+        Registra a duração de uma ocorrência da fase.
+
+        Args:
+            phase (int): Índice da fase (ver self.index).
+            elapsed_ns (int): Duração em nanossegundos (time.perf_counter_ns).
+        """
+        bucket = int(math.log2(elapsed_ns) * BUCKETS_PER_OCTAVE) if elapsed_ns > 1 else 0
+        self.histogram[phase, min(bucket, NUM_BUCKETS - 1)] += 1
+        self.total_ns[phase] += elapsed_ns
+
+    def reset(self):
+        """
+        Zera os acumuladores (mantém a alocação).
+        """
+        self.histogram.fill(0)
+        self.total_ns.fill(0)
+
+    def export(self, reset=True):
+        """
+        Exporta os acumuladores brutos (serializáveis) para agregação.
+
+        Args:
+            reset (bool): Se True, zera os acumuladores após exportar.
+
+        Returns:
+            dict: {'phases', 'histogram', 'total_ns'}.
+        """
+        data = {
+            'phases': self.phases,
+            'histogram': self.histogram.copy(),
+            'total_ns': self.total_ns.copy(),
+        }
+        if reset:
+            self.reset()
+        return data
+
+    def merge(self, data):
+        """
+        Soma acumuladores exportados por outro profiler (ex: de um worker).
+        Fases desconhecidas são adicionadas ao final.
+        """
+        for i, name in enumerate(data['phases']):
+            if name not in self.index:
+                self.index[name] = len(self.phases)
+                self.phases += (name,)
+                self.histogram = np.vstack([self.histogram, np.zeros((1, NUM_BUCKETS), dtype=np.int64)])
+                self.total_ns = np.append(self.total_ns, 0)
+            j = self.index[name]
+            self.histogram[j] += data['histogram'][i]
+            self.total_ns[j] += data['total_ns'][i]
+
+    def summary(self):
+        """
+        Resume cada fase com ocorrências registradas.
+
+        Returns:
+            dict: {fase: {'count', 'total_ms', 'mean_us', 'p50_us', 'p99_us'}}.
+                  Percentis são o limite superior do bucket correspondente.
+        """
+        result = {}
+        for i, name in enumerate(self.phases):
+            counts = self.histogram[i]
+            count = int(counts.sum())
+            if count == 0:
+                continue
+            cumulative = np.cumsum(counts)
+            result[name] = {
+                'count': count,
+                'total_ms': float(self.total_ns[i]) / 1e6,
+                'mean_us': float(self.total_ns[i]) / count / 1e3,
+                'p50_us': self.bucket_upper_ns(int(np.searchsorted(cumulative, 0.50 * count))) / 1e3,
+                'p99_us': self.bucket_upper_ns(int(np.searchsorted(cumulative, 0.99 * count))) / 1e3,
+            }
+        return result
+
+    @staticmethod
+    def bucket_upper_ns(bucket):
+        """
+        Limite superior (ns) de um bucket do histograma.
+        """
+        return 2.0 ** ((bucket + 1) / BUCKETS_PER_OCTAVE)
@@ -0,0 +1,149 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/q_policy.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Inferência da política DQN em NumPy puro, sem torch nem SB3.
+
+    QPolicy carrega o .npz gerado por export_policy.py (pesos da rede Q
+    com a normalização do VecNormalize convertida em escala/deslocamento
+    por feature) e escolhe ações em lote. StackedEnvs reproduz
+    DummyVecEnv + VecFrameStack para um conjunto de BrickBreakerEnv, de
+    modo que demo e benchmark rodam sem importar torch.
+-----------------------------------------------------------------------
+"""
+
+import numpy as np
+
+class QPolicy:
+    """
+    Rede Q (MLP com ReLU) exportada, com a normalização de observações embutida.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Arquivo .npz gerado por export_policy.py.
+        """
+        data = np.load(path)
+        self.n_stack = int(data['n_stack'])
+        self.obs_dim = int(data['obs_dim'])
+        self.exploration_rate = float(data['exploration_rate'])
+
+        # VecNormalize: clip((obs - mean) / sqrt(var + eps)) == clip(obs * scale + shift)
+        self.scale = data['obs_scale']
+        self.shift = data['obs_shift']
+        self.clip_obs = float(data['clip_obs'])
+
+        num_layers = int(data['num_layers'])
+        self.weights = [data[f'w{i}'] for i in range(num_layers)] # (entrada, saída), float32
+        self.biases = [data[f'b{i}'] for i in range(num_layers)]
+        self.num_actions = self.biases[-1].shape[0]
+        self.rng = np.random.default_rng()
+
+    def q_values(self, obs):
+        """
+        Calcula os Q-values de um lote de observações empilhadas (não normalizadas).
+
+        Args:
+            obs (np.ndarray): (B, n_stack * obs_dim) ou (n_stack * obs_dim,).
+
+        Returns:
+            np.ndarray: (B, num_actions) float32.
+        """
+        x = np.clip(np.atleast_2d(obs) * self.scale + self.shift, -self.clip_obs, self.clip_obs)
+        x = x.astype(np.float32)
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w + b
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+    def predict(self, obs, deterministic=True):
+        """
+        Escolhe ações gulosas (ou epsilon-greedy, como DQN.predict).
+
+        Args:
+            obs (np.ndarray): Observações empilhadas (B, n_stack * obs_dim).
+            deterministic (bool): False aplica exploration_rate do modelo treinado.
+
+        Returns:
+            np.ndarray: Ações (B,) int64.
+        """
+        actions = self.q_values(obs).argmax(axis=1)
+        # Como DQN.predict: com probabilidade epsilon, o lote inteiro é aleatório
+        if not deterministic and self.rng.random() < self.exploration_rate:
+            actions = self.rng.integers(self.num_actions, size=actions.shape[0])
+        return actions
+
+class StackedEnvs:
+    """
+    Executa K ambientes em lote com auto-reset e empilhamento de frames,
+    equivalente a VecFrameStack(DummyVecEnv(...)) para observações vetoriais.
+
+    Cada ambiente escreve sua observação direto na posição do frame mais
+    recente da sua linha da pilha (BrickBreakerEnv.bind_observation), sem
+    arrays intermediários por passo.
+    """
+
+    def __init__(self, env_fns, n_stack):
+        """
+        Args:
+            env_fns (list): Fábricas dos ambientes (como no DummyVecEnv).
+            n_stack (int): Frames empilhados por observação.
+        """
+        self.envs = [fn() for fn in env_fns]
+        self.num_envs = len(self.envs)
+        self.obs_dim = self.envs[0].observation_space.shape[0]
+        self.stacked = np.zeros((self.num_envs, n_stack * self.obs_dim), dtype=np.float32)
+        # Auxiliar do deslocamento: evita a cópia temporária de uma atribuição com sobreposição
+        self.shift_buffer = np.zeros((self.num_envs, (n_stack - 1) * self.obs_dim), dtype=np.float32)
+        for i, env in enumerate(self.envs):
+            env.unwrapped.bind_observation(self.stacked[i, -self.obs_dim:])
+
+    def reset(self):
+        """
+        Reinicia todos os ambientes.
+
+        Returns:
+            np.ndarray: Observações empilhadas (K, n_stack * obs_dim).
+        """
+        self.stacked[:] = 0
+        for env in self.envs:
+            env.reset() # Escreve no frame mais recente da linha
+        return self.stacked
+
+    def step(self, actions):
+        """
+        Avança todos os ambientes; os que terminam são reiniciados e recebem
+        'terminal_observation' no info, como no DummyVecEnv.
+
+        Returns:
+            tuple: (observações empilhadas, recompensas (K,), dones (K,), infos)
+        """
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+
+        # Desloca a pilha um frame para a esquerda (o mais antigo sai)
+        np.copyto(self.shift_buffer, self.stacked[:, self.obs_dim:])
+        np.copyto(self.stacked[:, :-self.obs_dim], self.shift_buffer)
+        for i, env in enumerate(self.envs):
+            # O step escreve a nova observação no frame mais recente da linha
+            obs, reward, terminated, truncated, info = env.step(int(actions[i]))
+            rewards[i] = reward
+            dones[i] = terminated or truncated
+            if dones[i]:
+                info["terminal_observation"] = obs # Cópia (passo final do episódio)
+                self.stacked[i, :-self.obs_dim] = 0
+                env.reset()
+            infos.append(info)
+
+        return self.stacked, rewards, dones, infos
+
+    def close(self):
+        for env in self.envs:
+            env.close()
@@ -0,0 +1,436 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/recording.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Gravação compacta e replay determinístico de episódios.
+
+    Cada episódio é um chunk anexado a um arquivo binário único:
+        cabeçalho (CHUNK_HEADER, 32 bytes)
+        ações empacotadas (2 bits por ação, 4 por byte)
+        observações float32 (num_steps + 1, obs_dim)   [opcional]
+        recompensas float32 (num_steps,)                [opcional]
+    Cada seção é alinhada em 8 bytes, então o arquivo pode ser aberto com
+    np.memmap e as seções lidas como views, sem cópia.
+
+    Como o jogo é determinístico dado a semente e as ações, qualquer frame
+    é reconstruído pelo EpisodeReplayer via Game, sem rodar a política.
+-----------------------------------------------------------------------
+"""
+
+import numpy as np
+import gymnasium as gym
+from src.game import Game
+from src.config import FPS_HUMAN, FPS_TRAIN, REPLAY_SNAPSHOT_INTERVAL
+
+CHUNK_MAGIC = b'BBEP'
+CHUNK_VERSION = 1
+
+# Cabeçalho de cada episódio (lido diretamente do memmap)
+CHUNK_HEADER = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u2'),
+    ('flags', '<u2'),
+    ('seed', '<i8'),
+    ('num_steps', '<u4'),
+    ('frame_skip', '<u2'),
+    ('obs_dim', '<u2'),
+    ('payload_bytes', '<u8'),
+])
+
+FLAG_OBSERVATIONS = 1
+FLAG_REWARDS = 2
+FLAG_TERMINATED = 4 # Episódio terminou por fim de jogo (não foi interrompido)
+
+def align8(size):
+    """
+    Arredonda um tamanho em bytes para o próximo múltiplo de 8.
+    """
+    return (size + 7) & ~7
+
+def align4(size):
+    """
+    Arredonda um número de ações para o próximo múltiplo de 4.
+    """
+    return (size + 3) & ~3
+
+def pack_actions(actions):
+    """
+    Empacota ações (0, 1 ou 2) em 2 bits cada, 4 por byte.
+    """
+    actions = np.asarray(actions, dtype=np.uint8)
+    padded = np.zeros(align4(actions.size), dtype=np.uint8)
+    padded[:actions.size] = actions
+    quads = padded.reshape(-1, 4)
+    return quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+
+def unpack_actions(packed, num_steps):
+    """
+    Inverso de pack_actions.
+    """
+    shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+    return ((np.asarray(packed)[:, None] >> shifts) & 3).ravel()[:num_steps]
+
+class EpisodeWriter:
+    """
+    Arquivo de gravação aberto para anexar chunks. Pode ser compartilhado
+    por vários EpisodeRecorder (ex: um por ambiente de um DummyVecEnv).
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Arquivo de gravação (criado ou estendido).
+        """
+        self.path = path
+        self.file = open(path, 'ab')
+
+    def write(self, chunk):
+        """
+        Anexa um chunk completo (cabeçalho + payload) e o descarrega no disco.
+        """
+        self.file.write(chunk)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class EpisodeRecorder:
+    """
+    Acumula um episódio por vez em buffers pré-alocados (crescimento por
+    duplicação) e o anexa ao arquivo ao final.
+    """
+
+    def __init__(self, writer, record_observations=False, record_rewards=False, capacity=4096):
+        """
+        Args:
+            writer (EpisodeWriter): Destino dos chunks.
+            record_observations (bool): Grava o vetor de observação de cada passo.
+            record_rewards (bool): Grava a recompensa de cada passo.
+            capacity (int): Capacidade inicial, em passos, dos buffers.
+        """
+        self.writer = writer
+        self.record_observations = record_observations
+        self.record_rewards = record_rewards
+
+        self.actions = np.zeros(capacity, dtype=np.uint8)
+        self.observations = None
+        self.rewards = np.zeros(capacity, dtype=np.float32) if record_rewards else None
+
+        self.active = False
+        self.seed = 0
+        self.frame_skip = 1
+        self.num_steps = 0
+
+    def begin(self, seed, frame_skip=1, observation=None):
+        """
+        Inicia um episódio.
+
+        Args:
+            seed (int): Semente passada a Game.reset_game / env.reset.
+            frame_skip (int): Ticks de física por ação.
+            observation (np.ndarray, optional): Observação inicial (vetor 1-D),
+                                                obrigatória se record_observations.
+        """
+        self.active = True
+        self.seed = int(seed)
+        self.frame_skip = int(frame_skip)
+        self.num_steps = 0
+
+        if self.record_observations:
+            observation = np.asarray(observation, dtype=np.float32)
+            if observation.ndim != 1:
+                raise ValueError("Somente observações vetoriais (1-D) podem ser gravadas; "
+                                 "frames em pixels são reconstruídos pelo replay.")
+            if self.observations is None or self.observations.shape[1] != observation.size:
+                self.observations = np.zeros((len(self.actions) + 1, observation.size), dtype=np.float32)
+            self.observations[0] = observation
+
+    def add(self, action, observation=None, reward=0.0):
+        """
+        Registra um passo do episódio em andamento.
+        """
+        t = self.num_steps
+        if t == len(self.actions):
+            self.grow()
+        self.actions[t] = action
+        if self.record_observations:
+            self.observations[t + 1] = observation
+        if self.record_rewards:
+            self.rewards[t] = reward
+        self.num_steps = t + 1
+
+    def grow(self):
+        """
+        Duplica a capacidade dos buffers, preservando o conteúdo.
+        """
+        capacity = 2 * len(self.actions)
+        self.actions = np.resize(self.actions, capacity)
+        if self.rewards is not None:
+            self.rewards = np.resize(self.rewards, capacity)
+        if self.observations is not None:
+            observations = np.zeros((capacity + 1, self.observations.shape[1]), dtype=np.float32)
+            observations[:len(self.observations)] = self.observations
+            self.observations = observations
+
+    def end(self, terminated=True):
+        """
+        Encerra o episódio em andamento e anexa seu chunk ao arquivo.
+
+        Args:
+            terminated (bool): False se o episódio foi interrompido (truncado).
+        """
+        if not self.active:
+            return
+        self.active = False
+        n = self.num_steps
+        if n == 0 and not terminated:
+            return # Episódio reiniciado sem nenhum passo: nada a reproduzir
+
+        flags = FLAG_TERMINATED if terminated else 0
+        sections = [pack_actions(self.actions[:n]).tobytes()]
+        obs_dim = 0
+        if self.record_observations:
+            flags |= FLAG_OBSERVATIONS
+            obs_dim = self.observations.shape[1]
+            sections.append(self.observations[:n + 1].tobytes())
+        if self.record_rewards:
+            flags |= FLAG_REWARDS
+            sections.append(self.rewards[:n].tobytes())
+
+        payload = b''.join(data + bytes(align8(len(data)) - len(data)) for data in sections)
+
+        header = np.zeros(1, dtype=CHUNK_HEADER)
+        header['magic'] = CHUNK_MAGIC
+        header['version'] = CHUNK_VERSION
+        header['flags'] = flags
+        header['seed'] = self.seed
+        header['num_steps'] = n
+        header['frame_skip'] = self.frame_skip
+        header['obs_dim'] = obs_dim
+        header['payload_bytes'] = len(payload)
+
+        # Chunk escrito de uma vez: episódios de recorders diferentes não se intercalam
+        self.writer.write(header.tobytes() + payload)
+
+class RecordedEpisode:
+    """
+    Episódio lido de um arquivo de gravação. Arrays são views do memmap.
+    """
+
+    def __init__(self, header, packed_actions, observations=None, rewards=None):
+        self.seed = int(header['seed'])
+        self.num_steps = int(header['num_steps'])
+        self.frame_skip = int(header['frame_skip'])
+        self.terminated = bool(header['flags'] & FLAG_TERMINATED)
+        self.packed_actions = packed_actions
+        self.observations = observations # (num_steps + 1, obs_dim) ou None
+        self.rewards = rewards           # (num_steps,) ou None
+
+    def actions(self):
+        """
+        Ações do episódio, desempacotadas (uint8, uma por passo).
+        """
+        return unpack_actions(self.packed_actions, self.num_steps)
+
+class EpisodeFile:
+    """
+    Leitura de um arquivo de gravação via memmap. Apenas os cabeçalhos são
+    percorridos na abertura; os dados de cada episódio são lidos sob demanda.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Arquivo gravado por EpisodeRecorder.
+        """
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        self.offsets = []
+
+        offset = 0
+        size = len(self.data)
+        while offset + CHUNK_HEADER.itemsize <= size:
+            header = self.header_at(offset)
+            if header['magic'] != CHUNK_MAGIC:
+                raise ValueError(f"Chunk inválido em {path} (offset {offset})")
+            end = offset + CHUNK_HEADER.itemsize + int(header['payload_bytes'])
+            if end > size:
+                break # Último chunk incompleto (gravação interrompida)
+            self.offsets.append(offset)
+            offset = end
+
+    def header_at(self, offset):
+        """
+        Cabeçalho do chunk que começa em offset.
+        """
+        return self.data[offset:offset + CHUNK_HEADER.itemsize].view(CHUNK_HEADER)[0]
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        """
+        Retorna o episódio de índice index (ordem de gravação).
+        """
+        offset = self.offsets[index]
+        header = self.header_at(offset)
+        n = int(header['num_steps'])
+        flags = int(header['flags'])
+        position = offset + CHUNK_HEADER.itemsize
+
+        size = align4(n) // 4
+        packed_actions = self.data[position:position + size]
+        position += align8(size)
+
+        observations = None
+        if flags & FLAG_OBSERVATIONS:
+            obs_dim = int(header['obs_dim'])
+            size = (n + 1) * obs_dim * 4
+            observations = self.data[position:position + size].view(np.float32).reshape(n + 1, obs_dim)
+            position += align8(size)
+
+        rewards = None
+        if flags & FLAG_REWARDS:
+            size = n * 4
+            rewards = self.data[position:position + size].view(np.float32)
+
+        return RecordedEpisode(header, packed_actions, observations, rewards)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+class EpisodeReplayer:
+    """
+    Reconstrói um episódio gravado frame a frame através de Game.
+
+    Snapshots (Game.snapshot) são guardados a cada snapshot_interval passos
+    simulados, então voltar ou avançar para um frame já visitado custa no
+    máximo snapshot_interval passos.
+    """
+
+    def __init__(self, episode, headless=True, snapshot_interval=REPLAY_SNAPSHOT_INTERVAL):
+        """
+        Args:
+            episode (RecordedEpisode): Episódio a reproduzir.
+            headless (bool): False para exibir o replay em uma janela.
+            snapshot_interval (int): Passos entre snapshots guardados.
+        """
+        self.episode = episode
+        self.actions = episode.actions()
+        self.snapshot_interval = snapshot_interval
+        self.fps = FPS_TRAIN if headless else FPS_HUMAN
+
+        self.game = Game(headless=headless)
+        self.game.reset_game(seed=episode.seed)
+        self.t = 0
+        self.snapshots = {0: self.game.snapshot()}
+
+    def step(self):
+        """
+        Avança um passo com a ação gravada.
+
+        Returns:
+            tuple: (estado, recompensa, done), como Game.step.
+        """
+        result = self.game.step(int(self.actions[self.t]), fps=self.fps, frame_skip=self.episode.frame_skip)
+        self.t += 1
+        if self.t % self.snapshot_interval == 0 and self.t not in self.snapshots:
+            self.snapshots[self.t] = self.game.snapshot()
+        return result
+
+    def seek(self, t):
+        """
+        Posiciona o jogo no estado após t passos (0 = início do episódio).
+
+        Returns:
+            np.array: Observação (Game.get_state) no frame t.
+        """
+        if not 0 <= t <= self.episode.num_steps:
+            raise IndexError(f"Frame {t} fora do episódio (0..{self.episode.num_steps})")
+
+        # Snapshot mais próximo antes de t, se evitar simulação
+        start = max(k for k in self.snapshots if k <= t)
+        if t < self.t or start > self.t:
+            self.game.restore(self.snapshots[start])
+            self.t = start
+
+        while self.t < t:
+            self.step()
+
+        if not self.game.headless:
+            self.game.draw()
+        return self.game.get_state()
+
+    def play(self):
+        """
+        Reproduz o episódio do frame atual até o fim.
+
+        Yields:
+            tuple: (t, estado, recompensa, done) após cada passo.
+        """
+        while self.t < self.episode.num_steps and self.game.running:
+            state, reward, done = self.step()
+            yield self.t, state, reward, done
+
+    def close(self):
+        """
+        Encerra o pygame se o replay abriu uma janela.
+        """
+        if not self.game.headless:
+            import pygame
+            pygame.quit()
+
+class RecordEpisodes(gym.Wrapper):
+    """
+    Wrapper que grava cada episódio de um BrickBreakerEnv em um EpisodeRecorder.
+
+    Todo reset recebe uma semente explícita (gravada no chunk): a informada,
+    a próxima de episode_seeds do ambiente ou uma sorteada pelo wrapper.
+    Quando episode_seeds do ambiente se esgota (ex: slots ociosos do
+    benchmark), os episódios seguintes não são gravados.
+    """
+
+    def __init__(self, env, recorder, seed=None):
+        """
+        Args:
+            env (BrickBreakerEnv): Ambiente a gravar.
+            recorder (EpisodeRecorder): Destino dos episódios deste ambiente.
+            seed (int, optional): Semente do sorteio das sementes de episódio.
+        """
+        super().__init__(env)
+        self.recorder = recorder
+        self.seed_rng = np.random.default_rng(seed)
+
+    def reset(self, *, seed=None, options=None):
+        self.recorder.end(terminated=False) # Episódio anterior interrompido, se houver
+
+        base = self.env.unwrapped
+        record = True
+        if seed is None and base.episode_seeds is not None:
+            seed = next(base.episode_seeds, None)
+            record = seed is not None
+        if seed is None and record:
+            seed = int(self.seed_rng.integers(2**63 - 1))
+
+        obs, info = self.env.reset(seed=seed, options=options)
+        if record:
+            observation = obs if self.recorder.record_observations else None
+            self.recorder.begin(seed, base.frame_skip, observation)
+        return obs, info
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        if not self.recorder.active:
+            return obs, reward, terminated, truncated, info
+        self.recorder.add(int(action), obs if self.recorder.record_observations else None, reward)
+        if terminated or truncated:
+            self.recorder.end(terminated=terminated)
+        return obs, reward, terminated, truncated, info
+
+    def close(self):
+        self.recorder.end(terminated=False) # Grava o episódio em andamento
+        super().close()
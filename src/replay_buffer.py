@@ -0,0 +1,203 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/replay_buffer.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Replay buffer do DQN ciente do empilhamento de frames.
+
+    O ReplayBuffer do SB3 guarda, por transição, a observação empilhada e
+    a próxima observação empilhada: com n_stack = 4 cada frame aparece até
+    8 vezes. Aqui cada ambiente tem um anel de frames únicos (o frame mais
+    recente de cada observação) e cada transição guarda apenas o índice do
+    seu frame e quantos frames anteriores pertencem ao mesmo episódio. As
+    pilhas são reconstruídas por aritmética de índices na amostragem.
+
+    Uso: DQN(..., replay_buffer_class=FrameStackReplayBuffer,
+             replay_buffer_kwargs=dict(n_stack=4))
+-----------------------------------------------------------------------
+"""
+
+import numpy as np
+from stable_baselines3.common.buffers import BaseBuffer
+from stable_baselines3.common.type_aliases import ReplayBufferSamples
+
+class FrameStackReplayBuffer(BaseBuffer):
+    """
+    Replay buffer que armazena frames únicos em anel por ambiente.
+
+    O eixo 0 da observação empilhada é o eixo da pilha: (n_stack * D,) para
+    VecFrameStack sobre vetores (frames concatenados) e (n_stack, H, W) para
+    a pilha de pixels do BrickBreakerEnv.
+    """
+
+    def __init__(self, buffer_size, observation_space, action_space, device="auto", n_envs=1,
+                 optimize_memory_usage=False, handle_timeout_termination=True,
+                 n_stack=4, padding="zeros", frame_margin=0.125):
+        """
+        Args:
+            buffer_size (int): Transições armazenadas (somando todos os ambientes).
+            observation_space (spaces.Box): Espaço da observação empilhada.
+            action_space (spaces.Discrete): Espaço de ações.
+            device (str): Dispositivo dos tensores amostrados.
+            n_envs (int): Número de ambientes do VecEnv.
+            optimize_memory_usage (bool): Ignorado (o buffer já é compacto);
+                                          aceito por compatibilidade com o DQN.
+            handle_timeout_termination (bool): Trata truncamentos como não terminais.
+            n_stack (int): Frames por observação.
+            padding (str): Conteúdo da pilha antes do início do episódio:
+                           'zeros' (VecFrameStack) ou 'repeat' (primeiro frame
+                           repetido, como a pilha de pixels do ambiente).
+            frame_margin (float): Folga do anel de frames em relação ao número de
+                                  transições (cobre o frame extra de cada reset).
+        """
+        super().__init__(buffer_size, observation_space, action_space, device, n_envs=n_envs)
+        self.buffer_size = max(buffer_size // n_envs, 1)
+        self.handle_timeout_termination = handle_timeout_termination
+        self.n_stack = n_stack
+        self.padding = padding
+        if self.obs_shape[0] % n_stack:
+            raise ValueError(f"Observação {self.obs_shape} não é divisível em {n_stack} frames")
+        self.frame_shape = (self.obs_shape[0] // n_stack,) + tuple(self.obs_shape[1:])
+
+        # Anel de frames por ambiente, endereçado por índices absolutos (módulo capacidade)
+        self.frame_capacity = self.buffer_size + int(self.buffer_size * frame_margin) + n_stack
+        self.frames = np.zeros((self.frame_capacity, n_envs) + self.frame_shape, dtype=observation_space.dtype)
+        self.frames_written = np.zeros(n_envs, dtype=np.int64)
+        self.episode_steps = np.zeros(n_envs, dtype=np.int64)
+        self.episode_ended = np.ones(n_envs, dtype=bool) # Próxima obs inicia episódio
+
+        # Por transição: frame mais recente da obs e frames anteriores válidos
+        self.frame_index = np.zeros((self.buffer_size, n_envs), dtype=np.int64)
+        self.history = np.zeros((self.buffer_size, n_envs), dtype=np.uint8)
+        self.actions = np.zeros((self.buffer_size, n_envs, self.action_dim), dtype=self._maybe_cast_dtype(action_space.dtype))
+        self.rewards = np.zeros((self.buffer_size, n_envs), dtype=np.float32)
+        self.dones = np.zeros((self.buffer_size, n_envs), dtype=np.float32)
+        self.timeouts = np.zeros((self.buffer_size, n_envs), dtype=np.float32)
+
+    @staticmethod
+    def _maybe_cast_dtype(dtype):
+        # Como no ReplayBuffer do SB3: ações float64 viram float32
+        return np.float32 if dtype == np.float64 else dtype
+
+    def push_frame(self, env, frame):
+        """
+        Grava um frame no anel do ambiente.
+
+        Returns:
+            int: Índice absoluto do frame.
+        """
+        index = self.frames_written[env]
+        self.frames[index % self.frame_capacity, env] = frame
+        self.frames_written[env] = index + 1
+        return index
+
+    def add(self, obs, next_obs, action, reward, done, infos):
+        """
+        Registra uma transição por ambiente (mesma assinatura do ReplayBuffer).
+        """
+        obs = obs.reshape((self.n_envs, self.n_stack) + self.frame_shape)
+        next_obs = next_obs.reshape((self.n_envs, self.n_stack) + self.frame_shape)
+
+        for env in range(self.n_envs):
+            # Início de episódio: o frame da obs ainda não está no anel
+            if self.episode_ended[env]:
+                self.push_frame(env, obs[env, -1])
+                self.episode_steps[env] = 0
+            # Frame da obs = último gravado; o da próxima obs (terminal, se done) vem a seguir
+            self.frame_index[self.pos, env] = self.frames_written[env] - 1
+            self.history[self.pos, env] = min(self.episode_steps[env], self.n_stack - 1)
+            self.push_frame(env, next_obs[env, -1])
+            self.episode_steps[env] += 1
+            self.episode_ended[env] = done[env]
+
+        self.actions[self.pos] = np.array(action).reshape((self.n_envs, self.action_dim))
+        self.rewards[self.pos] = np.array(reward)
+        self.dones[self.pos] = np.array(done)
+        if self.handle_timeout_termination:
+            self.timeouts[self.pos] = np.array([info.get("TimeLimit.truncated", False) for info in infos])
+
+        self.pos += 1
+        if self.pos == self.buffer_size:
+            self.full = True
+            self.pos = 0
+
+    def valid(self, batch_inds, env_indices):
+        """
+        Transições cujos frames ainda estão no anel (não sobrescritos).
+        """
+        oldest = self.frame_index[batch_inds, env_indices] - self.history[batch_inds, env_indices]
+        return oldest >= self.frames_written[env_indices] - self.frame_capacity
+
+    def sample(self, batch_size, env=None):
+        """
+        Amostra transições uniformemente, como o ReplayBuffer do SB3.
+        """
+        upper_bound = self.buffer_size if self.full else self.pos
+        batch_inds = np.random.randint(0, upper_bound, size=batch_size)
+        env_indices = np.random.randint(0, high=self.n_envs, size=batch_size)
+
+        # Re-sorteia as raras transições antigas cujos frames já saíram do anel
+        invalid = np.flatnonzero(~self.valid(batch_inds, env_indices))
+        while invalid.size:
+            batch_inds[invalid] = np.random.randint(0, upper_bound, size=invalid.size)
+            env_indices[invalid] = np.random.randint(0, high=self.n_envs, size=invalid.size)
+            invalid = invalid[~self.valid(batch_inds[invalid], env_indices[invalid])]
+
+        return self._get_samples(batch_inds, env_indices, env)
+
+    def stack(self, newest, history, env_indices):
+        """
+        Reconstrói pilhas de n_stack frames terminando no frame newest.
+
+        Args:
+            newest (np.ndarray): Índice absoluto do frame mais recente de cada pilha.
+            history (np.ndarray): Frames anteriores do mesmo episódio (0..n_stack-1).
+            env_indices (np.ndarray): Ambiente de cada pilha.
+
+        Returns:
+            np.ndarray: (B, *obs_shape)
+        """
+        offsets = np.arange(1 - self.n_stack, 1) # Do mais antigo ao mais recente
+        before_start = offsets[None, :] < -history[:, None]
+        # 'repeat' usa o primeiro frame do episódio nas posições anteriores a ele
+        clamped = np.maximum(offsets[None, :], -history[:, None].astype(np.int64))
+        indices = (newest[:, None] + clamped) % self.frame_capacity
+        frames = self.frames[indices, env_indices[:, None]]
+        if self.padding == "zeros":
+            frames[before_start] = 0
+        return frames.reshape((len(newest),) + self.obs_shape)
+
+    def _get_samples(self, batch_inds, env_indices, env=None):
+        newest = self.frame_index[batch_inds, env_indices]
+        history = self.history[batch_inds, env_indices].astype(np.int64)
+
+        obs = self.stack(newest, history, env_indices)
+        # A próxima obs avança um frame e ganha um frame de histórico
+        next_obs = self.stack(newest + 1, np.minimum(history + 1, self.n_stack - 1), env_indices)
+
+        data = (
+            self._normalize_obs(obs, env),
+            self.actions[batch_inds, env_indices, :],
+            self._normalize_obs(next_obs, env),
+            # Truncamentos (timeouts) não são terminais para o bootstrap
+            (self.dones[batch_inds, env_indices] * (1 - self.timeouts[batch_inds, env_indices])).reshape(-1, 1),
+            self._normalize_reward(self.rewards[batch_inds, env_indices].reshape(-1, 1), env),
+        )
+        return ReplayBufferSamples(*tuple(map(self.to_torch, data)))
+
+    def __setstate__(self, state):
+        # Buffer restaurado (checkpoint) não está ligado a episódios em andamento:
+        # a próxima observação de cada ambiente inicia um episódio
+        self.__dict__.update(state)
+        self.episode_ended[:] = True
+
+    def reset(self):
+        """
+        Esvazia o buffer (mantém a alocação).
+        """
+        super().reset()
+        self.frames_written[:] = 0
+        self.episode_steps[:] = 0
+        self.episode_ended[:] = True
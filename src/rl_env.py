@@ -10,11 +10,29 @@ Descrição:
 -----------------------------------------------------------------------
 """
 
+import time
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
-from src.game import Game
-from src.config import FPS_HUMAN, FPS_TRAIN
+from src.game import Game, GAME_PHASES
+from src.config import (
+    FPS_HUMAN,
+    FPS_TRAIN,
+    FRAME_SKIP,
+    MAX_EPISODE_STEPS,
+    STALL_FRAMES,
+    OBS_TYPE,
+    PIXEL_OBS_WIDTH,
+    PIXEL_OBS_HEIGHT,
+    PIXEL_OBS_STACK,
+    PROFILE_PHASES
+)
+
+# Limites do Espaço de Observação: [Paddle X, Ball X, Ball Y, Ball Speed X, Ball Speed Y, Rel X, Paddle Speed, 
+#                                   Future Ball X, Distance to Ball, Is Approaching]
+# Compartilhados com o VecEnv vetorizado (src/vec_env.py)
+OBS_LOW = np.array([0.0, 0.0, 0.0, -5.0, -5.0, -2.0, -2.0, 0.0, 0.0, 0.0], dtype=np.float32)
+OBS_HIGH = np.array([1.0, 1.0, 1.2, 5.0, 5.0, 2.0, 2.0, 1.0, 1.0, 1.0], dtype=np.float32)
 
 class BrickBreakerEnv(gym.Env):
     """
@@ -22,53 +40,233 @@ class BrickBreakerEnv(gym.Env):
     """
     metadata = {'render_modes': ['human']}
 
-    def __init__(self, render_mode=None):
+    def __init__(self, render_mode=None, frame_skip=FRAME_SKIP, obs_type=OBS_TYPE, episode_seeds=None,
+                 profile=PROFILE_PHASES, max_episode_steps=MAX_EPISODE_STEPS, stall_frames=STALL_FRAMES):
         """
         Inicializa o ambiente.
 
         Args:
             render_mode (str, optional): 'human' para renderizar em tempo real (60fps),
-                                         None para velocidade máxima (treino).
+                                         None para velocidade máxima (treino), em modo
+                                         headless (sem janela nem renderização).
+            frame_skip (int, optional): Ticks de física por ação (action repeat).
+            obs_type (str, optional): 'vector' para as 10 features de Game.get_state,
+                                      'pixels' para PIXEL_OBS_STACK frames em tons de
+                                      cinza (PIXEL_OBS_HEIGHT x PIXEL_OBS_WIDTH, uint8).
+            episode_seeds (iterable, optional): Sementes usadas, em ordem, pelos resets
+                                                sem seed explícita (ex: auto-reset do
+                                                VecEnv). Esgotadas, o RNG segue livre.
+            profile (bool, optional): Mede o tempo de cada fase de Game.step e do
+                                      step do ambiente ('env_step'); ver profile_export().
+            max_episode_steps (int, optional): Passos até o episódio ser truncado
+                                               ('time_limit'); 0 desliga.
+            stall_frames (int, optional): Frames sem progresso (tijolo quebrado, toque
+                                          na raquete ou vida perdida) até o episódio ser
+                                          truncado ('stall'), ex: bola presa em um loop
+                                          quase horizontal; 0 desliga.
         """
         super(BrickBreakerEnv, self).__init__()
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip deve ser >= 1, recebido {frame_skip}")
         
         self.render_mode = render_mode
-        self.game = Game()
+        self.frame_skip = frame_skip
+        self.obs_type = obs_type
+        self.episode_seeds = iter(episode_seeds) if episode_seeds is not None else None
+        self.episode_seed = None # Semente do episódio atual (None = RNG livre)
+        self.game = Game(headless=render_mode is None)
+        self.profiler = self.game.enable_profiling(('env_step',)) if profile else None
+        self.env_step_phase = len(GAME_PHASES) # Índice de 'env_step' no profiler
+        self.max_episode_steps = max_episode_steps
+        self.stall_frames = stall_frames
+        self.elapsed_steps = 0
+        self.frames_without_progress = 0
         
         # Espaço de Ação Discreto: 0=Ficar, 1=Esquerda, 2=Direita
         self.action_space = spaces.Discrete(3)
         
-        # Espaço de Observação: [Paddle X, Ball X, Ball Y, Ball Speed X, Ball Speed Y, Rel X, Paddle Speed, 
-        #                        Future Ball X, Distance to Ball, Is Approaching]
-        # PaddleX, BallX, BallY, BallVX, BallVY, RelX, PaddleVX, FutureBallX, Distance, IsApproaching
-        low = np.array([0.0, 0.0, 0.0, -5.0, -5.0, -2.0, -2.0, 0.0, 0.0, 0.0], dtype=np.float32)
-        high = np.array([1.0, 1.0, 1.2, 5.0, 5.0, 2.0, 2.0, 1.0, 1.0, 1.0], dtype=np.float32)
-        
-        self.observation_space = spaces.Box(low=low, high=high, dtype=np.float32)
+        if obs_type == 'pixels':
+            # Ring buffer com o dobro do tamanho da pilha: cada frame é gravado em
+            # duas posições, assim os últimos N frames formam sempre uma fatia
+            # contígua e ordenada (view sem cópia).
+            self.frames = np.zeros((2 * PIXEL_OBS_STACK, PIXEL_OBS_HEIGHT, PIXEL_OBS_WIDTH), dtype=np.uint8)
+            self.frame_index = 0
+            self.observation_space = spaces.Box(
+                low=0, high=255,
+                shape=(PIXEL_OBS_STACK, PIXEL_OBS_HEIGHT, PIXEL_OBS_WIDTH),
+                dtype=np.uint8
+            )
+        else:
+            self.observation_space = spaces.Box(low=OBS_LOW, high=OBS_HIGH, dtype=np.float32)
+        # Buffer do estado vetorial, reescrito a cada passo (ver bind_observation)
+        self.observation = np.zeros(OBS_LOW.shape, dtype=np.float32)
 
     def reset(self, seed=None, options=None):
         """
         Reseta o ambiente para um novo episódio.
         """
+        if seed is None and self.episode_seeds is not None:
+            seed = next(self.episode_seeds, None)
         super().reset(seed=seed)
+        self.episode_seed = seed
+        # O jogo sorteia lançamentos e tijolos especiais com o np_random do
+        # ambiente, semeado aqui: a mesma seed reproduz o mesmo episódio
+        self.game.rng = self.np_random
         self.game.reset_game()
-        return self.game.get_state(), {}
+        self.elapsed_steps = 0
+        self.frames_without_progress = 0
+        if self.obs_type == 'pixels':
+            # Preenche a pilha inteira com o primeiro frame
+            self.frame_index = 0
+            self.game.render_pixels(self.frames[0])
+            self.frames[1:] = self.frames[0]
+            return self.pixel_observation(), self.game_info()
+        return self.game.get_state(self.observation), self.game_info()
+
+    def bind_observation(self, out):
+        """
+        Passa a escrever a observação vetorial em um buffer do chamador, ex: a
+        linha i de um array (n_envs, 10) preexistente, em vez do buffer próprio.
+
+        reset e step devolvem esse mesmo array (view, sobrescrita no passo
+        seguinte; copie-a se precisar guardá-la). No passo final do episódio a
+        observação devolvida é uma cópia, pois sobrevive ao reset seguinte.
+
+        Args:
+            out (np.ndarray): Vetor float32 contíguo de shape (10,).
+        """
+        if self.obs_type != 'vector':
+            raise ValueError("bind_observation só se aplica a obs_type='vector'")
+        if out.shape != self.observation.shape or out.dtype != np.float32:
+            raise ValueError(f"Buffer de observação deve ser float32 {self.observation.shape}")
+        self.observation = out
+
+    def push_frame(self):
+        """
+        Rasteriza o frame atual na próxima posição do ring buffer.
+        """
+        self.frame_index = (self.frame_index + 1) % PIXEL_OBS_STACK
+        frame = self.frames[self.frame_index]
+        self.game.render_pixels(frame)
+        np.copyto(self.frames[self.frame_index + PIXEL_OBS_STACK], frame)
+
+    def pixel_observation(self):
+        """
+        Retorna os últimos PIXEL_OBS_STACK frames, do mais antigo ao mais recente.
+
+        O array é uma view do ring buffer e será sobrescrito nos próximos passos;
+        copie-o se precisar guardá-lo.
+        """
+        start = self.frame_index + 1
+        return self.frames[start:start + PIXEL_OBS_STACK]
 
     def step(self, action):
         """
         Executa uma ação no ambiente.
         """
+        if self.profiler is not None:
+            start = time.perf_counter_ns()
+
         # Define o FPS com base no modo de renderização
         fps = FPS_HUMAN if self.render_mode == 'human' else FPS_TRAIN
         
         # Executa passo no jogo
-        obs, reward, done = self.game.step(action, fps=fps)
+        game = self.game
+        progress = (game.score, game.paddle_hits, game.lives)
+        obs, reward, done = game.step(action, fps=fps, frame_skip=self.frame_skip, out=self.observation)
+        if self.obs_type == 'pixels':
+            self.push_frame()
+            obs = self.pixel_observation()
+        truncated, reason = self.check_truncation(progress != (game.score, game.paddle_hits, game.lives))
+        if done or truncated:
+            # A observação terminal sobrevive ao reset seguinte (o VecEnv a
+            # guarda em info['terminal_observation']), então não pode ser view
+            obs = obs.copy()
         
-        truncated = False 
-        info = {}
+        # Truncado não é terminal: o VecEnv marca TimeLimit.truncated e o DQN
+        # continua fazendo bootstrap do valor da última observação
+        truncated = truncated and not done
+        info = self.game_info()
+        if truncated:
+            info["truncation_reason"] = reason
+
+        if self.profiler is not None:
+            self.profiler.record(self.env_step_phase, time.perf_counter_ns() - start)
         
         return obs, reward, done, truncated, info
 
+    def check_truncation(self, progressed):
+        """
+        Atualiza os contadores de limite do episódio após um passo.
+
+        Args:
+            progressed (bool): O passo quebrou tijolo, tocou a raquete ou perdeu vida.
+                               Sem progresso, soma os ticks de física simulados
+                               (Game.step_frames, menor que frame_skip se o passo
+                               parou antes).
+
+        Returns:
+            tuple: (truncado, motivo: 'time_limit', 'stall' ou None)
+        """
+        self.elapsed_steps += 1
+        self.frames_without_progress = 0 if progressed else self.frames_without_progress + self.game.step_frames
+        if self.max_episode_steps and self.elapsed_steps >= self.max_episode_steps:
+            return True, 'time_limit'
+        if self.stall_frames and self.frames_without_progress >= self.stall_frames:
+            return True, 'stall'
+        return False, None
+
+    def profile_export(self, reset=True):
+        """
+        Acumuladores do profiler por fase (chamado via VecEnv.env_method, que
+        também funciona com SubprocVecEnv).
+
+        Returns:
+            dict or None: Saída de PhaseProfiler.export, ou None se desligado.
+        """
+        if self.profiler is None:
+            return None
+        return self.profiler.export(reset=reset)
+
+    def get_rng_state(self):
+        """
+        Estado do gerador do ambiente (para checkpoints, via env_method).
+
+        Returns:
+            dict: Estado do bit generator do np_random.
+        """
+        return self.np_random.bit_generator.state
+
+    def set_rng_state(self, state):
+        """
+        Restaura o estado salvo por get_rng_state; vale a partir do próximo reset.
+        """
+        self.np_random.bit_generator.state = state
+        self.game.rng = self.np_random
+
+    def game_info(self):
+        """
+        Diagnósticos escalares do jogo, devolvidos no info de cada passo.
+
+        Permitem acompanhar o episódio sem get_attr("game"), que em um
+        SubprocVecEnv serializaria o Game inteiro a cada chamada.
+
+        Returns:
+            dict: level, score, lives, bricks_left, paddle_hits, stop
+                  (True se o jogador pediu para sair) e episode_seed (semente
+                  do reset do episódio, None se não semeado).
+        """
+        game = self.game
+        return {
+            "level": game.level,
+            "score": game.score,
+            "lives": game.lives,
+            "bricks_left": len(game.bricks),
+            "paddle_hits": game.paddle_hits,
+            "stop": not game.running,
+            "episode_seed": self.episode_seed,
+        }
+
     def render(self):
         """
         Renderização é tratada internamente pela classe Game durante o step.
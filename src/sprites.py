@@ -8,12 +8,75 @@ Descrição:
     Define as classes de Sprites do jogo (Raquete, Bola, Tijolo) herdando
     de pygame.sprite.Sprite. Contém a lógica de movimento e renderização
     básica de cada entidade.
+
+    As imagens vêm de um cache de superfícies compartilhadas (uma por cor de
+    tijolo, tijolo especial, bola e raquete, criadas uma vez por processo) e
+    SpritePool reaproveita instâncias entre níveis e vidas, sem alocar
+    sprites nem superfícies a cada reset.
 -----------------------------------------------------------------------
 """
 
 import pygame
 from src.config import *
 
+# Superfícies compartilhadas por todos os sprites (e jogos) do processo
+_SURFACES = {}
+
+def shared_surface(kind, color=None):
+    """
+    Retorna a superfície de um tipo de sprite, criando-a no primeiro uso.
+
+    As superfícies são somente leitura: sprites apenas as desenham (blit).
+
+    Args:
+        kind (str): 'paddle', 'ball' ou 'brick'.
+        color (tuple, optional): Cor do tijolo.
+
+    Returns:
+        pygame.Surface: Superfície compartilhada.
+    """
+    key = (kind, color)
+    surface = _SURFACES.get(key)
+    if surface is None:
+        if kind == 'paddle':
+            surface = pygame.Surface([PADDLE_WIDTH, PADDLE_HEIGHT])
+            surface.fill(PADDLE_COLOR)
+        elif kind == 'ball':
+            surface = pygame.Surface([BALL_RADIUS * 2, BALL_RADIUS * 2])
+            surface.set_colorkey(BLACK) # Torna o fundo do surface transparente
+            pygame.draw.circle(surface, BALL_COLOR, (BALL_RADIUS, BALL_RADIUS), BALL_RADIUS)
+        elif kind == 'brick':
+            surface = pygame.Surface([BRICK_WIDTH, BRICK_HEIGHT])
+            surface.fill(color)
+        else:
+            raise ValueError(f"Tipo de sprite desconhecido: {kind}")
+        _SURFACES[key] = surface
+    return surface
+
+class SpritePool:
+    """
+    Reserva de sprites reutilizáveis de uma classe.
+
+    release() remove o sprite de todos os grupos e o guarda; acquire() devolve
+    um sprite da reserva reiniciado por reset() (mesmos argumentos do
+    construtor), criando um novo apenas quando a reserva está vazia.
+    """
+
+    def __init__(self, sprite_class):
+        self.sprite_class = sprite_class
+        self.free = []
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+            return sprite
+        return self.sprite_class(*args, **kwargs)
+
+    def release(self, sprite):
+        sprite.kill()
+        self.free.append(sprite)
+
 class Paddle(pygame.sprite.Sprite):
     """
     Representa a raquete controlada pelo jogador ou agente.
@@ -24,13 +87,17 @@ class Paddle(pygame.sprite.Sprite):
         Inicializa a raquete, definindo sua aparência, posição inicial e velocidade.
         """
         super().__init__()
-        self.image = pygame.Surface([PADDLE_WIDTH, PADDLE_HEIGHT])
-        self.image.fill(PADDLE_COLOR)
+        self.image = shared_surface('paddle')
         self.rect = self.image.get_rect()
+        self.speed = PADDLE_SPEED
+        self.reset()
+
+    def reset(self):
+        """
+        Volta a raquete à posição inicial, parada.
+        """
         self.rect.centerx = SCREEN_WIDTH // 2
         self.rect.bottom = SCREEN_HEIGHT - PADDLE_START_Y_OFFSET
-        self.rect.bottom = SCREEN_HEIGHT - PADDLE_START_Y_OFFSET
-        self.speed = PADDLE_SPEED
         self.current_vel_x = 0
 
     def update(self, action=None):
@@ -79,11 +146,14 @@ class Ball(pygame.sprite.Sprite):
         Inicializa a bola, definindo sua aparência e posição centralizada.
         """
         super().__init__()
-        self.image = pygame.Surface([BALL_RADIUS * 2, BALL_RADIUS * 2])
-        self.image.set_colorkey(BLACK) # Torna o fundo do surface transparente
-        pygame.draw.circle(self.image, BALL_COLOR, (BALL_RADIUS, BALL_RADIUS), BALL_RADIUS)
-        
+        self.image = shared_surface('ball')
         self.rect = self.image.get_rect()
+        self.reset()
+
+    def reset(self):
+        """
+        Centraliza a bola com as velocidades iniciais.
+        """
         self.rect.centerx = SCREEN_WIDTH // 2
         self.rect.centery = SCREEN_HEIGHT // 2
         
@@ -114,14 +184,15 @@ class Brick(pygame.sprite.Sprite):
             is_special (bool, optional): Se é um tijolo especial (ex: bônus). Padrão False.
         """
         super().__init__()
+        self.rect = pygame.Rect(x, y, BRICK_WIDTH, BRICK_HEIGHT)
+        self.reset(x, y, color, is_special)
+
+    def reset(self, x, y, color, is_special=False):
+        """
+        Reposiciona o tijolo e troca sua cor (mesmos argumentos do construtor).
+        """
         self.is_special = is_special
-        self.image = pygame.Surface([BRICK_WIDTH, BRICK_HEIGHT])
-        
-        if self.is_special:
-            self.image.fill(YELLOW) # Destaque para tijolo especial
-        else:
-            self.image.fill(color)
-            
-        self.rect = self.image.get_rect()
+        self.color = YELLOW if is_special else color # Destaque para tijolo especial
+        self.image = shared_surface('brick', self.color)
         self.rect.x = x
         self.rect.y = y
\ No newline at end of file
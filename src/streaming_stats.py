@@ -0,0 +1,310 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/streaming_stats.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Estatísticas em fluxo para avaliação sequencial de modelos.
+
+    RunningStats mantém média e variância pelo algoritmo de Welford (memória
+    constante, numericamente estável). Reservoir guarda uma amostra uniforme
+    de tamanho fixo dos valores vistos, suficiente para percentis e
+    intervalos por bootstrap. StreamingEvaluator combina os dois por métrica
+    (reward, comprimento, nível) e decide quando parar: quando o intervalo de
+    confiança da métrica alvo fica mais estreito que a largura pedida.
+    PairedComparison faz o mesmo para a diferença episódio a episódio entre
+    dois modelos avaliados nas mesmas sementes, com teste do sinal.
+-----------------------------------------------------------------------
+"""
+
+import math
+from statistics import NormalDist
+import numpy as np
+
+def z_score(confidence):
+    """
+    Quantil normal bilateral (ex: 0.95 -> 1.96).
+    """
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def sign_test(wins, losses):
+    """
+    Teste do sinal bilateral exato (empates descartados).
+
+    Returns:
+        float: p-valor de H0: vitórias e derrotas igualmente prováveis.
+    """
+    n = wins + losses
+    if n == 0:
+        return 1.0
+    k = min(wins, losses)
+    tail = sum(math.comb(n, i) for i in range(k + 1)) / 2 ** n
+    return min(1.0, 2 * tail)
+
+class RunningStats:
+    """
+    Média e variância acumuladas (Welford).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0 # Soma dos quadrados dos desvios
+
+    def update(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        """
+        Variância amostral (n - 1).
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def half_width(self, confidence=0.95):
+        """
+        Meia largura do intervalo de confiança normal da média (inf com < 2 amostras).
+        """
+        if self.count < 2:
+            return math.inf
+        return z_score(confidence) * self.std / math.sqrt(self.count)
+
+    def confidence_interval(self, confidence=0.95):
+        """
+        Returns:
+            tuple: (inferior, superior) do intervalo da média.
+        """
+        h = self.half_width(confidence)
+        return self.mean - h, self.mean + h
+
+class Reservoir:
+    """
+    Amostra uniforme de tamanho fixo de um fluxo (algoritmo R).
+    """
+
+    def __init__(self, capacity=1024, rng=None):
+        """
+        Args:
+            capacity (int): Valores mantidos.
+            rng (np.random.Generator, optional): Gerador das substituições.
+        """
+        self.capacity = capacity
+        self.rng = rng if rng is not None else np.random.default_rng(0)
+        self.data = np.zeros(capacity)
+        self.seen = 0
+
+    def add(self, x):
+        if self.seen < self.capacity:
+            self.data[self.seen] = x
+        else:
+            j = self.rng.integers(self.seen + 1)
+            if j < self.capacity:
+                self.data[j] = x
+        self.seen += 1
+
+    @property
+    def values(self):
+        """
+        View dos valores guardados.
+        """
+        return self.data[:min(self.seen, self.capacity)]
+
+    def bootstrap_ci(self, statistic=np.mean, confidence=0.95, n_resamples=2000, rng=None):
+        """
+        Intervalo percentil por bootstrap da estatística sobre o reservatório.
+
+        Com mais valores vistos que a capacidade, a reamostragem tem o tamanho
+        do reservatório, não do fluxo: a distância de cada limite à estimativa
+        pontual é reduzida por sqrt(capacidade / vistos), a escala 1/sqrt(n) do
+        erro padrão, para que o intervalo corresponda ao número real de episódios.
+
+        Returns:
+            tuple: (inferior, superior), ou (nan, nan) sem amostras.
+        """
+        values = self.values
+        if values.size == 0:
+            return math.nan, math.nan
+        rng = rng if rng is not None else np.random.default_rng(0)
+        resamples = values[rng.integers(values.size, size=(n_resamples, values.size))]
+        estimates = statistic(resamples, axis=1)
+        alpha = (1 - confidence) / 2
+        low, high = np.quantile(estimates, alpha), np.quantile(estimates, 1 - alpha)
+        if self.seen > values.size:
+            center = statistic(values)
+            scale = math.sqrt(values.size / self.seen)
+            low, high = center - (center - low) * scale, center + (high - center) * scale
+        return float(low), float(high)
+
+class StreamingEvaluator:
+    """
+    Acumula métricas por episódio e aplica a regra de parada sequencial.
+    """
+
+    METRICS = ('reward', 'length', 'level')
+
+    def __init__(self, target='reward', ci_width=None, confidence=0.95, min_episodes=30,
+                 reservoir_size=1024, seed=0):
+        """
+        Args:
+            target (str): Métrica cujo intervalo decide a parada.
+            ci_width (float, optional): Largura total do intervalo abaixo da
+                                        qual a avaliação para (None = nunca).
+            confidence (float): Nível de confiança dos intervalos.
+            min_episodes (int): Mínimo de episódios antes de parar (a
+                                aproximação normal é ruim com poucos episódios).
+            reservoir_size (int): Capacidade de cada reservatório.
+            seed (int): Semente dos reservatórios.
+        """
+        if target not in self.METRICS:
+            raise ValueError(f"Métrica alvo inválida: {target} (opções: {', '.join(self.METRICS)})")
+        self.target = target
+        self.ci_width = ci_width
+        self.confidence = confidence
+        self.min_episodes = min_episodes
+        rng = np.random.default_rng(seed)
+        self.stats = {name: RunningStats() for name in self.METRICS}
+        self.reservoirs = {name: Reservoir(reservoir_size, rng) for name in self.METRICS}
+
+    @property
+    def count(self):
+        return self.stats[self.target].count
+
+    def add(self, reward, length, level):
+        """
+        Registra um episódio concluído.
+        """
+        for name, value in zip(self.METRICS, (reward, length, level)):
+            value = float(value)
+            self.stats[name].update(value)
+            self.reservoirs[name].add(value)
+
+    def width(self, metric=None):
+        """
+        Largura atual do intervalo de confiança da métrica (padrão: alvo).
+        """
+        return 2 * self.stats[metric or self.target].half_width(self.confidence)
+
+    def converged(self):
+        """
+        True quando o intervalo da métrica alvo atingiu a largura pedida.
+        """
+        if self.ci_width is None or self.count < self.min_episodes:
+            return False
+        return self.width() <= self.ci_width
+
+    def summary(self):
+        """
+        Resumo por métrica: média, desvio, intervalo normal, intervalo por
+        bootstrap da média e mediana (estimada pelo reservatório).
+
+        Returns:
+            dict: {métrica: {mean, std, ci, bootstrap_ci, median}}
+        """
+        result = {}
+        for name in self.METRICS:
+            stats = self.stats[name]
+            values = self.reservoirs[name].values
+            result[name] = {
+                'mean': stats.mean,
+                'std': stats.std,
+                'ci': stats.confidence_interval(self.confidence),
+                'bootstrap_ci': self.reservoirs[name].bootstrap_ci(confidence=self.confidence),
+                'median': float(np.median(values)) if values.size else math.nan,
+            }
+        return result
+
+class PairedComparison:
+    """
+    Diferença pareada (novo - antigo) de uma métrica por episódio.
+
+    Com os dois modelos jogando os mesmos episódios semeados, a variância
+    comum aos episódios (lançamentos, tijolos especiais) se cancela na
+    diferença e o intervalo fica bem mais estreito que o da diferença de
+    médias independentes.
+    """
+
+    def __init__(self, ci_width=None, confidence=0.95, min_episodes=30):
+        """
+        Args:
+            ci_width (float, optional): Largura do intervalo da diferença que
+                                        encerra a avaliação (None = nunca).
+            confidence (float): Nível de confiança dos intervalos.
+            min_episodes (int): Mínimo de pares antes de parar.
+        """
+        self.ci_width = ci_width
+        self.confidence = confidence
+        self.min_episodes = min_episodes
+        self.old = RunningStats()
+        self.new = RunningStats()
+        self.diff = RunningStats()
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+
+    @property
+    def count(self):
+        return self.diff.count
+
+    def add(self, old_value, new_value):
+        """
+        Registra o par de resultados de um episódio.
+        """
+        old_value, new_value = float(old_value), float(new_value)
+        self.old.update(old_value)
+        self.new.update(new_value)
+        self.diff.update(new_value - old_value)
+        if new_value > old_value:
+            self.wins += 1
+        elif new_value < old_value:
+            self.losses += 1
+        else:
+            self.ties += 1
+
+    def unpaired_width(self):
+        """
+        Largura que o intervalo teria com episódios independentes (mesmo n).
+        """
+        if self.count < 2:
+            return math.inf
+        se = math.sqrt((self.old.variance + self.new.variance) / self.count)
+        return 2 * z_score(self.confidence) * se
+
+    def converged(self):
+        """
+        True quando o intervalo da diferença atingiu a largura pedida.
+        """
+        if self.ci_width is None or self.count < self.min_episodes:
+            return False
+        return 2 * self.diff.half_width(self.confidence) <= self.ci_width
+
+    def summary(self):
+        """
+        Returns:
+            dict: Médias, diferença média com intervalo, placar do teste do
+                  sinal e fator de redução de variância do pareamento.
+        """
+        paired_width = 2 * self.diff.half_width(self.confidence)
+        unpaired_width = self.unpaired_width()
+        return {
+            'num_episodes': self.count,
+            'confidence': self.confidence,
+            'old_mean': self.old.mean,
+            'new_mean': self.new.mean,
+            'mean_diff': self.diff.mean,
+            'std_diff': self.diff.std,
+            'diff_ci': self.diff.confidence_interval(self.confidence),
+            'wins': self.wins,
+            'losses': self.losses,
+            'ties': self.ties,
+            'sign_test_p': sign_test(self.wins, self.losses),
+            # Episódios independentes necessários para o mesmo intervalo, por par
+            'variance_reduction': (unpaired_width / paired_width) ** 2 if paired_width > 0 else math.inf,
+        }
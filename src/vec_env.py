@@ -0,0 +1,250 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/vec_env.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    VecEnv do Stable Baselines3 sobre o motor vetorizado (VecGame).
+    Substitui DummyVecEnv([BrickBreakerEnv]) no treino: cada chamada de
+    step avança todos os N jogos de uma vez, sem sprites nem renderização.
+-----------------------------------------------------------------------
+"""
+
+import time
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvWrapper
+from src.vec_game import VecGame
+from src.rl_env import OBS_LOW, OBS_HIGH
+from src.profiler import PhaseProfiler
+from src.config import PROFILE_PHASES, MAX_EPISODE_STEPS, STALL_FRAMES
+
+# Fases medidas por BrickBreakerVecEnv.step_wait
+VEC_ENGINE_PHASES = ('vec_engine_step', 'vec_infos')
+
+class BrickBreakerVecEnv(VecEnv):
+    """
+    VecEnv com N jogos Brick Breaker simulados em arrays NumPy.
+    """
+
+    def __init__(self, num_envs, seed=None, profile=PROFILE_PHASES, max_episode_steps=MAX_EPISODE_STEPS,
+                 stall_frames=STALL_FRAMES):
+        """
+        Inicializa o motor vetorizado.
+
+        Args:
+            num_envs (int): Número de jogos simulados em paralelo.
+            seed (int, optional): Semente do gerador aleatório do motor.
+            profile (bool, optional): Mede o tempo do motor e da montagem dos infos.
+            max_episode_steps (int, optional): Passos até o jogo ser truncado; 0 desliga.
+            stall_frames (int, optional): Frames sem progresso até o jogo ser
+                                          truncado; 0 desliga (ver BrickBreakerEnv).
+        """
+        # Definido antes do construtor base, que consulta get_attr("render_mode")
+        self.render_mode = None
+        self.game = VecGame(num_envs, seed=seed)
+        self.profiler = PhaseProfiler(VEC_ENGINE_PHASES) if profile else None
+        self.actions = np.zeros(num_envs, dtype=np.int64)
+        self.max_episode_steps = max_episode_steps
+        self.stall_frames = stall_frames
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+        self.frames_without_progress = np.zeros(num_envs, dtype=np.int64)
+
+        observation_space = spaces.Box(low=OBS_LOW, high=OBS_HIGH, dtype=np.float32)
+        action_space = spaces.Discrete(3)
+        super().__init__(num_envs, observation_space, action_space)
+
+    def reset(self):
+        """
+        Reinicia todos os jogos e retorna as observações iniciais.
+        """
+        # Semente definida via VecEnv.seed() vale para o próximo reset
+        if self._seeds[0] is not None:
+            self.game.seed(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+
+        self.game.reset()
+        self.elapsed_steps[:] = 0
+        self.frames_without_progress[:] = 0
+        return self.game.get_state()
+
+    def step_async(self, actions):
+        """
+        Armazena as ações para o próximo step_wait.
+        """
+        self.actions = actions
+
+    def step_wait(self):
+        """
+        Avança todos os jogos e reinicia automaticamente os que terminaram.
+
+        As observações devolvidas são o buffer VecGame.state, reescrito no
+        passo seguinte (como a pilha do VecFrameStack); as observações
+        terminais em infos são cópias.
+        """
+        prof = self.profiler
+        game = self.game
+        if prof is not None:
+            start = time.perf_counter_ns()
+        progress = (game.score.copy(), game.paddle_hits.copy(), game.lives.copy())
+        obs, rewards, dones = game.step(self.actions)
+        if prof is not None:
+            mid = time.perf_counter_ns()
+            prof.record(0, mid - start)
+        infos = self.game_infos()
+        if prof is not None:
+            prof.record(1, time.perf_counter_ns() - mid)
+
+        # Limites de episódio, como no BrickBreakerEnv (1 frame por passo)
+        self.elapsed_steps += 1
+        progressed = (game.score != progress[0]) | (game.paddle_hits != progress[1]) | (game.lives != progress[2])
+        self.frames_without_progress += 1
+        self.frames_without_progress[progressed] = 0
+        time_limit = self.elapsed_steps >= self.max_episode_steps if self.max_episode_steps else False
+        stalled = self.frames_without_progress >= self.stall_frames if self.stall_frames else False
+        truncated = (time_limit | stalled) & ~dones
+        if truncated.any():
+            for i in np.flatnonzero(truncated):
+                infos[i]["TimeLimit.truncated"] = True
+                timed_out = self.max_episode_steps and self.elapsed_steps[i] >= self.max_episode_steps
+                infos[i]["truncation_reason"] = 'time_limit' if timed_out else 'stall'
+            dones = dones | truncated
+
+        if dones.any():
+            done_idx = np.flatnonzero(dones)
+            for i in done_idx:
+                infos[i]["terminal_observation"] = obs[i].copy()
+            game.reset(dones)
+            self.elapsed_steps[done_idx] = 0
+            self.frames_without_progress[done_idx] = 0
+            # obs é o buffer game.state: só as linhas reiniciadas são recalculadas
+            game.get_state(done_idx)
+
+        return obs, rewards, dones, infos
+
+    def game_infos(self):
+        """
+        Diagnósticos escalares por jogo, com as mesmas chaves do info de
+        BrickBreakerEnv (level, score, lives, bricks_left, paddle_hits, stop,
+        episode_seed). Os jogos compartilham um gerador, então não há semente
+        por episódio (episode_seed é sempre None).
+        """
+        game = self.game
+        bricks_left = game.bricks.sum(axis=(1, 2))
+        return [
+            {
+                "level": int(level),
+                "score": int(score),
+                "lives": int(lives),
+                "bricks_left": int(left),
+                "paddle_hits": int(hits),
+                "stop": False,
+                "episode_seed": None,
+            }
+            for level, score, lives, left, hits in zip(
+                game.level, game.score, game.lives, bricks_left, game.paddle_hits
+            )
+        ]
+
+    def profile_export(self, reset=True):
+        """
+        Acumuladores do profiler (ou None se desligado), como em
+        BrickBreakerEnv.profile_export.
+        """
+        if self.profiler is None:
+            return None
+        return self.profiler.export(reset=reset)
+
+    def get_rng_state(self):
+        """
+        Estado do gerador do motor (único, compartilhado por todos os jogos).
+        """
+        return self.game.rng.bit_generator.state
+
+    def set_rng_state(self, state):
+        """
+        Restaura o estado salvo por get_rng_state.
+        """
+        self.game.rng.bit_generator.state = state
+
+    def close(self):
+        """
+        Nenhum recurso externo a liberar.
+        """
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        """
+        Retorna um atributo por jogo. Arrays do motor (ex: 'level', 'score')
+        são fatiados por jogo; demais atributos vêm do próprio VecEnv.
+        """
+        indices = self._get_indices(indices)
+        value = getattr(self.game, attr_name, None)
+        if isinstance(value, np.ndarray) and value.shape[:1] == (self.num_envs,):
+            return [value[i] for i in indices]
+        value = getattr(self, attr_name)
+        return [value for _ in indices]
+
+    def set_attr(self, attr_name, value, indices=None):
+        """
+        Define um atributo do VecEnv (compartilhado por todos os jogos, logo
+        indices deve selecionar todos eles).
+        """
+        self._check_all_indices(indices)
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        """
+        Invoca um método do motor vetorizado (ou, se o motor não o possuir, do
+        próprio VecEnv, ex: 'profile_export') uma única vez; o mesmo resultado
+        é repetido para cada jogo. Como a chamada vale para todos os jogos,
+        indices deve selecionar todos eles.
+        """
+        indices = self._check_all_indices(indices)
+        target = self.game if hasattr(self.game, method_name) else self
+        method = getattr(target, method_name)
+        result = method(*method_args, **method_kwargs)
+        return [result for _ in indices]
+
+    def _check_all_indices(self, indices):
+        """
+        Rejeita seleções parciais de jogos em operações que não podem ser
+        aplicadas a um jogo isolado (estado e métodos são do motor inteiro).
+        """
+        indices = self._get_indices(indices)
+        if sorted(indices) != list(range(self.num_envs)):
+            raise ValueError("BrickBreakerVecEnv não aplica set_attr/env_method a jogos "
+                             "individuais; use indices=None")
+        return indices
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        """
+        Os jogos não são ambientes Gymnasium, logo nunca estão embrulhados.
+        """
+        return [False for _ in self._get_indices(indices)]
+
+
+class ProfiledVecEnv(VecEnvWrapper):
+    """
+    Wrapper externo que mede a latência de cada step de toda a pilha abaixo
+    dele (VecNormalize, VecFrameStack, workers), de step_async a step_wait.
+    """
+
+    def __init__(self, venv):
+        super().__init__(venv)
+        self.profiler = PhaseProfiler(('vec_step',))
+        self.step_start = 0
+
+    def reset(self):
+        return self.venv.reset()
+
+    def step_async(self, actions):
+        self.step_start = time.perf_counter_ns()
+        self.venv.step_async(actions)
+
+    def step_wait(self):
+        result = self.venv.step_wait()
+        self.profiler.record(0, time.perf_counter_ns() - self.step_start)
+        return result
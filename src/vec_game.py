@@ -0,0 +1,289 @@
+"""
+-----------------------------------------------------------------------
+Arquivo: src/vec_game.py
+Data: 17/10/2026
+Versão: 1.0
+Autor: Renato Gritti
+Descrição:
+    Motor vetorizado do Brick Breaker. Mantém N jogos como arrays NumPy
+    (structure-of-arrays) e avança todos em uma única chamada, reproduzindo
+    a física e o reward shaping de Game.step sem sprites nem pygame.
+-----------------------------------------------------------------------
+"""
+
+import numpy as np
+from src.config import *
+
+# Geometria fixa derivada do config (equivalente aos Rects dos sprites)
+BALL_SIZE = BALL_RADIUS * 2
+PADDLE_TOP = SCREEN_HEIGHT - PADDLE_START_Y_OFFSET - PADDLE_HEIGHT
+PADDLE_START_X = SCREEN_WIDTH // 2 - PADDLE_WIDTH // 2
+OBS_DIM = 10
+
+
+def _round_rect(values):
+    """
+    Arredonda como o pygame.Rect ao receber floats (metade para longe do zero).
+    """
+    return np.trunc(values + np.copysign(0.5, values))
+
+
+class VecGame:
+    """
+    Gerencia N jogos Brick Breaker simultâneos em arrays NumPy.
+
+    Cada jogo possui uma bola, uma raquete e uma matriz de tijolos
+    BRICK_ROWS x BRICK_COLS. As posições seguem a convenção do pygame.Rect
+    (canto superior esquerdo, valores inteiros).
+    """
+
+    def __init__(self, num_games, seed=None):
+        """
+        Aloca o estado de todos os jogos e inicia cada um no nível 1.
+
+        Args:
+            num_games (int): Número de jogos simulados em paralelo.
+            seed (int, optional): Semente do gerador aleatório do motor.
+        """
+        self.num_games = num_games
+        self.rng = np.random.default_rng(seed)
+
+        # Posição (canto superior esquerdo) de cada coluna/linha de tijolos
+        self.brick_x = np.arange(BRICK_COLS) * (BRICK_WIDTH + BRICK_GAP) + BRICK_OFFSET_LEFT
+        self.brick_y = np.arange(BRICK_ROWS) * (BRICK_HEIGHT + BRICK_GAP) + BRICK_OFFSET_TOP
+
+        # Raquete
+        self.paddle_x = np.zeros(num_games)
+        self.paddle_vel_x = np.zeros(num_games)
+
+        # Bola
+        self.ball_x = np.zeros(num_games)
+        self.ball_y = np.zeros(num_games)
+        self.ball_speed_x = np.zeros(num_games)
+        self.ball_speed_y = np.zeros(num_games)
+
+        # Tijolos (True = vivo) e marcação de tijolos especiais
+        self.bricks = np.zeros((num_games, BRICK_ROWS, BRICK_COLS), dtype=bool)
+        self.special = np.zeros((num_games, BRICK_ROWS, BRICK_COLS), dtype=bool)
+
+        # Placar
+        self.score = np.zeros(num_games, dtype=np.int64)
+        self.lives = np.zeros(num_games, dtype=np.int64)
+        self.level = np.zeros(num_games, dtype=np.int64)
+        self.paddle_hits = np.zeros(num_games, dtype=np.int64)
+
+        # Observações (N, OBS_DIM), reescritas no lugar por get_state
+        self.state = np.zeros((num_games, OBS_DIM), dtype=np.float32)
+
+        self.reset()
+
+    def seed(self, seed=None):
+        """
+        Reinicia o gerador aleatório do motor.
+        """
+        self.rng = np.random.default_rng(seed)
+
+    def reset(self, mask=None):
+        """
+        Reinicia os jogos selecionados (Score 0, Vidas 3, Nível 1).
+
+        Args:
+            mask (np.ndarray, optional): Máscara booleana dos jogos a reiniciar.
+                                         None reinicia todos.
+        """
+        idx = np.arange(self.num_games) if mask is None else np.flatnonzero(mask)
+        if idx.size == 0:
+            return
+
+        self.score[idx] = 0
+        self.lives[idx] = 3
+        self.level[idx] = 1
+        self.paddle_hits[idx] = 0
+        self.paddle_x[idx] = PADDLE_START_X
+        self.paddle_vel_x[idx] = 0
+
+        self.create_bricks(idx)
+        self.reset_ball(idx)
+
+    def reset_ball(self, idx):
+        """
+        Reposiciona a bola sobre a raquete com offset, direção e velocidade
+        aleatórios, com o mesmo sorteio de Game.reset_ball.
+        """
+        n = idx.size
+        max_offset = (PADDLE_WIDTH // 2) - BALL_RADIUS
+        random_offset = self.rng.integers(-max_offset, max_offset + 1, size=n)
+
+        self.ball_x[idx] = self.paddle_x[idx] + PADDLE_WIDTH // 2 + random_offset - BALL_RADIUS
+        self.ball_y[idx] = PADDLE_TOP - BALL_SIZE
+
+        speed_multiplier = 1 + (self.level[idx] - 1) * BALL_SPEED_INCREASE
+        direction_x = self.rng.choice([-1, 1], size=n)
+        random_speed_x = self.rng.uniform(BALL_RANDOM_SPEED_MIN, BALL_RANDOM_SPEED_MAX, size=n)
+
+        self.ball_speed_x[idx] = random_speed_x * speed_multiplier * direction_x
+        self.ball_speed_y[idx] = BALL_SPEED_Y_INITIAL * speed_multiplier
+
+    def create_bricks(self, idx):
+        """
+        Preenche a matriz de tijolos dos jogos selecionados para o nível atual.
+        """
+        self.bricks[idx] = True
+        roll = self.rng.random((idx.size, BRICK_ROWS, BRICK_COLS)) < SPECIAL_BRICK_CHANCE
+        self.special[idx] = roll & (self.level[idx] >= 2)[:, None, None]
+
+    def step(self, actions):
+        """
+        Avança todos os jogos em um frame.
+
+        Jogos que perdem a última vida ficam com lives == 0 e são sinalizados
+        em done; o reinício fica a cargo de quem chama (reset(mask)).
+
+        Args:
+            actions (np.ndarray): Ação de cada jogo (0=Ficar, 1=Esquerda, 2=Direita).
+
+        Returns:
+            tuple: (estados (N, 10) float32, recompensas (N,), done (N,) bool)
+        """
+        actions = np.asarray(actions).reshape(self.num_games)
+        prev_score = self.score.copy()
+        prev_lives = self.lives.copy()
+
+        # Raquete
+        dx = np.where(actions == 1, -PADDLE_SPEED, np.where(actions == 2, PADDLE_SPEED, 0))
+        self.paddle_x = np.clip(self.paddle_x + dx, 0, SCREEN_WIDTH - PADDLE_WIDTH)
+        self.paddle_vel_x = dx.astype(np.float64)
+
+        # Bola (somente jogos em andamento)
+        active = self.lives > 0
+        bx = np.where(active, _round_rect(self.ball_x + self.ball_speed_x), self.ball_x)
+        by = np.where(active, _round_rect(self.ball_y + self.ball_speed_y), self.ball_y)
+        vx = self.ball_speed_x
+        vy = self.ball_speed_y
+
+        # Paredes Laterais e Teto
+        hit_wall = active & ((bx <= 0) | (bx + BALL_SIZE >= SCREEN_WIDTH))
+        vx = np.where(hit_wall, -vx, vx)
+        hit_ceiling = active & (by <= 0)
+        vy = np.where(hit_ceiling, -vy, vy)
+
+        # Raquete (mesma deflexão, momento e aceleração de Game.check_collisions)
+        hit_paddle = (active
+                      & (bx < self.paddle_x + PADDLE_WIDTH) & (bx + BALL_SIZE > self.paddle_x)
+                      & (by < PADDLE_TOP + PADDLE_HEIGHT) & (by + BALL_SIZE > PADDLE_TOP))
+        if hit_paddle.any():
+            relative_intersect_x = (self.paddle_x + PADDLE_WIDTH // 2) - (bx + BALL_RADIUS)
+            normalized_relative_intersection_x = relative_intersect_x / (PADDLE_WIDTH / 2)
+
+            bounce_factor = 5.0
+            new_vx = -normalized_relative_intersection_x * bounce_factor
+            new_vx = new_vx + self.paddle_vel_x * 0.3
+            new_vy = -vy
+
+            current_speed = np.sqrt(new_vx**2 + new_vy**2)
+            new_speed = np.minimum(current_speed * 1.05, 12.0)
+            speed_ratio = new_speed / current_speed
+            new_vx = new_vx * speed_ratio
+            new_vy = new_vy * speed_ratio
+
+            min_speed_y = 3.0
+            new_vy = np.where(np.abs(new_vy) < min_speed_y,
+                              np.where(new_vy < 0, -min_speed_y, min_speed_y), new_vy)
+
+            vx = np.where(hit_paddle, new_vx, vx)
+            vy = np.where(hit_paddle, new_vy, vy)
+            by = np.where(hit_paddle, PADDLE_TOP - BALL_SIZE, by)
+            self.paddle_hits += hit_paddle
+
+        # Tijolos: sobreposição da bola com cada linha/coluna da grade
+        row_overlap = (by[:, None] < self.brick_y + BRICK_HEIGHT) & (by[:, None] + BALL_SIZE > self.brick_y)
+        col_overlap = (bx[:, None] < self.brick_x + BRICK_WIDTH) & (bx[:, None] + BALL_SIZE > self.brick_x)
+        hits = self.bricks & row_overlap[:, :, None] & col_overlap[:, None, :]
+        hit_brick = active & hits.any(axis=(1, 2))
+        self.bricks &= ~(hits & active[:, None, None])
+        self.score += 10 * hit_brick
+        vy = np.where(hit_brick, -vy, vy)
+
+        self.ball_x, self.ball_y = bx, by
+        self.ball_speed_x, self.ball_speed_y = vx, vy
+
+        # Nível Concluído
+        level_complete = active & ~self.bricks.any(axis=(1, 2))
+        # Chão (Perde Vida), avaliado na posição da bola antes de qualquer reinício
+        fell = active & (by > SCREEN_HEIGHT)
+
+        if level_complete.any():
+            idx = np.flatnonzero(level_complete)
+            self.level[idx] += 1
+            self.create_bricks(idx)
+            self.reset_ball(idx)
+
+        if fell.any():
+            self.lives -= fell
+            respawn = fell & (self.lives > 0)
+            if respawn.any():
+                self.reset_ball(np.flatnonzero(respawn))
+
+        # Cálculo da Recompensa (mesma ordem de Game.step)
+        dist_x = np.abs((self.paddle_x + PADDLE_WIDTH // 2) - (self.ball_x + BALL_RADIUS))
+        norm_dist = dist_x / SCREEN_WIDTH
+        reward = np.where(self.ball_speed_y > 0, REWARD_TRACKING_FACTOR * (1.0 - norm_dist), 0.0)
+        reward = reward + np.where(self.score > prev_score, REWARD_HIT_BRICK, 0)
+        reward = reward + np.where(hit_paddle, REWARD_HIT_PADDLE, 0)
+        reward = reward + np.where(self.lives < prev_lives, REWARD_LOSE_LIFE, 0)
+
+        done = self.lives == 0
+
+        return self.get_state(), reward.astype(np.float32), done
+
+    def get_state(self, rows=None):
+        """
+        Constrói os vetores de observação dos jogos, no mesmo layout de
+        Game.get_state, no buffer preallocado self.state.
+
+        O array devolvido é sempre self.state, sobrescrito pela próxima
+        chamada; copie-o se precisar guardá-lo.
+
+        Args:
+            rows (np.ndarray, optional): Índices dos jogos a recalcular (ex: os
+                                         reiniciados); None recalcula todos.
+
+        Returns:
+            np.array: Matriz (N, 10) float32 (self.state).
+        """
+        if rows is None:
+            self.write_state(self.state, slice(None))
+        else:
+            self.state[rows] = self.write_state(np.empty((len(rows), OBS_DIM), dtype=np.float32), rows)
+        return self.state
+
+    def write_state(self, out, idx):
+        """
+        Escreve, coluna a coluna, as observações dos jogos idx em out.
+        """
+        paddle_cx = self.paddle_x[idx] + PADDLE_WIDTH // 2
+        ball_cx = self.ball_x[idx] + BALL_RADIUS
+        ball_cy = self.ball_y[idx] + BALL_RADIUS
+        speed_x = self.ball_speed_x[idx]
+        speed_y = self.ball_speed_y[idx]
+
+        max_speed = 20.0
+        np.divide(paddle_cx, SCREEN_WIDTH, out=out[:, 0])
+        np.divide(ball_cx, SCREEN_WIDTH, out=out[:, 1])
+        np.divide(ball_cy, SCREEN_HEIGHT, out=out[:, 2])
+        np.divide(speed_x, max_speed, out=out[:, 3])
+        np.divide(speed_y, max_speed, out=out[:, 4])
+        np.divide(ball_cx - paddle_cx, SCREEN_WIDTH, out=out[:, 5])
+        np.divide(self.paddle_vel_x[idx], PADDLE_SPEED, out=out[:, 6])
+        np.greater(speed_y, 0, out=out[:, 9], casting='unsafe')
+
+        # Posição X prevista da bola na altura da raquete (b_x se parada na vertical)
+        moving = np.abs(speed_y) > 0.1
+        t_to_paddle = (PADDLE_TOP - ball_cy) / np.where(moving, speed_y, 1.0)
+        future_ball_x = np.clip(ball_cx + speed_x * t_to_paddle, 0, SCREEN_WIDTH)
+        future_ball_x /= SCREEN_WIDTH
+        np.copyto(out[:, 7], np.where(moving, future_ball_x, ball_cx / SCREEN_WIDTH), casting='same_kind')
+
+        np.abs(paddle_cx - ball_cx, out=paddle_cx)
+        np.divide(paddle_cx, SCREEN_WIDTH, out=out[:, 8])
+        return out
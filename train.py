@@ -11,17 +11,27 @@ Descrição:
 """
 
 import os
+import time
+import pickle
 import shutil
+from fractions import Fraction
 from stable_baselines3 import DQN
 from stable_baselines3.common.callbacks import BaseCallback
-from stable_baselines3.common.vec_env import DummyVecEnv, VecFrameStack, VecNormalize
+from stable_baselines3.common.utils import set_random_seed
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecFrameStack, VecNormalize
 from src.rl_env import BrickBreakerEnv
+from src.profiler import PhaseProfiler
+from src.checkpoint import (
+    CheckpointWriter, latest_checkpoint, load_replay_buffer, restore_rng_state,
+    MODEL_FILE, VEC_NORMALIZE_FILE, REPLAY_BUFFER_FILE, RNG_FILE
+)
 from src.config import (
     MODEL_PATH, 
     LOGS_DIR, 
     TOTAL_TIMESTEPS, 
     LEARNING_RATE, 
     BUFFER_SIZE,
+    FRAME_STACK_BUFFER,
     LEARNING_STARTS,
     BATCH_SIZE,
     TAU,
@@ -32,7 +42,18 @@ from src.config import (
     EXPLORATION_FRACTION,
     EXPLORATION_INITIAL_EPS,
     EXPLORATION_FINAL_EPS,
-    NET_ARCH
+    NET_ARCH,
+    USE_VEC_ENGINE,
+    VEC_ENGINE_NUM_ENVS,
+    NUM_WORKERS,
+    TRAIN_SEED,
+    OBS_TYPE,
+    PIXEL_OBS_STACK,
+    PROFILE_PHASES,
+    PROFILE_LOG_FREQ,
+    CHECKPOINT_DIR,
+    CHECKPOINT_FREQ,
+    CHECKPOINT_KEEP
 )
 
 class KeyboardInterruptCallback(BaseCallback):
@@ -43,71 +64,286 @@ class KeyboardInterruptCallback(BaseCallback):
         super(KeyboardInterruptCallback, self).__init__(verbose)
 
     def _on_step(self) -> bool:
-        # Acessa a instância do jogo via get_attr (compatível com VecEnv Wrappers)
-        try:
-            games = self.training_env.get_attr("game")
-            if games and not games[0].running:
-                print("\nInterrupção detectada ('q' pressionado). Parando treinamento...")
-                return False
-        except Exception as e:
-            # Em caso de erro ao acessar, não interrompe, apenas loga se verbose
-            if self.verbose > 0:
-                print(f"Erro ao verificar estado do jogo: {e}")
+        # Usa a flag 'stop' do info de cada ambiente (sem serializar o Game via get_attr)
+        infos = self.locals.get("infos", [])
+        if any(info.get("stop", False) for info in infos):
+            print("\nInterrupção detectada ('q' pressionado). Parando treinamento...")
+            return False
         return True
 
-def train():
+class ProfilingCallback(BaseCallback):
+    """
+    Registra no TensorBoard o tempo por fase (profile/<fase>/...): fases do
+    Game e do ambiente (coletadas dos workers via env_method), latência da
+    pilha de VecEnvs e a divisão entre coleta de rollout e treino da rede.
+    """
+    def __init__(self, vec_profiler=None, log_freq=PROFILE_LOG_FREQ, verbose=0):
+        """
+        Args:
+            vec_profiler (PhaseProfiler, optional): Profiler de um ProfiledVecEnv.
+            log_freq (int): Intervalo, em chamadas de step, entre registros.
+        """
+        super(ProfilingCallback, self).__init__(verbose)
+        self.vec_profiler = vec_profiler
+        self.log_freq = log_freq
+        self.profiler = PhaseProfiler(('rollout', 'train'))
+        self.rollout_start = None
+        self.rollout_end = None
+
+    def _on_rollout_start(self) -> None:
+        self.rollout_start = time.perf_counter_ns()
+        # O treino da rede acontece entre o fim de um rollout e o início do próximo
+        if self.rollout_end is not None:
+            self.profiler.record(1, self.rollout_start - self.rollout_end)
+
+    def _on_rollout_end(self) -> None:
+        self.rollout_end = time.perf_counter_ns()
+        self.profiler.record(0, self.rollout_end - self.rollout_start)
+
+    def _on_step(self) -> bool:
+        if self.n_calls % self.log_freq == 0:
+            self.log_profile()
+        return True
+
+    def log_profile(self):
+        """
+        Agrega os profilers de todas as camadas e grava os resumos no logger.
+        """
+        merged = PhaseProfiler(())
+        merged.merge(self.profiler.export())
+        if self.vec_profiler is not None:
+            merged.merge(self.vec_profiler.export())
+        # O motor vetorizado executa o método uma vez e repete o mesmo objeto
+        # para todos os índices (ver BrickBreakerVecEnv.env_method)
+        seen = set()
+        for data in self.training_env.env_method("profile_export"):
+            if data is not None and id(data) not in seen:
+                seen.add(id(data))
+                merged.merge(data)
+
+        for phase, stats in merged.summary().items():
+            for key, value in stats.items():
+                self.logger.record(f"profile/{phase}/{key}", value)
+
+class CheckpointCallback(BaseCallback):
+    """
+    Grava checkpoints periódicos (modelo, VecNormalize, replay buffer e RNGs)
+    em segundo plano, via src.checkpoint.CheckpointWriter.
+    """
+    def __init__(self, vec_normalize, save_freq=CHECKPOINT_FREQ, directory=CHECKPOINT_DIR,
+                 keep=CHECKPOINT_KEEP, verbose=0):
+        """
+        Args:
+            vec_normalize (VecNormalize): Wrapper cujas estatísticas são salvas.
+            save_freq (int): Intervalo, em timesteps, entre checkpoints.
+            directory (str): Diretório dos checkpoints.
+            keep (int): Checkpoints mais recentes mantidos (>= 1).
+        """
+        super(CheckpointCallback, self).__init__(verbose)
+        self.vec_normalize = vec_normalize
+        self.save_freq = save_freq
+        self.writer = CheckpointWriter(directory, keep=keep)
+        self.last_saved = 0
+
+    def _on_training_start(self) -> None:
+        # Em um resume, a contagem continua do checkpoint carregado
+        self.last_saved = self.num_timesteps
+
+    def _on_rollout_start(self) -> None:
+        # Entre rollouts o estado é consistente: transições contadas já estão no
+        # buffer e os passos de gradiente do rollout anterior já foram aplicados
+        if self.num_timesteps - self.last_saved >= self.save_freq:
+            self.writer.save(self.model, self.vec_normalize)
+            self.last_saved = self.num_timesteps
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_training_end(self) -> None:
+        self.writer.close()
+
+def make_env(rank, seed=0):
+    """
+    Cria a fábrica de um worker de ambiente com semente derivada.
+
+    Args:
+        rank (int): Índice do worker.
+        seed (int): Semente base; o worker usa seed + rank.
+
+    Returns:
+        callable: Função que constrói o ambiente (executada no processo do worker).
+    """
+    def _init():
+        set_random_seed(seed + rank)
+        env = BrickBreakerEnv(profile=PROFILE_PHASES)
+        env.reset(seed=seed + rank)
+        return env
+    return _init
+
+def scaled_train_freq(n_envs):
+    """
+    Ajusta train_freq e gradient_steps ao número de ambientes paralelos.
+
+    No SB3, train_freq conta chamadas de env.step, e cada chamada gera n_envs
+    transições. A escala preserva exatamente a razão gradient_steps /
+    transições de GRADIENT_STEPS / TRAIN_FREQ configurada para um único
+    ambiente: a fração reduzida de passos de gradiente por chamada dá os dois
+    valores (ex: TRAIN_FREQ=4 com 3 ambientes treina 3 passos a cada 4 chamadas).
+
+    Returns:
+        tuple: (train_freq, gradient_steps)
+    """
+    steps_per_call = Fraction(GRADIENT_STEPS * n_envs, TRAIN_FREQ)
+    return steps_per_call.denominator, steps_per_call.numerator
+
+def train(resume=False):
     """
     Configura e executa o loop de treinamento.
+
+    Args:
+        resume (bool): Continua do checkpoint mais recente em CHECKPOINT_DIR,
+                       com os mesmos contadores de timesteps e a mesma
+                       posição do schedule de exploração.
     """
+    checkpoint = None
+    if resume:
+        checkpoint = latest_checkpoint(CHECKPOINT_DIR)
+        if checkpoint is None:
+            raise FileNotFoundError(f"Nenhum checkpoint encontrado em {CHECKPOINT_DIR}")
+        print(f"Retomando do checkpoint {checkpoint}...")
+
     # Garante que diretórios existam
     os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
     os.makedirs(LOGS_DIR, exist_ok=True)
 
     # Create vectorized environment for wrappers
-    env = DummyVecEnv([lambda: BrickBreakerEnv()])
-    env = VecFrameStack(env, n_stack=4)
-    env = VecNormalize(env, norm_obs=True, norm_reward=False, clip_obs=10.0)
+    if USE_VEC_ENGINE:
+        # Motor NumPy: N jogos avançados por chamada em um único processo
+        from src.vec_env import BrickBreakerVecEnv
+        env = BrickBreakerVecEnv(VEC_ENGINE_NUM_ENVS, profile=PROFILE_PHASES)
+    elif NUM_WORKERS > 1:
+        # Um processo por worker, cada um com semente própria
+        env = SubprocVecEnv([make_env(i, TRAIN_SEED) for i in range(NUM_WORKERS)])
+    else:
+        env = DummyVecEnv([make_env(0, TRAIN_SEED)])
+    if OBS_TYPE == 'pixels':
+        # Frames já são empilhados pelo ambiente; imagens uint8 não são normalizadas
+        if checkpoint is None:
+            env = VecNormalize(env, norm_obs=False, norm_reward=False)
+        policy = "CnnPolicy"
+        # A pilha do ambiente começa com o primeiro frame repetido
+        buffer_kwargs = dict(n_stack=PIXEL_OBS_STACK, padding="repeat")
+    else:
+        env = VecFrameStack(env, n_stack=4)
+        if checkpoint is None:
+            env = VecNormalize(env, norm_obs=True, norm_reward=False, clip_obs=10.0)
+        policy = "MlpPolicy"
+        # VecFrameStack completa a pilha com zeros no início do episódio
+        buffer_kwargs = dict(n_stack=4, padding="zeros")
+    if checkpoint is not None:
+        # Estatísticas de normalização do checkpoint (continuam sendo atualizadas)
+        env = VecNormalize.load(os.path.join(checkpoint, VEC_NORMALIZE_FILE), env)
+
+    # Replay buffer com frames únicos: as pilhas são remontadas na amostragem
+    buffer_class = None
+    if FRAME_STACK_BUFFER:
+        from src.replay_buffer import FrameStackReplayBuffer
+        buffer_class = FrameStackReplayBuffer
+    else:
+        buffer_kwargs = None
+
+    # O DQN recebe o wrapper de profiling por fora; env continua sendo o
+    # VecNormalize, salvo ao final
+    vec_profiler = None
+    model_env = env
+    if PROFILE_PHASES:
+        from src.vec_env import ProfiledVecEnv
+        model_env = ProfiledVecEnv(env)
+        vec_profiler = model_env.profiler
     
-    # Limpa modelo antigo se existir (para garantir nova arquitetura)
-    if os.path.exists(f"{MODEL_PATH}.zip"):
-        print("Removendo modelo antigo para iniciar novo treinamento...")
-        os.remove(f"{MODEL_PATH}.zip")
-
-    print("Criando novo modelo DQN com arquitetura personalizada...")
-    # NOTA: Este é DQN Vanilla (Stable-Baselines3 não suporta Dueling DQN nativamente)
-    # Para upgrade futuro, considerar QRDQN do sb3-contrib (Distributional RL)
-    # Instalação: pip install sb3-contrib
-    # Uso: from sb3_contrib import QRDQN
-    model = DQN(
-        "MlpPolicy", 
-        env, 
-        verbose=1, 
-        learning_rate=LEARNING_RATE,
-        buffer_size=BUFFER_SIZE,
-        learning_starts=LEARNING_STARTS,
-        batch_size=BATCH_SIZE,
-        tau=TAU,
-        gamma=GAMMA,
-        train_freq=TRAIN_FREQ,
-        gradient_steps=GRADIENT_STEPS,
-        target_update_interval=TARGET_UPDATE_INTERVAL,
-        exploration_fraction=EXPLORATION_FRACTION,
-        exploration_initial_eps=EXPLORATION_INITIAL_EPS,
-        exploration_final_eps=EXPLORATION_FINAL_EPS,
-        policy_kwargs=dict(net_arch=NET_ARCH),
-        tensorboard_log=LOGS_DIR
-    )
-
-    callback = KeyboardInterruptCallback()
-
-    print("Iniciando treinamento... Pressione 'q' na janela do jogo para salvar e sair.")
+    train_freq, gradient_steps = scaled_train_freq(env.num_envs)
+
+    if checkpoint is not None:
+        # Hiperparâmetros, contadores e schedules vêm do próprio checkpoint. O buffer
+        # alocado pelo load é mínimo: é substituído em seguida pelo do checkpoint
+        model = DQN.load(os.path.join(checkpoint, MODEL_FILE), env=model_env, buffer_size=env.num_envs)
+        load_replay_buffer(model, os.path.join(checkpoint, REPLAY_BUFFER_FILE))
+        if model.replay_buffer.n_envs != env.num_envs:
+            raise ValueError(f"Checkpoint com {model.replay_buffer.n_envs} ambientes; "
+                             f"o treino atual tem {env.num_envs}")
+        with open(os.path.join(checkpoint, RNG_FILE), 'rb') as f:
+            restore_rng_state(pickle.load(f), model)
+        # Os episódios em andamento não são salvos: o learn reinicia os ambientes
+        model._last_obs = None
+        print(f"Timesteps já treinados: {model.num_timesteps} "
+              f"(exploração atual: {model.exploration_rate:.3f})")
+    else:
+        # Limpa modelo antigo se existir (para garantir nova arquitetura)
+        if os.path.exists(f"{MODEL_PATH}.zip"):
+            print("Removendo modelo antigo para iniciar novo treinamento...")
+            os.remove(f"{MODEL_PATH}.zip")
+
+        print("Criando novo modelo DQN com arquitetura personalizada...")
+        print(f"Ambientes paralelos: {env.num_envs} (train_freq={train_freq}, gradient_steps={gradient_steps})")
+        # NOTA: Este é DQN Vanilla (Stable-Baselines3 não suporta Dueling DQN nativamente)
+        # Para upgrade futuro, considerar QRDQN do sb3-contrib (Distributional RL)
+        # Instalação: pip install sb3-contrib
+        # Uso: from sb3_contrib import QRDQN
+        model = DQN(
+            policy, 
+            model_env, 
+            verbose=1, 
+            learning_rate=LEARNING_RATE,
+            buffer_size=BUFFER_SIZE,
+            replay_buffer_class=buffer_class,
+            replay_buffer_kwargs=buffer_kwargs,
+            learning_starts=LEARNING_STARTS,
+            batch_size=BATCH_SIZE,
+            tau=TAU,
+            gamma=GAMMA,
+            train_freq=train_freq,
+            gradient_steps=gradient_steps,
+            target_update_interval=TARGET_UPDATE_INTERVAL,
+            exploration_fraction=EXPLORATION_FRACTION,
+            exploration_initial_eps=EXPLORATION_INITIAL_EPS,
+            exploration_final_eps=EXPLORATION_FINAL_EPS,
+            policy_kwargs=dict(net_arch=NET_ARCH),
+            tensorboard_log=LOGS_DIR,
+            seed=TRAIN_SEED
+        )
+
+    callback = [KeyboardInterruptCallback()]
+    if PROFILE_PHASES:
+        callback.append(ProfilingCallback(vec_profiler))
+    checkpoint_callback = None
+    if CHECKPOINT_FREQ > 0:
+        checkpoint_callback = CheckpointCallback(env)
+        callback.append(checkpoint_callback)
+
+    print("Iniciando treinamento (headless)... Pressione Ctrl+C para salvar e sair.")
     print("Nota: O agente buscará ativamente a bola (Reward Shaping ativo).")
     
     try:
-        model.learn(total_timesteps=TOTAL_TIMESTEPS, callback=callback, progress_bar=True)
+        # Sem reset dos contadores, o SB3 soma num_timesteps ao total: o schedule
+        # de exploração continua relativo a TOTAL_TIMESTEPS
+        model.learn(
+            total_timesteps=TOTAL_TIMESTEPS - model.num_timesteps,
+            callback=callback,
+            progress_bar=True,
+            reset_num_timesteps=checkpoint is None
+        )
     except KeyboardInterrupt:
         pass
     finally:
+        # Ctrl+C interrompe o learn sem _on_training_end: a gravação de checkpoint em
+        # andamento é concluída aqui, e um erro dela é propagado depois de salvar o modelo
+        checkpoint_error = None
+        if checkpoint_callback is not None:
+            try:
+                checkpoint_callback.writer.close()
+            except Exception as error:
+                checkpoint_error = error
+
         print(f"Salvando modelo em {MODEL_PATH}...")
         model.save(MODEL_PATH)
         
@@ -116,8 +352,17 @@ def train():
         print(f"Salvando estatísticas de normalização em {stats_path}...")
         env.save(stats_path)
         
-        env.close()
+        model_env.close()
+        if checkpoint_error is not None:
+            raise checkpoint_error
         print("Concluído.")
 
 if __name__ == "__main__":
-    train()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Treina o agente DQN')
+    parser.add_argument('--resume', action='store_true',
+                       help=f'Continua do checkpoint mais recente em {CHECKPOINT_DIR}')
+
+    args = parser.parse_args()
+    train(resume=args.resume)